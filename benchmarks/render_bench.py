@@ -0,0 +1,293 @@
+"""
+Micro-benchmarks dos caminhos de desenho do Renderer e do Menu.
+
+Roda sem janela (driver de vídeo "dummy" do SDL), com estado semeado e um
+relógio simulado, mede cada método de desenho ao longo de N quadros e grava
+média/p95/p99 por chamada e alocações em JSON. Com --baseline, compara com
+um resultado anterior e termina com código 1 se houver regressão.
+
+    python3 -m benchmarks.render_bench --output bench.json
+    python3 -m benchmarks.render_bench --baseline bench.json
+"""
+import os
+
+# Precisa estar definido antes de o pygame abrir a tela
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from collections import namedtuple
+import numpy as np
+import pygame
+from config.settings import WIDTH, HEIGHT, init_fonts
+from src.engine.headless import TickClock
+from src.models.game_state import GameState
+from src.models.ghost_fleet import GhostFleet
+from src.views.renderer import Renderer
+from src.views.menu import Menu
+from src.views.backgrounds import get_background_service
+
+# Um caso de benchmark: advance() avança a cena um quadro, call() é o que se mede
+BenchCase = namedtuple("BenchCase", "name advance call")
+
+# Métricas comparadas com a linha de base
+COMPARED_METRICS = ("mean_us", "p95_us")
+
+def _seed_car(game_state, seed):
+    """Semeia as partículas do carro (o carro é recriado a cada reset)"""
+    game_state.car.exhaust_particles.rng = np.random.default_rng(seed)
+
+def _answer(game_state, correct=True):
+    """Responde o checkpoint atual como um jogador simulado"""
+    slope = game_state.track.get_slope_at(game_state.car.x)
+    game_state.input_text = f"{slope if correct else slope + 10:.4f}"
+    game_state.check_answer()
+
+def _game_scene(renderer, clock, seed):
+    """Carro andando pela pista, respondendo os checkpoints corretamente"""
+    state = GameState(clock=clock)
+    _seed_car(state, seed)
+
+    def advance():
+        clock.advance()
+        if state.waiting_at_checkpoint:
+            _answer(state)
+        state.update()
+        if state.game_over:
+            state.reset()
+            _seed_car(state, seed)
+
+    def view():
+        return state.track, state.camera_x, state.camera_y
+
+    return advance, {
+        "renderer.clear_screen": renderer.clear_screen,
+        "renderer.draw_track": lambda: renderer.draw_track(*view()),
+        "renderer.draw_checkpoints": lambda: renderer.draw_checkpoints(
+            state.track, state.checkpoints_passed, state.camera_x, state.camera_y),
+        "renderer.draw_car": lambda: renderer.draw_car(state.car, *view()),
+        "renderer.draw_info": lambda: renderer.draw_info(state.track, state),
+        "renderer.draw_minimap": lambda: renderer.draw_minimap(state.track, state.car),
+        "renderer.draw_message": lambda: renderer.draw_message(
+            "✓ Correto! Continue!", False, False, pygame.time.get_ticks()),
+    }
+
+def _checkpoint_scene(renderer, clock):
+    """Carro parado no primeiro checkpoint, com a resposta sendo digitada"""
+    state = GameState(clock=clock)
+    while not state.waiting_at_checkpoint:
+        state.update()
+    state.input_text = "-1.25"
+
+    return clock.advance, {
+        "renderer.draw_input_box": lambda: renderer.draw_input_box(state.input_text, state.next_checkpoint),
+    }
+
+def _game_over_scene(renderer, clock, seed):
+    """Tela de fim de jogo depois de uma resposta errada"""
+    state = GameState(clock=clock)
+    _seed_car(state, seed)
+    while not state.waiting_at_checkpoint:
+        state.update()
+    _answer(state, correct=False)
+
+    return clock.advance, {
+        "renderer.draw_game_over": lambda: renderer.draw_game_over(state),
+    }
+
+def _ghost_scene(renderer, seed, count=500, ticks=3000):
+    """Frota de fantasmas em pelotão, quase todos visíveis (pior caso do desenho)"""
+    state = GameState()
+    rng = np.random.default_rng(seed)
+    start = state.track.range[0] + 50
+    speeds = rng.uniform(1.5, 2.5, (count, 1)) + rng.normal(0, 0.2, (count, ticks))
+    fleet = GhostFleet(start + np.cumsum(np.clip(speeds, 0, None), axis=1))
+
+    def advance():
+        if not fleet.moving:
+            fleet.restart()
+        fleet.advance()
+
+    def draw():
+        x = float(np.median(fleet.x))
+        camera_x, camera_y = state.camera_at(x, state.track.get_y_at(x))
+        renderer.draw_ghosts(fleet, state.track, camera_x, camera_y)
+
+    return advance, {
+        "ghosts.advance": fleet.advance,
+        "renderer.draw_ghosts": draw,
+    }
+
+def _menu_scene(screen, fonts, seed):
+    """Menu inicial com as animações e as estrelas cintilantes semeadas"""
+    get_background_service().rng.seed(seed)
+    menu = Menu(screen, fonts, seed=seed)
+
+    def advance():
+        menu.time += 0.01
+        menu.update_snow_particles()
+        menu.update_math_particles()
+
+    return advance, {
+        "menu._draw_background": menu._draw_background,
+        "menu._draw_menu": menu._draw_menu,
+        "menu._draw_car": menu._draw_car,
+        "menu._draw_particles": menu._draw_particles,
+    }
+
+def build_cases(screen, fonts, seed=0):
+    """Monta os casos de benchmark de todas as cenas"""
+    clock = TickClock()
+    renderer = Renderer(screen, fonts)
+    scenes = [
+        _game_scene(renderer, clock, seed),
+        _checkpoint_scene(renderer, clock),
+        _game_over_scene(renderer, clock, seed),
+        _ghost_scene(renderer, seed),
+        _menu_scene(screen, fonts, seed),
+    ]
+    return [BenchCase(name, advance, call) for advance, calls in scenes for name, call in calls.items()]
+
+def time_case(case, frames, warmup=30):
+    """Tempo (ns) de cada chamada ao longo de `frames` quadros, após o aquecimento"""
+    for _ in range(warmup):
+        case.advance()
+        case.call()
+
+    samples = np.empty(frames, dtype=np.int64)
+    for i in range(frames):
+        case.advance()
+        start = time.perf_counter_ns()
+        case.call()
+        samples[i] = time.perf_counter_ns() - start
+    return samples
+
+def measure_allocations(case, calls):
+    """
+    Pico e saldo (bytes) de memória alocada pelo Python em cada chamada, via
+    tracemalloc. Os pixels das superfícies são alocados pelo SDL e não entram.
+    """
+    peaks = np.empty(calls, dtype=np.int64)
+    retained = np.empty(calls, dtype=np.int64)
+    tracemalloc.start()
+    try:
+        for i in range(calls):
+            case.advance()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            case.call()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks[i] = peak - before
+            retained[i] = current - before
+    finally:
+        tracemalloc.stop()
+    return peaks, retained
+
+def summarize(samples, peaks, retained):
+    """Estatísticas por chamada (tempos em microssegundos)"""
+    us = samples / 1000.0
+    p50, p95, p99 = np.percentile(us, (50, 95, 99))
+    return {
+        "calls": int(len(us)),
+        "mean_us": round(float(us.mean()), 2),
+        "p50_us": round(float(p50), 2),
+        "p95_us": round(float(p95), 2),
+        "p99_us": round(float(p99), 2),
+        "max_us": round(float(us.max()), 2),
+        "alloc_peak_bytes": int(peaks.mean()),
+        "alloc_retained_bytes": int(retained.mean()),
+    }
+
+def run_benchmarks(frames=300, seed=0, alloc_calls=50, only=None):
+    """Executa todos os casos (ou os que contêm `only` no nome) e retorna o relatório"""
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    fonts = init_fonts()
+
+    results = {}
+    for case in build_cases(screen, fonts, seed):
+        if only and only not in case.name:
+            continue
+        samples = time_case(case, frames)
+        peaks, retained = measure_allocations(case, alloc_calls)
+        results[case.name] = summarize(samples, peaks, retained)
+
+    return {
+        "meta": {
+            "frames": frames,
+            "seed": seed,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "video_driver": pygame.display.get_driver(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+def compare(report, baseline, threshold=0.15, min_delta_us=20.0):
+    """
+    Compara com a linha de base. Uma métrica regrediu se ficou mais de
+    `threshold` (fração) e mais de `min_delta_us` acima da linha de base.
+    Retorna a lista de (caso, métrica, antes, depois).
+    """
+    regressions = []
+    for name, current in report["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = base[metric], current[metric]
+            if after - before > min_delta_us and after > before * (1 + threshold):
+                regressions.append((name, metric, before, after))
+    return regressions
+
+def print_report(report, baseline=None):
+    """Imprime uma tabela com os resultados (e a variação em relação à linha de base)"""
+    print(f"{'caso':<28}{'média µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'pico KiB':>10}{'Δ média':>10}")
+    for name, stats in report["results"].items():
+        change = ""
+        base = baseline["results"].get(name) if baseline else None
+        if base and base["mean_us"]:
+            change = f"{(stats['mean_us'] / base['mean_us'] - 1) * 100:+.1f}%"
+        print(f"{name:<28}{stats['mean_us']:>10.1f}{stats['p95_us']:>10.1f}{stats['p99_us']:>10.1f}"
+              f"{stats['alloc_peak_bytes'] / 1024:>10.1f}{change:>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de renderização do Derivative Dash")
+    parser.add_argument("--frames", type=int, default=300, help="quadros medidos por caso")
+    parser.add_argument("--seed", type=int, default=0, help="semente do estado do jogo e do menu")
+    parser.add_argument("--only", default=None, help="roda só os casos que contêm este texto")
+    parser.add_argument("--output", default=None, help="grava o relatório JSON neste arquivo")
+    parser.add_argument("--baseline", default=None, help="relatório JSON anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.15, help="regressão tolerada (fração)")
+    parser.add_argument("--min-delta", type=float, default=20.0, help="diferença mínima (µs) para acusar regressão")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(frames=args.frames, seed=args.seed, only=args.only)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(report, baseline, args.threshold, args.min_delta)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSÃO {name} {metric}: {before:.1f} -> {after:.1f} µs")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -46,32 +46,49 @@ UI_SUCCESS = (46, 204, 113)
 
 # Configurações de jogo
 FPS = 60
+TICK_RATE = 60  # Passos de simulação por segundo (independente do FPS)
+BASE_TICK_RATE = 60  # Velocidades e acelerações são medidas por passo a esta taxa (a "km/h" exibida)
+MAX_UPDATES_PER_FRAME = 5  # Passos de simulação por quadro antes de pular a renderização
+MAX_FRAME_SKIP = 5  # Quadros seguidos que podem deixar de ser renderizados
 PARTICLE_COUNT = 20
 TRAIL_LENGTH = 10
 
 # Caminhos para recursos
 FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'fonts')
+REPLAY_DIR = 'replays'  # Gravações das partidas (relativo ao diretório atual)
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                         'derivative-dash')
+FONT_CACHE_PATH = os.path.join(CACHE_DIR, 'fonts.json')  # Arquivos das fontes do sistema já resolvidas
+DATA_DIR = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share'),
+                        'derivative-dash')  # Placar e histórico das partidas desta máquina
+# Pasta de rede comum às máquinas de um laboratório (placar compartilhado); None usa DATA_DIR
+SHARED_DIR = os.environ.get('DERIVATIVE_DASH_SHARED_DIR') or None
 
 # Inicialização de fontes
+def _load_font(filename, size, fallback, resolver):
+    """Carrega uma fonte de FONT_DIR; se o arquivo não existir ou não abrir, usa a do sistema"""
+    path = os.path.join(FONT_DIR, filename)
+    if os.path.exists(path):
+        try:
+            return pygame.font.Font(path, size)
+        except (OSError, pygame.error):
+            pass  # Arquivo corrompido: usa a fonte do sistema
+    return resolver.font(fallback, size)
+
 def init_fonts():
+    # Importado aqui para evitar o ciclo com src.utils.fonts (que lê FONT_CACHE_PATH)
+    from src.utils.fonts import get_font_resolver
+    
     pygame.font.init()
+    resolver = get_font_resolver()
     
     # Tenta carregar fontes personalizadas se disponíveis, senão usa as do sistema
-    try:
-        title_font = pygame.font.Font(os.path.join(FONT_DIR, 'title_font.ttf'), 36)
-    except:
-        title_font = pygame.font.SysFont("Arial", 36)
-        
-    try:
-        heading_font = pygame.font.Font(os.path.join(FONT_DIR, 'heading_font.ttf'), 30)
-    except:
-        heading_font = pygame.font.SysFont("Arial", 30)
-    
+    # (os arquivos das fontes do sistema ficam em cache no disco)
     return {
-        "title": title_font,
-        "heading": heading_font,
-        "large": pygame.font.SysFont("Arial", 30, bold=True),
-        "medium": pygame.font.SysFont("Arial", 24),
-        "small": pygame.font.SysFont("Arial", 20),
-        "tiny": pygame.font.SysFont("Arial", 16)
+        "title": _load_font('title_font.ttf', 36, "Arial", resolver),
+        "heading": _load_font('heading_font.ttf', 30, "Arial", resolver),
+        "large": resolver.font("Arial", 30, bold=True),
+        "medium": resolver.font("Arial", 24),
+        "small": resolver.font("Arial", 20),
+        "tiny": resolver.font("Arial", 16)
     }
\ No newline at end of file
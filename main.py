@@ -3,12 +3,48 @@
 Derivative Dash - Um jogo educacional sobre cálculo diferencial
 """
 
+import time
+_process_start = time.perf_counter()
+
+import argparse
+import glob
+import os
 from src.engine.game_engine import GameEngine
+from src.utils.startup import get_startup_profile
 
 def main():
     """Função principal do jogo"""
-    game = GameEngine()
-    game.run()
+    parser = argparse.ArgumentParser(description="Derivative Dash")
+    parser.add_argument("--replay", metavar="ARQUIVO", help="reproduz uma partida gravada em replays/")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="mostra o tempo de cada fase da inicialização")
+    parser.add_argument("--student", metavar="NOME", help="nome do aluno no placar (padrão: usuário do sistema)")
+    parser.add_argument("--shared-dir", metavar="PASTA",
+                        help="pasta de rede do placar compartilhado pelo laboratório")
+    parser.add_argument("--ghosts", metavar="GRAVAÇÃO", nargs="+", default=[],
+                        help="gravações (ou pastas com gravações) que correm como carros fantasmas")
+    parser.add_argument("--teacher", action="store_true",
+                        help="modo professor: F5 leva o carro direto ao próximo checkpoint")
+    args = parser.parse_args()
+
+    if args.startup_profile:
+        startup = get_startup_profile()
+        startup.enable(_process_start)
+        startup.mark("importações")
+
+    ghost_paths = []
+    for path in args.ghosts:
+        if os.path.isdir(path):
+            ghost_paths.extend(sorted(glob.glob(os.path.join(path, "*.ddr"))))
+        else:
+            ghost_paths.append(path)
+    
+    game = GameEngine(student=args.student, shared_dir=args.shared_dir, ghost_paths=ghost_paths,
+                      teacher=args.teacher)
+    if args.replay:
+        game.play_replay(args.replay)
+    else:
+        game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,9 +1,15 @@
 import pygame
 import sys
+from src.models.game_state import ACCELERATE, BRAKE
+from src.utils.io_worker import get_io_worker
+from src.utils.profiler import get_profiler
 
 class InputHandler:
-    def __init__(self, game_state):
+    def __init__(self, game_state, teacher=False):
+        """teacher habilita as teclas do professor (F5)"""
         self.game_state = game_state
+        self.teacher = teacher
+        self.skip_requested = False  # F5 pressionado; atendido no próximo passo de simulação
         
     def handle_events(self):
         """Processa todos os eventos de entrada"""
@@ -14,10 +20,22 @@ class InputHandler:
                 
             self._handle_keyboard_input(event)
                 
+    def update(self):
+        """Aplica as teclas mantidas pressionadas (chamado a cada passo de simulação)"""
         self._check_special_keys()
                 
     def _handle_keyboard_input(self, event):
         """Processa entrada de teclado para o modo de entrada de texto"""
+        if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+            self._handle_profiler_keys(event.key)
+            return
+            
+        # F5 (só no modo professor): pede para pular direto para o próximo checkpoint
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+            if self.teacher:
+                self.skip_requested = True
+            return
+            
         if not self.game_state.game_over and self.game_state.input_mode:
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_RETURN:
@@ -26,10 +44,7 @@ class InputHandler:
                     self.game_state.input_text = self.game_state.input_text[:-1]
                 elif event.key == pygame.K_ESCAPE:
                     # Cancela o modo de entrada
-                    self.game_state.input_mode = False
-                    self.game_state.input_text = ''
-                    self.game_state.message = "Entrada cancelada"
-                    self.game_state.message_time = pygame.time.get_ticks()
+                    self.game_state.cancel_input()
                 elif event.unicode.isprintable():
                     # Limita o tamanho da entrada para evitar overflow
                     if len(self.game_state.input_text) < 10:
@@ -37,6 +52,27 @@ class InputHandler:
                         if event.unicode in "0123456789.-":
                             self.game_state.input_text += event.unicode
                     
+    def take_skip_request(self):
+        """Retorna (e limpa) o pedido de F5 feito desde o último passo de simulação"""
+        requested = self.skip_requested
+        self.skip_requested = False
+        return requested
+                    
+    def _handle_profiler_keys(self, key):
+        """F3 liga/desliga o perfil de quadros; F4 grava os tempos em CSV"""
+        profiler = get_profiler()
+        if key == pygame.K_F3:
+            profiler.toggle()
+        elif profiler.count:
+            # O arquivo é escrito em segundo plano para não travar o quadro
+            def saved(job):
+                if job.error is None:
+                    print(f"Perfil de quadros salvo em {job.args[0]}")
+                else:
+                    print(f"Não foi possível salvar o perfil de quadros: {job.error}")
+            if profiler.dump_csv(io_worker=get_io_worker(), on_done=saved) is None:
+                print("Não foi possível salvar o perfil de quadros: fila de E/S cheia, tente de novo")
+                    
     def _check_special_keys(self):
         """Verifica teclas especiais"""
         keys = pygame.key.get_pressed()
@@ -45,9 +81,10 @@ class InputHandler:
         if self.game_state.game_over and keys[pygame.K_r]:
             self.game_state.reset()
             
-        # Tecla para aumentar velocidade (quando não estiver em checkpoint)
-        if not self.game_state.game_over and not self.game_state.input_mode:
-            if keys[pygame.K_RIGHT] or keys[pygame.K_UP]:
-                self.game_state.car.speed = min(self.game_state.car.max_speed, self.game_state.car.speed + 0.1)
-            elif keys[pygame.K_LEFT] or keys[pygame.K_DOWN]:
-                self.game_state.car.speed = max(1.0, self.game_state.car.speed - 0.1)
\ No newline at end of file
+        # Teclas de velocidade (aplicadas pelo GameState fora dos checkpoints)
+        controls = 0
+        if keys[pygame.K_RIGHT] or keys[pygame.K_UP]:
+            controls |= ACCELERATE
+        if keys[pygame.K_LEFT] or keys[pygame.K_DOWN]:
+            controls |= BRAKE
+        self.game_state.set_controls(controls)
\ No newline at end of file
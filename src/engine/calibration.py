@@ -0,0 +1,195 @@
+import os
+# Cada processo do pool importaria o pygame de novo e repetiria a saudação
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.settings import TICK_RATE
+from src.engine.headless import HeadlessRunner, Policy
+from src.models.functions import FUNCTIONS, get_function
+from src.models.track import Track
+
+# Comportamento de um grupo de jogadores simulados: desvio padrão do erro das
+# respostas, chance de errar o sinal, casas decimais digitadas e a faixa de
+# velocidade que cada jogador mantém
+PlayerProfile = namedtuple("PlayerProfile", "name error_sd sign_error_rate decimals min_speed max_speed")
+
+PROFILES = {
+    "preciso": PlayerProfile("preciso", 0.05, 0.0, 2, 2.0, 8.0),
+    "mediano": PlayerProfile("mediano", 0.2, 0.03, 1, 1.0, 8.0),
+    "inseguro": PlayerProfile("inseguro", 0.4, 0.1, 1, 1.0, 4.0),
+}
+
+# Resultado parcial de um lote de jogadores (somado no processo principal)
+ChunkResult = namedtuple("ChunkResult", "players victories timeouts crash_xs completion_ticks")
+
+class NoisyPolicy(Policy):
+    """
+    Jogador simulado que erra: calcula a derivada no x anunciado do
+    checkpoint (não onde o carro parou, que depende da velocidade), às vezes
+    troca o sinal, soma um erro normal e arredonda o que digita.
+    """
+
+    def __init__(self, profile, seed):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.target_speed = self.rng.uniform(profile.min_speed, profile.max_speed)
+
+    def answer(self, game_state, x):
+        profile = self.profile
+        slope = game_state.track.get_slope_at(int(game_state.next_checkpoint))
+        if self.rng.random() < profile.sign_error_rate:
+            slope = -slope
+        value = slope + self.rng.gauss(0.0, profile.error_sd)
+        return f"{value:.{profile.decimals}f}"
+
+    def speed(self, game_state):
+        return self.target_speed
+
+def run_chunk(function_index, profile, tolerance, first_seed, players, max_ticks):
+    """
+    Joga `players` partidas na pista (executado nos processos do pool). A
+    semente de cada jogador é first_seed + i, então o resultado não depende
+    de como os lotes foram divididos entre os processos.
+    """
+    runner = HeadlessRunner(None, function_index=function_index, max_ticks=max_ticks, tolerance=tolerance)
+    victories = timeouts = 0
+    crash_xs, completion_ticks = [], []
+    for seed in range(first_seed, first_seed + players):
+        runner.policy = NoisyPolicy(profile, seed)
+        result = runner.run()
+        if result.victory:
+            victories += 1
+            completion_ticks.append(result.ticks)
+        elif result.crashed:
+            crash_xs.append(result.car_x)
+        elif not runner.game_state.game_over:
+            timeouts += 1
+    return ChunkResult(players, victories, timeouts, crash_xs, completion_ticks)
+
+def _run_task(task):
+    return task, run_chunk(*task)
+
+class Calibration:
+    """
+    Roda milhares de jogadores simulados por pista e perfil em um
+    ProcessPoolExecutor. Os jogadores são divididos em lotes de chunk_size
+    partidas por tarefa, para que o custo de enviar a tarefa e devolver o
+    resultado (e de compilar a pista em cada processo) fique pequeno perto
+    da simulação; os processos não compartilham estado, então o tempo cai
+    quase linearmente com o número de núcleos.
+    """
+
+    def __init__(self, players=2000, chunk_size=250, workers=None, max_ticks=20000, seed=0, bins=10):
+        self.players = players
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.max_ticks = max_ticks
+        self.seed = seed
+        self.bins = bins
+
+    def tasks(self, function_index, profile, tolerance):
+        """Divide os jogadores de uma combinação (pista, perfil, tolerância) em lotes"""
+        for first in range(0, self.players, self.chunk_size):
+            count = min(self.chunk_size, self.players - first)
+            yield (function_index, profile, tolerance, self.seed + first, count, self.max_ticks)
+
+    def run(self, function_indices, profiles, tolerances=(None,)):
+        """Retorna um relatório (dict) por combinação de pista, perfil e tolerância"""
+        combos = [(f, p, t) for f in function_indices for p in profiles for t in tolerances]
+        tasks = [task for combo in combos for task in self.tasks(*combo)]
+        partials = {combo: [] for combo in combos}
+
+        if self.workers == 1:
+            for task, result in map(_run_task, tasks):
+                partials[task[:3]].append(result)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for task, result in executor.map(_run_task, tasks):
+                    partials[task[:3]].append(result)
+
+        return [self._report(combo, partials[combo]) for combo in combos]
+
+    def _report(self, combo, results):
+        function_index, profile, tolerance = combo
+        function_data = get_function(function_index)
+        track = Track(function_data)
+        players = sum(r.players for r in results)
+        victories = sum(r.victories for r in results)
+        crash_xs = np.array([x for r in results for x in r.crash_xs])
+        seconds = np.array([t for r in results for t in r.completion_ticks]) / TICK_RATE
+        counts, edges = np.histogram(crash_xs, bins=self.bins, range=track.range)
+        return {
+            "track": function_data["name"],
+            "function_index": function_index,
+            "profile": profile.name,
+            "tolerance": track.tolerance if tolerance is None else tolerance,
+            "players": players,
+            "victory_rate": victories / players if players else 0.0,
+            "crashes": len(crash_xs),
+            "timeouts": sum(r.timeouts for r in results),
+            "crash_histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+            "completion_seconds": {
+                "mean": float(seconds.mean()) if len(seconds) else None,
+                "p50": float(np.percentile(seconds, 50)) if len(seconds) else None,
+                "p90": float(np.percentile(seconds, 90)) if len(seconds) else None,
+            },
+        }
+
+def _histogram_bar(counts):
+    """Histograma em uma linha de texto (um caractere por faixa)"""
+    levels = " ▁▂▃▄▅▆▇█"
+    top = max(counts) or 1
+    return "".join(levels[int(round(count / top * (len(levels) - 1)))] for count in counts)
+
+def print_report(reports):
+    print(f"{'pista':<16} {'perfil':<10} {'tol.':>5} {'vitórias':>9} {'tempo p50':>10} {'p90':>7}  batidas por trecho")
+    for report in reports:
+        completion = report["completion_seconds"]
+        p50 = f"{completion['p50']:.1f}s" if completion["p50"] is not None else "-"
+        p90 = f"{completion['p90']:.1f}s" if completion["p90"] is not None else "-"
+        print(f"{report['track'][:16]:<16} {report['profile']:<10} {report['tolerance']:>5.2f} "
+              f"{report['victory_rate']:>8.1%} {p50:>10} {p90:>7}  "
+              f"|{_histogram_bar(report['crash_histogram']['counts'])}| {report['crashes']}")
+
+def main(argv=None):
+    """Calibra a dificuldade das pistas com jogadores simulados em vários processos"""
+    parser = argparse.ArgumentParser(description="Calibração de dificuldade das pistas do Derivative Dash")
+    parser.add_argument("--players", type=int, default=2000, help="jogadores por pista, perfil e tolerância")
+    parser.add_argument("--functions", type=int, nargs="+", default=None, help="índices das pistas (padrão: todas)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--tolerance", type=float, nargs="+", default=None,
+                        help="tolerâncias a comparar (padrão: a de cada pista)")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos disponíveis)")
+    parser.add_argument("--chunk", type=int, default=250, help="partidas por tarefa enviada aos processos")
+    parser.add_argument("--max-ticks", type=int, default=20000, help="limite de ticks por partida")
+    parser.add_argument("--bins", type=int, default=10, help="faixas do histograma de batidas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="grava os relatórios em JSON")
+    args = parser.parse_args(argv)
+
+    calibration = Calibration(players=args.players, chunk_size=args.chunk, workers=args.workers,
+                              max_ticks=args.max_ticks, seed=args.seed, bins=args.bins)
+    functions = args.functions if args.functions is not None else range(len(FUNCTIONS))
+    profiles = [PROFILES[name] for name in args.profiles]
+    tolerances = args.tolerance or (None,)
+
+    start = time.perf_counter()
+    reports = calibration.run(functions, profiles, tolerances)
+    elapsed = time.perf_counter() - start
+
+    print_report(reports)
+    total = sum(report["players"] for report in reports)
+    print(f"{total} partidas em {elapsed:.1f}s ({total / elapsed:.0f} partidas/s, {calibration.workers} processos)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(reports, file, indent=2, ensure_ascii=False)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
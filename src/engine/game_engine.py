@@ -1,26 +1,41 @@
+import getpass
+import os
 import pygame
 import sys
-from config.settings import WIDTH, HEIGHT, FPS, init_fonts
-from src.models.game_state import GameState
-from src.controllers.input_handler import InputHandler
-from src.views.renderer import Renderer
+import time
+from config.settings import WIDTH, HEIGHT, FPS, TICK_RATE, MAX_UPDATES_PER_FRAME, MAX_FRAME_SKIP, REPLAY_DIR, DATA_DIR, SHARED_DIR, WHITE, init_fonts
 from src.views.menu import Menu
+from src.utils.io_worker import get_io_worker
+from src.utils.profiler import get_profiler
+from src.utils.startup import get_startup_profile
 
 class GameEngine:
-    def __init__(self):
-        """Inicializa o motor do jogo"""
+    def __init__(self, student=None, shared_dir=None, ghost_paths=None, teacher=False):
+        """
+        Inicializa o motor do jogo. Só o necessário para o menu é criado aqui;
+        os objetos da partida esperam o jogador pressionar ENTER (_init_game).
+        student é o nome do aluno no placar (padrão: usuário do sistema) e
+        shared_dir, a pasta de rede do placar compartilhado (padrão: SHARED_DIR).
+        ghost_paths são gravações cujas melhores partidas correm como fantasmas.
+        teacher habilita as teclas do professor (F5 pula até o próximo checkpoint).
+        """
+        startup = get_startup_profile()
         pygame.init()
+        startup.mark("pygame.init")
         
         # Configuração da tela
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Derivative Dash - Cálculo 2")
+        startup.mark("janela")
         
         # Inicialização de componentes
         self.fonts = init_fonts()
-        self.game_state = GameState()
-        self.input_handler = InputHandler(self.game_state)
-        self.renderer = Renderer(self.screen, self.fonts)
+        startup.mark("fontes")
         self.menu = Menu(self.screen, self.fonts)
+        startup.mark("menu")
+        self.game_state = None
+        self.input_handler = None
+        self.renderer = None
         
         # Controle de tempo
         self.clock = pygame.time.Clock()
@@ -28,19 +43,174 @@ class GameEngine:
         # Estado do jogo
         self.game_running = False
         
+        # Com o carro parado, redesenha só as regiões que mudaram
+        self.dirty_rendering = True
+        
+        # Cada partida é gravada em REPLAY_DIR (None desliga a gravação)
+        self.replay_dir = REPLAY_DIR
+        
+        # Toda escrita/leitura em disco passa pela thread de E/S
+        self.io_worker = get_io_worker()
+        
+        # Placar e histórico das partidas (criado na primeira partida)
+        self.student = student
+        self.shared_dir = shared_dir or SHARED_DIR
+        self.leaderboard = None
+        
+        # Carros fantasmas (uma frota por pista, carregada na primeira partida nela)
+        self.ghost_paths = ghost_paths or []
+        self.ghost_fleets = {}
+        self.ghost_loaders = {}  # Pistas cujos fantasmas ainda estão sendo carregados
+        
+        # Modo professor (F5)
+        self.teacher = teacher
+        
+        # Perfil de quadros (F3 liga/desliga, F4 grava CSV)
+        self.profiler = get_profiler()
+        self.profiler_overlay = None
+        
+    def _init_game(self, endless=False, game_state=None):
+        """
+        Cria os objetos usados só na partida (pista, renderizador...). Os
+        módulos também são importados só aqui, para não atrasar o menu.
+        """
+        from src.models.game_state import GameState
+        from src.controllers.input_handler import InputHandler
+        from src.views.renderer import Renderer
+        from src.views.profiler_overlay import ProfilerOverlay
+        
+        self.game_state = game_state or GameState(endless=endless)
+        self.input_handler = InputHandler(self.game_state, teacher=self.teacher)
+        self.renderer = Renderer(self.screen, self.fonts)
+        self.profiler_overlay = ProfilerOverlay(self.profiler, self.fonts["tiny"])
+        self._watch_stages()
+        
+    def _start_game(self, menu_action):
+        """Começa uma partida (normal ou infinita) depois do menu"""
+        endless = menu_action == "endless"
+        if self.game_state is None:
+            startup = get_startup_profile()
+            startup.skip()  # Não conta o tempo em que o menu ficou aberto
+            self._init_game(endless)
+            startup.mark("objetos do jogo")
+            startup.report("Início da primeira partida")
+        else:
+            self.game_state.set_endless(endless)
+        self._attach_leaderboard()
+        self._attach_ghosts()
+        self._start_recording()
+        
+    def _attach_leaderboard(self):
+        """Liga o placar à partida e busca o recorde da pista em segundo plano"""
+        from src.models.leaderboard import Leaderboard, ScoreStore, track_key
+        if self.leaderboard is None:
+            store = ScoreStore(self.shared_dir or DATA_DIR, shared=self.shared_dir is not None)
+            self.leaderboard = Leaderboard(store, self.io_worker, self.student or getpass.getuser())
+        self.game_state.leaderboard = self.leaderboard
+        self.leaderboard.request_best(track_key(self.game_state.track))
+        
+    def _attach_ghosts(self):
+        """
+        Coloca na pista os fantasmas das gravações (a pista infinita não tem
+        fantasmas). Na primeira partida em cada pista as gravações são
+        simuladas em segundo plano (GhostLoader) e a frota entra na pista
+        quando fica pronta, já na posição do tempo decorrido.
+        """
+        state = self.game_state
+        state.ghosts = None
+        if not self.ghost_paths or state.endless:
+            return
+        function_index = state.function_index
+        fleet = self.ghost_fleets.get(function_index)
+        if fleet is not None:
+            fleet.restart()
+            state.ghosts = fleet
+        elif function_index not in self.ghost_loaders:
+            from src.models.ghost_fleet import GhostLoader
+            self.ghost_loaders[function_index] = GhostLoader(
+                self.io_worker, self.ghost_paths, function_index,
+                lambda fleet: self._ghosts_loaded(function_index, fleet))
+            
+    def _ghosts_loaded(self, function_index, fleet):
+        """Guarda a frota carregada e a coloca na partida, se ela ainda é nessa pista"""
+        self.ghost_loaders.pop(function_index, None)
+        self.ghost_fleets[function_index] = fleet
+        state = self.game_state
+        if state.ghosts is None and not state.endless and state.function_index == function_index:
+            fleet.restart()
+            if state.ticks:
+                fleet.advance(state.ticks)
+            state.ghosts = fleet
+        
+    def _watch_stages(self):
+        """Registra as etapas do quadro cronometradas pelo perfil"""
+        profiler = self.profiler
+        profiler.watch(self.input_handler, "handle_events", "input.handle_events")
+        profiler.watch(self.input_handler, "update", "input.update")
+        profiler.watch(self.game_state, "update", "game_state.update")
+        for name in ("clear_screen", "draw_track", "draw_checkpoints", "draw_ghosts", "draw_car", "draw_info",
+                     "draw_minimap", "draw_message", "draw_input_box", "draw_game_over"):
+            profiler.watch(self.renderer, name, f"renderer.{name}")
+        profiler.watch(self, "_present", "display")
+        
+    def _start_recording(self):
+        """Começa a gravar a sessão atual em um arquivo novo"""
+        self._stop_recording()
+        if self.replay_dir is None:
+            return
+        from src.models.replay import ReplayRecorder
+        # As tarefas rodam em ordem, então o diretório existe antes da primeira escrita
+        self.io_worker.submit(os.makedirs, self.replay_dir, exist_ok=True, block=True)
+        path = os.path.join(self.replay_dir, time.strftime("replay_%Y%m%d_%H%M%S.ddr"))
+        self.game_state.recorder = ReplayRecorder(path, io_worker=self.io_worker)
+        self.game_state.recorder.record_keyframe(self.game_state)
+        
+    def _stop_recording(self):
+        """Fecha a gravação em andamento (grava o índice de keyframes)"""
+        recorder = self.game_state.recorder if self.game_state is not None else None
+        if recorder is not None:
+            self.game_state.recorder = None
+            recorder.close()
+        
     def run(self):
         """Loop principal do jogo"""
+        try:
+            self._run()
+        finally:
+            self._stop_recording()
+            if self.leaderboard is not None:
+                self.leaderboard.flush(block=True)
+        
+    def _run(self):
         # Mostra o menu inicial
         menu_action = self.menu.run()
         
         if menu_action == "quit":
             pygame.quit()
             sys.exit()
+        self._start_game(menu_action)
             
         # Inicia o jogo
         self.game_running = True
         
+        # Passo fixo de simulação: a física avança sempre em passos de 1/TICK_RATE s,
+        # independentemente de quantos quadros a máquina consegue desenhar
+        tick_time = 1.0 / TICK_RATE
+        accumulator = 0.0
+        frames_skipped = 0
+        previous_time = time.perf_counter()
+        
         while self.game_running:
+            self.profiler.next_frame()
+            
+            # Tempo real decorrido (limitado para não travar após pausas longas)
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, 0.25)
+            previous_time = current_time
+            
+            # Entrega os resultados das tarefas de disco concluídas
+            self.io_worker.poll()
+            
             # Processa entrada
             self.input_handler.handle_events()
             
@@ -48,55 +218,195 @@ class GameEngine:
             keys = pygame.key.get_pressed()
             if keys[pygame.K_ESCAPE] and self.game_state.game_over:
                 # Reinicia o jogo e volta ao menu
+                self._stop_recording()
                 self.game_state.reset()
                 menu_action = self.menu.run()
                 
                 if menu_action == "quit":
                     pygame.quit()
                     sys.exit()
-                elif menu_action == "start":
+                elif menu_action in ("start", "endless"):
+                    self._start_game(menu_action)
+                    accumulator = 0.0
+                    previous_time = time.perf_counter()
                     continue
             
-            # Atualiza estado do jogo
-            self.game_state.update()
+            # Atualiza estado do jogo em passos fixos
+            updates = 0
+            while accumulator >= tick_time and updates < MAX_UPDATES_PER_FRAME:
+                self.input_handler.update()
+                if not (self.input_handler.take_skip_request() and self._skip_to_next_event()):
+                    self.game_state.update()
+                accumulator -= tick_time
+                updates += 1
+                
+            # Se a simulação ainda está atrasada, pula a renderização deste quadro
+            # (a simulação não desacelera; só a tela é atualizada com menos frequência)
+            if accumulator >= tick_time and frames_skipped < MAX_FRAME_SKIP:
+                frames_skipped += 1
+                continue
+            frames_skipped = 0
+            
+            # Limite de pulos atingido (sobrecarga contínua): descarta o atraso
+            # excedente, senão ele cresce sem limite e, quando a carga cair, o
+            # jogo corre acelerado até alcançá-lo
+            accumulator = min(accumulator, MAX_UPDATES_PER_FRAME * tick_time)
             
-            # Renderiza
-            self._render()
+            # Renderiza interpolando entre os dois últimos passos
+            self._render(min(1.0, accumulator / tick_time))
             
             # Controle de FPS
             self.clock.tick(FPS)
             
-    def _render(self):
+    def _skip_to_next_event(self):
+        """
+        F5 no modo professor: este passo avança direto até o próximo evento
+        (GameState.fast_forward). Partidas com saltos não entram no placar.
+        Retorna se o passo foi simulado (False se não havia o que pular).
+        """
+        ticks = self.game_state.fast_forward()
+        if ticks > 1:
+            self.game_state.assisted = True
+        return ticks > 0
+            
+    def play_replay(self, path):
+        """
+        Reproduz uma gravação: ESPAÇO pausa, ←/→ voltam/avançam 5 segundos,
+        ESC sai. A busca usa os keyframes do arquivo, então é imediata.
+        """
+        from src.models.replay import ReplayPlayer
+        
+        # As mensagens usam o relógio real, como no jogo, para o Renderer animá-las
+        player = ReplayPlayer(path, clock=pygame.time.get_ticks)
+        self._init_game(game_state=player.game_state)
+        seek_ticks = 5 * player.tick_rate
+        tick_time = 1.0 / player.tick_rate
+        accumulator = 0.0
+        paused = False
+        previous_time = time.perf_counter()
+
+        while True:
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, 0.25)
+            previous_time = current_time
+
+            self.io_worker.poll()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    player.close()
+                    return
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE:
+                        paused = not paused
+                    elif event.key == pygame.K_LEFT:
+                        player.seek(player.tick - seek_ticks)
+                    elif event.key == pygame.K_RIGHT:
+                        player.seek(player.tick + seek_ticks)
+
+            if paused or player.finished:
+                accumulator = 0.0
+            while accumulator >= tick_time and not player.finished:
+                player.step()
+                accumulator -= tick_time
+
+            self._draw_scene(min(1.0, accumulator / tick_time))
+            seconds = player.tick / player.tick_rate
+            status = f"REPLAY {seconds:6.1f}s / {player.total_ticks / player.tick_rate:.1f}s"
+            if paused:
+                status += "  (pausa)"
+            self.screen.blit(self.fonts["tiny"].render(status, True, WHITE), (20, HEIGHT - 30))
+            self._present()
+            self.clock.tick(FPS)
+
+    def _render(self, alpha=1.0):
         """Renderiza o jogo com efeitos visuais melhorados"""
+        state = self.game_state
+        profiling = self.profiler.enabled
+        # Com fantasmas andando a cena nunca está parada
+        ghosts_moving = state.ghosts is not None and state.ghosts.moving
+        if (self.dirty_rendering and not profiling and not ghosts_moving
+                and (state.waiting_at_checkpoint or state.game_over)):
+            self._render_dirty()
+            return
+        
+        self.renderer.dirty_regions.reset()
+        self._draw_scene(alpha)
+        if profiling:
+            self.profiler_overlay.draw(self.screen)
+        
+        # Atualiza a tela
+        self._present()
+        
+    def _present(self, rects=None):
+        """Envia o quadro para a tela: inteiro ou só os retângulos informados"""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        
+    def _render_dirty(self):
+        """
+        Renderização por regiões sujas para a cena parada (checkpoint ou fim de
+        jogo): só os retângulos dos elementos animados que mudaram são
+        redesenhados e enviados à tela; quadros sem mudança são pulados.
+        """
+        scene_key, elements = self.renderer.get_dynamic_regions(self.game_state)
+        rects = self.renderer.dirty_regions.update(scene_key, elements)
+        
+        if rects is None:
+            # A cena mudou: redesenha tudo
+            self._draw_scene()
+            self._present()
+        elif rects:
+            # Redesenha a cena recortada em cada região suja
+            for rect in rects:
+                self.screen.set_clip(rect)
+                self._draw_scene()
+            self.screen.set_clip(None)
+            self._present(rects)
+            
+    def _draw_scene(self, alpha=1.0):
+        """Desenha todas as camadas do jogo na tela (sem atualizar o display)"""
+        # Posições interpoladas entre os dois últimos passos de simulação
+        car_x, camera_x, camera_y = self.game_state.get_view(alpha)
+        
         # Limpa a tela com efeito de gradiente e partículas
         self.renderer.clear_screen()
         
         # Desenha a pista com efeitos visuais
         self.renderer.draw_track(
             self.game_state.track, 
-            self.game_state.camera_x, 
-            self.game_state.camera_y
+            camera_x, 
+            camera_y
         )
         
         # Desenha os checkpoints com efeitos visuais
         self.renderer.draw_checkpoints(
             self.game_state.track,
             self.game_state.checkpoints_passed,
-            self.game_state.camera_x,
-            self.game_state.camera_y
+            camera_x,
+            camera_y
         )
         
+        # Desenha os carros fantasmas (atrás do carro do jogador)
+        if self.game_state.ghosts is not None:
+            self.renderer.draw_ghosts(self.game_state.ghosts, self.game_state.track, camera_x, camera_y, alpha)
+        
         # Desenha o carro com efeitos visuais (rastro, partículas, etc.)
         self.renderer.draw_car(
             self.game_state.car,
             self.game_state.track,
-            self.game_state.camera_x,
-            self.game_state.camera_y
+            camera_x,
+            camera_y,
+            car_x
         )
         
         # Desenha painel de informações
         self.renderer.draw_info(self.game_state.track, self.game_state)
         
+        # Desenha o minimapa da pista (só o carro muda a cada quadro)
+        self.renderer.draw_minimap(self.game_state.track, self.game_state.car, car_x)
+        
         # Desenha mensagens com efeitos visuais
         self.renderer.draw_message(
             self.game_state.message,
@@ -114,7 +424,4 @@ class GameEngine:
             
         # Desenha tela de fim de jogo se necessário
         if self.game_state.game_over:
-            self.renderer.draw_game_over(self.game_state)
-            
-        # Atualiza a tela
-        pygame.display.flip()
\ No newline at end of file
+            self.renderer.draw_game_over(self.game_state)
\ No newline at end of file
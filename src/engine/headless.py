@@ -0,0 +1,138 @@
+import argparse
+import time
+from collections import namedtuple
+from config.settings import TICK_RATE
+from src.models.game_state import GameState
+
+# Resultado de uma partida simulada
+RunResult = namedtuple("RunResult", "victory crashed score ticks checkpoints_passed car_x")
+
+class TickClock:
+    """Relógio simulado: o tempo só avança quando a simulação avança um tick"""
+
+    def __init__(self, tick_rate=TICK_RATE):
+        self.tick_ms = 1000.0 / tick_rate
+        self.ticks = 0
+
+    def __call__(self):
+        return int(self.ticks * self.tick_ms)
+
+    def advance(self, ticks=1):
+        self.ticks += ticks
+
+class Policy:
+    """
+    Jogador simulado. Subclasses decidem a resposta de cada checkpoint e a
+    velocidade desejada a cada tick.
+    """
+
+    def answer(self, game_state, x):
+        """Retorna o texto digitado como resposta para a derivada em x"""
+        raise NotImplementedError
+
+    def speed(self, game_state):
+        """Retorna a velocidade desejada (ou None para manter a atual)"""
+        return None
+
+class PerfectPolicy(Policy):
+    """Sempre responde a derivada exata e mantém a velocidade (opcionalmente fixa)"""
+
+    def __init__(self, target_speed=None):
+        self.target_speed = target_speed
+
+    def answer(self, game_state, x):
+        return f"{game_state.track.get_slope_at(x):.4f}"
+
+    def speed(self, game_state):
+        return self.target_speed
+
+class HeadlessRunner:
+    """
+    Executa partidas completas sem tela e sem Renderer: GameState.update() é
+    chamado em ticks fixos, sem limitar o FPS, com um relógio simulado. As
+    respostas e a velocidade vêm de um objeto Policy. Com fast_forward, o
+    trecho entre dois checkpoints é pulado de uma vez (GameState.fast_forward);
+    o Policy só é consultado nos ticks simulados, então a velocidade pedida
+    deve ser constante entre um checkpoint e outro.
+    """
+
+    def __init__(self, policy, function_index=0, tick_rate=TICK_RATE, max_ticks=100000, endless=False, seed=None,
+                 tolerance=None, fast_forward=True):
+        self.policy = policy
+        self.max_ticks = max_ticks
+        self.fast_forward = fast_forward
+        self.clock = TickClock(tick_rate)
+        self.game_state = GameState(function_index=function_index, clock=self.clock, effects=False,
+                                    endless=endless, seed=seed, tolerance=tolerance, tick_rate=tick_rate)
+
+    def step(self):
+        """Avança a simulação em um tick (ou até o próximo evento, com fast_forward)"""
+        state = self.game_state
+        if state.waiting_at_checkpoint and state.input_mode and not state.game_over:
+            state.input_text = self.policy.answer(state, state.car.x)
+            state.check_answer()
+
+        if not state.game_over and not state.input_mode:
+            target = self.policy.speed(state)
+            if target is not None:
+                state.car.speed = min(state.car.max_speed, max(1.0, target))
+
+        ticks = state.fast_forward(self.max_ticks - self.clock.ticks) if self.fast_forward else 0
+        if not ticks:
+            state.update()
+            ticks = 1
+        self.clock.advance(ticks)
+
+    def run(self):
+        """Joga uma partida até o fim (ou até max_ticks) e retorna o resultado"""
+        state = self.game_state
+        state.reset()
+        self.clock.ticks = 0
+        while not state.game_over and self.clock.ticks < self.max_ticks:
+            self.step()
+        return RunResult(
+            victory=state.victory,
+            crashed=state.car.crashed,
+            score=state.score,
+            ticks=self.clock.ticks,
+            checkpoints_passed=state.checkpoints_passed,
+            car_x=state.car.x,
+        )
+
+    def run_many(self, count):
+        """Joga várias partidas seguidas e retorna a lista de resultados"""
+        return [self.run() for _ in range(count)]
+
+def main(argv=None):
+    """Valida uma pista rodando várias partidas simuladas (útil em CI)"""
+    parser = argparse.ArgumentParser(description="Simulação sem tela do Derivative Dash")
+    parser.add_argument("--runs", type=int, default=1000, help="número de partidas")
+    parser.add_argument("--function", type=int, default=0, help="índice da função da pista")
+    parser.add_argument("--speed", type=float, default=None, help="velocidade fixa do jogador simulado")
+    parser.add_argument("--endless", action="store_true", help="pista infinita (cada partida vai até --max-ticks)")
+    parser.add_argument("--seed", type=int, default=None, help="semente da pista infinita")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="limite de ticks por partida")
+    parser.add_argument("--no-fast-forward", action="store_true",
+                        help="simula todos os ticks (sem pular direto para o próximo checkpoint)")
+    args = parser.parse_args(argv)
+
+    runner = HeadlessRunner(PerfectPolicy(args.speed), function_index=args.function, max_ticks=args.max_ticks,
+                            endless=args.endless, seed=args.seed, fast_forward=not args.no_fast_forward)
+    start = time.perf_counter()
+    results = runner.run_many(args.runs)
+    elapsed = time.perf_counter() - start
+
+    if args.endless:
+        print(f"Partidas: {len(results)}  Batidas: {sum(r.crashed for r in results)}  "
+              f"x final médio: {sum(r.car_x for r in results) / len(results):.0f}  "
+              f"({len(results) / elapsed:.1f} partidas/s)")
+        return 0 if not any(result.crashed for result in results) else 1
+
+    victories = sum(result.victory for result in results)
+    print(f"Partidas: {len(results)}  Vitórias: {victories}  "
+          f"Ticks médios: {sum(r.ticks for r in results) / len(results):.1f}  "
+          f"({len(results) / elapsed:.0f} partidas/s)")
+    return 0 if victories == len(results) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+import math
+import numpy as np
+import pygame
+from config.settings import BLUE, BLACK, YELLOW, RED, HIGHLIGHT_BLUE, DARK_GRAY, WHITE, CYAN, LIGHT_GRAY
+from src.utils.surfaces import to_display_format
+
+def build_car_surface(color):
+    """Cria a superfície do carro com a cor especificada e design melhorado"""
+    # Cria uma superfície maior para mais detalhes
+    car = pygame.Surface((80, 40), pygame.SRCALPHA)
+
+    # Cores derivadas da cor principal para efeitos de sombreamento
+    darker_color = (max(0, color[0] - 40), max(0, color[1] - 40), max(0, color[2] - 40))
+    lighter_color = (min(255, color[0] + 40), min(255, color[1] + 40), min(255, color[2] + 40))
+
+    # Corpo principal do carro (com formato mais aerodinâmico)
+    # Desenha o corpo principal com gradiente
+    for i in range(60):
+        blend_factor = i / 60.0
+        current_color = (
+            int(color[0] * (1 - blend_factor) + lighter_color[0] * blend_factor),
+            int(color[1] * (1 - blend_factor) + lighter_color[1] * blend_factor),
+            int(color[2] * (1 - blend_factor) + lighter_color[2] * blend_factor)
+        )
+        pygame.draw.line(car, current_color, (10 + i, 8), (10 + i, 28), 1)
+
+    # Contorno do carro
+    points = [(8, 18), (15, 8), (65, 8), (70, 18), (65, 28), (15, 28)]
+    pygame.draw.polygon(car, darker_color, points)
+    pygame.draw.polygon(car, color, points, 1)
+
+    # Detalhes do corpo
+    highlight_color = HIGHLIGHT_BLUE if color == BLUE else YELLOW if color == RED else WHITE
+
+    # Faixa decorativa no topo
+    pygame.draw.line(car, highlight_color, (15, 9), (65, 9), 2)
+
+    # Faixa decorativa na lateral
+    pygame.draw.line(car, darker_color, (10, 18), (70, 18), 2)
+
+    # Rodas com mais detalhes
+    wheel_color = BLACK
+    wheel_highlight = LIGHT_GRAY
+
+    # Roda frontal esquerda
+    pygame.draw.ellipse(car, wheel_color, (12, 2, 16, 8))
+    pygame.draw.ellipse(car, wheel_highlight, (15, 4, 6, 3))
+
+    # Roda traseira esquerda
+    pygame.draw.ellipse(car, wheel_color, (52, 2, 16, 8))
+    pygame.draw.ellipse(car, wheel_highlight, (55, 4, 6, 3))
+
+    # Roda frontal direita
+    pygame.draw.ellipse(car, wheel_color, (12, 30, 16, 8))
+    pygame.draw.ellipse(car, wheel_highlight, (15, 32, 6, 3))
+
+    # Roda traseira direita
+    pygame.draw.ellipse(car, wheel_color, (52, 30, 16, 8))
+    pygame.draw.ellipse(car, wheel_highlight, (55, 32, 6, 3))
+
+    # Faróis com brilho
+    # Farol dianteiro
+    pygame.draw.ellipse(car, YELLOW, (67, 14, 8, 8))
+    pygame.draw.ellipse(car, WHITE, (69, 16, 4, 4))
+
+    # Farol traseiro
+    pygame.draw.ellipse(car, RED, (5, 14, 8, 8))
+    pygame.draw.ellipse(car, (255, 150, 150), (7, 16, 4, 4))
+
+    # Janelas com reflexo
+    window_color = CYAN
+    window_highlight = WHITE
+
+    # Janela principal
+    pygame.draw.rect(car, window_color, (25, 10, 30, 8), border_radius=3)
+
+    # Reflexo na janela
+    pygame.draw.line(car, window_highlight, (28, 12), (50, 12), 2)
+
+    # Detalhes adicionais
+    # Spoiler traseiro
+    pygame.draw.rect(car, darker_color, (5, 13, 3, 10), border_radius=1)
+
+    # Escapamento
+    pygame.draw.rect(car, DARK_GRAY, (3, 17, 4, 3), border_radius=1)
+
+    return car
+
+
+class CarSpriteAtlas:
+    """
+    Sprites de uma pintura do carro, criados uma única vez e pré-rotacionados
+    em ângulos discretos (a cada ANGLE_STEP graus, de -90° a 90°). Cada ângulo
+    é rotacionado na primeira vez que é pedido; depois a consulta é O(1).
+
+    alpha < 255 cria uma pintura translúcida (carros fantasmas). Como o
+    desenho do carro só tem pixels opacos ou transparentes, ela usa cor-chave
+    com transparência da superfície inteira (RLE), que se desenha bem mais
+    rápido que a transparência por pixel.
+    """
+
+    ANGLE_STEP = 0.5
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, color, alpha=255):
+        self.color = color
+        self.alpha = alpha
+        base = build_car_surface(color)
+        if alpha < 255:
+            keyed = pygame.Surface(base.get_size())
+            keyed.fill(self.COLORKEY)
+            keyed.blit(base, (0, 0))
+            base = to_display_format(keyed, alpha=False)
+            self._set_translucent(base)
+        else:
+            base = to_display_format(base)
+        self.base = base
+        self.sprites = [None] * (int(180 / self.ANGLE_STEP) + 1)
+        self.offsets = [None] * len(self.sprites)  # Metade do tamanho de cada sprite (para centralizar)
+
+    def get(self, angle):
+        """Retorna o sprite rotacionado para o ângulo (em graus) mais próximo"""
+        return self.get_index(min(len(self.sprites) - 1, max(0, round((angle + 90) / self.ANGLE_STEP))))
+
+    def get_index(self, index):
+        """Retorna o sprite de índice `index` (veja slope_indices)"""
+        sprite = self.sprites[index]
+        if sprite is None:
+            sprite = pygame.transform.rotate(self.base, index * self.ANGLE_STEP - 90)
+            if self.alpha < 255:
+                self._set_translucent(sprite)
+            self.sprites[index] = sprite
+            self.offsets[index] = (sprite.get_width() // 2, sprite.get_height() // 2)
+        return sprite
+
+    def _set_translucent(self, surface):
+        surface.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+        surface.set_alpha(self.alpha, pygame.RLEACCEL)
+
+    def slope_indices(self, slopes):
+        """Índices dos sprites para um array de inclinações (vetorizado)"""
+        angles = np.degrees(np.arctan(-np.asarray(slopes, dtype=np.float64)))
+        indices = np.rint((angles + 90) / self.ANGLE_STEP).astype(np.int64)
+        return np.clip(indices, 0, len(self.sprites) - 1)
+
+    def get_for_slope(self, slope):
+        """Retorna o sprite rotacionado de acordo com a inclinação da pista"""
+        return self.get(math.degrees(math.atan(-slope)))
+
+    def prebuild(self):
+        """Rotaciona todos os ângulos de uma vez (ex.: durante um carregamento)"""
+        for index in range(len(self.sprites)):
+            self.get(index * self.ANGLE_STEP - 90)
+
+# Atlas compartilhados por todos os carros de uma mesma cor
+_atlases = {}
+
+def get_car_atlas(color, alpha=255):
+    """Retorna o atlas de sprites da cor (e transparência) informada, criando-o se necessário"""
+    key = (tuple(color), alpha)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = CarSpriteAtlas(key[0], alpha)
+        _atlases[key] = atlas
+    return atlas
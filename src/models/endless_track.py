@@ -0,0 +1,248 @@
+import math
+import random
+from collections import OrderedDict
+import numpy as np
+from config.settings import WIDTH, HEIGHT
+from src.models.expressions import CompiledExpression
+from src.models.functions import DEFAULT_TOLERANCE
+from src.models.track import Track, CriticalPoint
+
+class EndlessTrack:
+    """
+    Pista infinita gerada em trechos de SEGMENT_LENGTH unidades, sob demanda.
+
+    O trecho i cobre [i·L, (i+1)·L] e é uma pista comum (Track) na coordenada
+    local u = x - i·L, então senos e amostras são calculados sempre com
+    números pequenos, por maior que seja x. Os trechos são definidos só pela
+    semente e pelo índice: as alturas das junções vêm de um gerador próprio
+    por junção e cada trecho começa e termina com inclinação zero, o que
+    garante continuidade de f e f' (C¹). Assim qualquer trecho pode ser
+    descartado e recriado igual depois, e só alguns ficam na memória.
+    """
+
+    endless = True
+    SEGMENT_LENGTH = 1000
+    CHECKPOINTS_PER_SEGMENT = 2
+    BASE_HEIGHT = 300
+    HEIGHT_VARIATION = 120  # Altura das junções: BASE_HEIGHT ± HEIGHT_VARIATION
+    MAX_WAVE = 40  # Amplitude máxima das ondulações dentro de um trecho
+    tolerance = DEFAULT_TOLERANCE
+
+    def __init__(self, seed=None, keep_behind=2, max_segments=8):
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.keep_behind = keep_behind
+        self.max_segments = max_segments
+        self.segments = OrderedDict()  # índice -> Track em coordenadas locais
+        self.sample_step = Track.SAMPLE_STEP
+        self.cache_key = ("endless", self.seed)  # Veja Track.cache_key
+        self.samples_per_segment = int(self.SEGMENT_LENGTH / self.sample_step)
+        self.range = (0, math.inf)
+        self.total_checkpoints = math.inf
+        self.current_segment = 0
+
+    # Geração dos trechos
+
+    def _random(self, index, salt):
+        return random.Random((self.seed * 1000003 + index) * 4 + salt)
+
+    def _join_height(self, index):
+        """Altura da pista na junção `index` (início do trecho de mesmo índice)"""
+        return self.BASE_HEIGHT + self._random(index, 0).uniform(-self.HEIGHT_VARIATION, self.HEIGHT_VARIATION)
+
+    def _build_segment(self, index):
+        """
+        f(u) = c0 - c1·cos(πu/L) - w·cos(2πnu/L): os dois cossenos têm
+        derivada nula em u = 0 e u = L, e c0, c1 fazem f passar pelas alturas
+        das duas junções.
+        """
+        length = self.SEGMENT_LENGTH
+        y0 = self._join_height(index)
+        y1 = self._join_height(index + 1)
+        rng = self._random(index, 1)
+        wave = rng.uniform(-self.MAX_WAVE, self.MAX_WAVE)
+        cycles = rng.randint(1, 3)
+
+        c1 = (y1 - y0) / 2
+        c0 = y0 + c1 + wave
+        k1 = math.pi / length
+        k2 = 2 * math.pi * cycles / length
+        expression = CompiledExpression(f"{c0!r} - {c1!r}*cos({k1!r}*x) - {wave!r}*cos({k2!r}*x)")
+
+        x0 = index * length
+        function_data = dict(
+            name=f"Pista infinita (trecho {index + 1}, u = x - {x0})",
+            formula=f"f(u) = {c0:.0f} {_signed(-c1, '.1f')}·cos({k1:.5f}u) {_signed(-wave, '.1f')}·cos({k2:.5f}u)",
+            range=(0, length),
+            checkpoints=self.CHECKPOINTS_PER_SEGMENT,
+            **expression.functions()
+        )
+        return Track(function_data, cache=False)
+
+    def _segment(self, index):
+        """Retorna o trecho `index`, gerando-o se necessário (cache LRU limitado)"""
+        segment = self.segments.get(index)
+        if segment is None:
+            segment = self._build_segment(index)
+            self.segments[index] = segment
+            while len(self.segments) > self.max_segments:
+                self.segments.popitem(last=False)
+        else:
+            self.segments.move_to_end(index)
+        return segment
+
+    def _locate(self, x):
+        """Retorna (índice do trecho, coordenada local) de x"""
+        index = max(0, math.floor(x / self.SEGMENT_LENGTH))
+        return index, x - index * self.SEGMENT_LENGTH
+
+    def update(self, x):
+        """Descarta os trechos que ficaram para trás e prepara o próximo"""
+        self.current_segment, _ = self._locate(x)
+        limit = self.current_segment - self.keep_behind
+        for index in [index for index in self.segments if index < limit]:
+            del self.segments[index]
+        self._segment(self.current_segment + 1)
+
+    # Mesma interface de Track
+
+    @property
+    def name(self):
+        return self._segment(self.current_segment).name
+
+    @property
+    def formula(self):
+        return self._segment(self.current_segment).formula
+
+    def get_y_at(self, x):
+        index, u = self._locate(x)
+        return self._segment(index).get_y_at(u)
+
+    def get_slope_at(self, x):
+        index, u = self._locate(x)
+        return self._segment(index).get_slope_at(u)
+
+    def get_y_array(self, xs):
+        return self._evaluate_array(xs, "get_y_array")
+
+    def get_slope_array(self, xs):
+        return self._evaluate_array(xs, "get_slope_array")
+
+    def _evaluate_array(self, xs, method):
+        """Avalia o método vetorizado de cada trecho sobre as posições que caem nele"""
+        xs = np.asarray(xs, dtype=np.float64)
+        indices = np.maximum(0, np.floor(xs / self.SEGMENT_LENGTH)).astype(np.int64)
+        values = np.empty_like(xs)
+        for index in np.unique(indices).tolist():
+            mask = indices == index
+            values[mask] = getattr(self._segment(index), method)(xs[mask] - index * self.SEGMENT_LENGTH)
+        return values
+
+    def get_polyline(self, x_start, x_end, zoom=1.0):
+        """Polilinha adaptativa (veja Track.get_polyline), juntando os trechos envolvidos"""
+        length = self.SEGMENT_LENGTH
+        first = max(0, math.floor(x_start / length))
+        last = max(first, math.floor(x_end / length))
+        xs_parts, ys_parts = [], []
+        for index in range(first, last + 1):
+            x0 = index * length
+            xs, ys = self._segment(index).get_polyline(x_start - x0, x_end - x0, zoom)
+            if xs_parts:
+                # O primeiro vértice do trecho é o último do anterior
+                xs, ys = xs[1:], ys[1:]
+            xs_parts.append(xs + x0)
+            ys_parts.append(ys)
+        return np.concatenate(xs_parts), np.concatenate(ys_parts)
+
+    def get_samples(self, x_start, x_end):
+        """
+        Retorna (índice global da primeira amostra, xs, ys) das amostras que
+        cobrem [x_start, x_end], juntando os trechos envolvidos
+        """
+        step = self.sample_step
+        per_segment = self.samples_per_segment
+        first = max(0, math.floor(x_start / step))
+        end = max(first, math.ceil(x_end / step) + 1)
+
+        xs_parts, ys_parts = [], []
+        g = first
+        while g < end:
+            index = g // per_segment
+            local = g - index * per_segment
+            # A última amostra de cada trecho é a primeira do seguinte
+            take = min(end - g, per_segment - local)
+            segment = self._segment(index)
+            xs_parts.append(index * self.SEGMENT_LENGTH + segment.sample_x[local:local + take])
+            ys_parts.append(segment.sample_y[local:local + take])
+            g += take
+
+        if not xs_parts:
+            return first, np.empty(0), np.empty(0)
+        return first, np.concatenate(xs_parts), np.concatenate(ys_parts)
+
+    def get_viewport_points(self, camera_x, camera_y, width=WIDTH, height=HEIGHT, margin=20):
+        """Retorna (índice da primeira amostra, pontos Nx2 em coordenadas de tela)"""
+        start, xs, ys = self.get_samples(camera_x - margin, camera_x + width + margin)
+        return start, np.column_stack((xs - camera_x, height - (ys - camera_y)))
+
+    def get_checkpoint_position(self, index):
+        """Posição do checkpoint `index` (contando desde o início da pista)"""
+        if index < 0:
+            return None
+        segment, local = divmod(index, self.CHECKPOINTS_PER_SEGMENT)
+        spacing = self.SEGMENT_LENGTH / (self.CHECKPOINTS_PER_SEGMENT + 1)
+        return segment * self.SEGMENT_LENGTH + (local + 1) * spacing
+
+    def checkpoints_between(self, a, b):
+        """Retorna (índice, x) dos checkpoints com a < x < b"""
+        spacing = self.SEGMENT_LENGTH / (self.CHECKPOINTS_PER_SEGMENT + 1)
+        per = self.CHECKPOINTS_PER_SEGMENT
+        result = []
+        for segment in range(max(0, math.floor(a / self.SEGMENT_LENGTH)), math.floor(b / self.SEGMENT_LENGTH) + 1):
+            for local in range(per):
+                x = segment * self.SEGMENT_LENGTH + (local + 1) * spacing
+                if a < x < b:
+                    result.append((segment * per + local, x))
+        return result
+
+    def _critical_points(self, index):
+        """
+        Pontos críticos do trecho em coordenadas globais. A junção inicial
+        (onde f' = 0 por construção) entra como máximo, mínimo ou inflexão
+        conforme a inclinação dos dois lados; raízes coladas às pontas do
+        trecho são as próprias junções e ficam de fora.
+        """
+        x0 = index * self.SEGMENT_LENGTH
+        segment = self._segment(index)
+        points = []
+        if index > 0:
+            before = self._segment(index - 1).sample_dy[-2]
+            after = segment.sample_dy[1]
+            kind = "max" if before > 0 > after else "min" if before < 0 < after else "inflection"
+            points.append(CriticalPoint(x0, segment.get_y_at(0), kind))
+        for point in segment.critical_points_between(1e-6, self.SEGMENT_LENGTH - 1e-6):
+            points.append(CriticalPoint(x0 + point.x, point.y, point.kind))
+        return points
+
+    def critical_points_between(self, a, b):
+        """Retorna os pontos críticos com a <= x <= b"""
+        first, _ = self._locate(a)
+        last, _ = self._locate(b)
+        return [point for index in range(first, last + 1)
+                for point in self._critical_points(index) if a <= point.x <= b]
+
+    def next_critical_point(self, x, max_segments=4):
+        """Primeiro ponto crítico depois de x, procurando até `max_segments` trechos à frente"""
+        index, _ = self._locate(x)
+        for offset in range(max_segments):
+            for point in self._critical_points(index + offset):
+                if point.x > x:
+                    return point
+        return None
+
+    def is_end_of_track(self, x, margin=50):
+        """A pista infinita não termina"""
+        return False
+
+def _signed(value, spec):
+    """Formata o número com o sinal separado: '+ 3.0' ou '- 3.0'"""
+    return f"{'-' if value < 0 else '+'} {abs(value):{spec}}"
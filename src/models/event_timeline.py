@@ -0,0 +1,42 @@
+import math
+
+class EventTimeline:
+    """
+    Próximo evento da simulação: chegada a um checkpoint ou ao fim da pista.
+
+    Entre dois eventos o carro só anda em x (x += speed·tick_scale a cada
+    tick), então basta saber a partir de que x acontece o próximo evento para
+    não testar checkpoint e fim da pista a cada tick, e, com velocidade
+    constante, quantos ticks faltam até lá é uma conta: ceil(distância / passo).
+    """
+
+    CHECKPOINT_REACH = 10  # check_checkpoint dispara a esta distância do checkpoint
+    END_MARGIN = 50  # Margem de Track.is_end_of_track
+
+    def __init__(self, track):
+        self.track = track
+        self.end_x = track.range[1] - self.END_MARGIN  # Infinito na pista infinita
+
+    def next_event_x(self, state):
+        """x a partir do qual o próximo evento acontece (antes dele, nada a testar)"""
+        if state.game_over:
+            return math.inf
+        if state.input_mode:
+            return self.end_x
+        return min(self.end_x, state.next_checkpoint - self.CHECKPOINT_REACH)
+
+    def ticks_until_event(self, state):
+        """
+        Ticks até o update() em que o próximo evento acontece (1 = o próximo),
+        ou None se não der para prever: carro parado ou esperando resposta,
+        fim de jogo, ou velocidade mudando (teclas de acelerar/frear).
+        """
+        car = state.car
+        if state.game_over or state.waiting_at_checkpoint or car.crashed or car.speed <= 0:
+            return None
+        if not state.speed_is_steady():
+            return None
+        distance = state.next_event_x - car.x
+        if distance == math.inf:
+            return None
+        return max(1, math.ceil(distance / (car.speed * state.tick_scale)))
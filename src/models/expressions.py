@@ -0,0 +1,417 @@
+"""
+Compilador de expressões das pistas.
+
+A fórmula (sintaxe do Python, ex.: "50*sin(0.01*x) + 0.001*x**2 + 300") é
+lida uma única vez com o módulo ast, derivada simbolicamente (f′ e f″) e
+compilada em funções escalares (math) e vetorizadas (NumPy). As expressões
+compiladas ficam em cache pela fórmula.
+
+Os nós da árvore são tuplas: ("const", valor), ("var",), ("neg", a),
+("add"|"sub"|"mul"|"div"|"pow", a, b) e ("call", nome, a).
+"""
+import ast
+import math
+from functools import lru_cache
+import numpy as np
+
+class ExpressionError(ValueError):
+    """Fórmula inválida ou com construções não suportadas"""
+
+def _sign(value):
+    return 1.0 if value > 0 else -1.0 if value < 0 else 0.0
+
+# Funções aceitas: nome -> (código escalar, código vetorizado)
+FUNCTIONS = {
+    "sin": ("math.sin", "np.sin"),
+    "cos": ("math.cos", "np.cos"),
+    "tan": ("math.tan", "np.tan"),
+    "atan": ("math.atan", "np.arctan"),
+    "sinh": ("math.sinh", "np.sinh"),
+    "cosh": ("math.cosh", "np.cosh"),
+    "tanh": ("math.tanh", "np.tanh"),
+    "exp": ("math.exp", "np.exp"),
+    "log": ("math.log", "np.log"),
+    "sqrt": ("math.sqrt", "np.sqrt"),
+    "abs": ("abs", "np.abs"),
+    "sign": ("_sign", "np.sign"),
+}
+
+# Nomes alternativos aceitos na fórmula
+ALIASES = {"sen": "sin", "tg": "tan", "ln": "log", "arctan": "atan"}
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+_SCALAR_CALLS = {
+    "sin": math.sin, "cos": math.cos, "tan": math.tan, "atan": math.atan,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh, "exp": math.exp,
+    "log": math.log, "sqrt": math.sqrt, "abs": abs, "sign": _sign,
+}
+
+_NAMESPACE = {"math": math, "np": np, "abs": abs, "_sign": _sign, "__builtins__": {}}
+
+ZERO = ("const", 0.0)
+ONE = ("const", 1.0)
+TWO = ("const", 2.0)
+VAR = ("var",)
+
+# Construtores com simplificação (constantes são calculadas na hora)
+
+def _const(value):
+    return ("const", float(value))
+
+def _is_const(node, value=None):
+    return node[0] == "const" and (value is None or node[1] == value)
+
+def _neg(a):
+    if _is_const(a):
+        return _const(-a[1])
+    if a[0] == "neg":
+        return a[1]
+    if a[0] == "mul" and _is_const(a[1]):
+        return _mul(_const(-a[1][1]), a[2])
+    return ("neg", a)
+
+def _add(a, b):
+    if _is_const(a) and _is_const(b):
+        return _const(a[1] + b[1])
+    if _is_const(a, 0):
+        return b
+    if _is_const(b, 0):
+        return a
+    if b[0] == "neg":
+        return _sub(a, b[1])
+    if _is_const(b) and b[1] < 0:
+        return _sub(a, _const(-b[1]))
+    if b[0] == "mul" and _is_const(b[1]) and b[1][1] < 0:
+        return _sub(a, _neg(b))
+    return ("add", a, b)
+
+def _sub(a, b):
+    if _is_const(a) and _is_const(b):
+        return _const(a[1] - b[1])
+    if _is_const(b, 0):
+        return a
+    if _is_const(a, 0):
+        return _neg(b)
+    if a == b:
+        return ZERO
+    if b[0] == "neg":
+        return _add(a, b[1])
+    if _is_const(b) and b[1] < 0:
+        return _add(a, _const(-b[1]))
+    if b[0] == "mul" and _is_const(b[1]) and b[1][1] < 0:
+        return _add(a, _neg(b))
+    return ("sub", a, b)
+
+def _mul(a, b):
+    if _is_const(a) and _is_const(b):
+        return _const(a[1] * b[1])
+    if _is_const(b):
+        a, b = b, a  # Constante sempre à esquerda
+    if _is_const(a, 0):
+        return ZERO
+    if _is_const(a, 1):
+        return b
+    if _is_const(a, -1):
+        return _neg(b)
+    if _is_const(a) and b[0] == "mul" and _is_const(b[1]):
+        return _mul(_const(a[1] * b[1][1]), b[2])
+    if _is_const(a) and b[0] == "neg":
+        return _mul(_const(-a[1]), b[1])
+    if _is_const(a) and b[0] == "div" and _is_const(b[1]):
+        return _div(_const(a[1] * b[1][1]), b[2])
+    if a == b:
+        return _pow(a, TWO)
+    # Constantes dentro dos fatores sobem para a frente do produto
+    if not _is_const(a):
+        if b[0] == "div" and _is_const(b[1], 1):
+            return _div(a, b[2])
+        if a[0] == "mul" and _is_const(a[1]):
+            return _mul(a[1], _mul(a[2], b))
+        if b[0] == "mul" and _is_const(b[1]):
+            return _mul(b[1], _mul(a, b[2]))
+    return ("mul", a, b)
+
+def _div(a, b):
+    if _is_const(b, 0):
+        raise ExpressionError("divisão por zero")
+    if _is_const(a) and _is_const(b):
+        return _const(a[1] / b[1])
+    if _is_const(a, 0):
+        return ZERO
+    if _is_const(b, 1):
+        return a
+    if a == b:
+        return ONE
+    return ("div", a, b)
+
+def _pow(a, b):
+    if _is_const(a) and _is_const(b):
+        try:
+            value = a[1] ** b[1]
+        except (ZeroDivisionError, OverflowError) as error:
+            raise ExpressionError(f"({a[1]!r})**({b[1]!r}) não está definido") from error
+        # Base negativa com expoente fracionário dá um número complexo
+        if isinstance(value, complex):
+            raise ExpressionError(f"({a[1]!r})**({b[1]!r}) não é um número real")
+        return _const(value)
+    if _is_const(b, 0):
+        return ONE
+    if _is_const(b, 1):
+        return a
+    if _is_const(a, 1):
+        return ONE
+    # (a**p)**q = a**(p*q) só vale para q inteiro: (x**2)**0.5 é |x|, não x
+    if a[0] == "pow" and _is_const(a[2]) and _is_const(b) and b[1].is_integer():
+        return _pow(a[1], _const(a[2][1] * b[1]))
+    return ("pow", a, b)
+
+def _call(name, a):
+    if _is_const(a):
+        try:
+            return _const(_SCALAR_CALLS[name](a[1]))
+        except (ValueError, OverflowError) as error:
+            raise ExpressionError(f"{name}({a[1]!r}) não está definido") from error
+    return ("call", name, a)
+
+# Leitura da fórmula
+
+_BINARY_OPS = {
+    ast.Add: _add,
+    ast.Sub: _sub,
+    ast.Mult: _mul,
+    ast.Div: _div,
+    ast.Pow: _pow,
+}
+
+def parse_expression(text):
+    """Converte a fórmula em uma árvore de expressão simplificada"""
+    # Aceita x^2 como potência (trocado antes da leitura para manter a precedência)
+    try:
+        tree = ast.parse(text.strip().replace("^", "**"), mode="eval")
+    except SyntaxError as error:
+        raise ExpressionError("sintaxe inválida") from error
+    return _convert(tree.body)
+
+def _convert(node):
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return _const(node.value)
+    if isinstance(node, ast.Name):
+        if node.id == "x":
+            return VAR
+        if node.id in CONSTANTS:
+            return _const(CONSTANTS[node.id])
+        raise ExpressionError(f"nome desconhecido: {node.id}")
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _convert(node.operand)
+        return _neg(operand) if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_convert(node.left), _convert(node.right))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        name = ALIASES.get(node.func.id, node.func.id)
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"função desconhecida: {node.func.id}")
+        if len(node.args) != 1 or node.keywords:
+            raise ExpressionError(f"{node.func.id} recebe exatamente um argumento")
+        return _call(name, _convert(node.args[0]))
+    raise ExpressionError(f"construção não suportada: {ast.dump(node)}")
+
+# Derivação simbólica
+
+_CALL_RULES = {
+    "sin": lambda a: _call("cos", a),
+    "cos": lambda a: _neg(_call("sin", a)),
+    "tan": lambda a: _div(ONE, _pow(_call("cos", a), TWO)),
+    "atan": lambda a: _div(ONE, _add(ONE, _pow(a, TWO))),
+    "sinh": lambda a: _call("cosh", a),
+    "cosh": lambda a: _call("sinh", a),
+    "tanh": lambda a: _sub(ONE, _pow(_call("tanh", a), TWO)),
+    "exp": lambda a: _call("exp", a),
+    "log": lambda a: _div(ONE, a),
+    "sqrt": lambda a: _div(ONE, _mul(TWO, _call("sqrt", a))),
+    "abs": lambda a: _call("sign", a),
+    "sign": lambda a: ZERO,
+}
+
+def derive(node):
+    """Derivada simbólica da árvore em relação a x"""
+    kind = node[0]
+    if kind == "const":
+        return ZERO
+    if kind == "var":
+        return ONE
+    if kind == "neg":
+        return _neg(derive(node[1]))
+    if kind == "call":
+        return _mul(_CALL_RULES[node[1]](node[2]), derive(node[2]))
+
+    a, b = node[1], node[2]
+    if kind == "add":
+        return _add(derive(a), derive(b))
+    if kind == "sub":
+        return _sub(derive(a), derive(b))
+    if kind == "mul":
+        return _add(_mul(derive(a), b), _mul(a, derive(b)))
+    if kind == "div":
+        return _div(_sub(_mul(derive(a), b), _mul(a, derive(b))), _pow(b, TWO))
+    # Potência
+    if _is_const(b):
+        return _mul(_mul(b, _pow(a, _const(b[1] - 1))), derive(a))
+    if _is_const(a):
+        if a[1] <= 0:
+            raise ExpressionError(f"({a[1]!r})**(...) com expoente variável só é definido para base positiva")
+        return _mul(_mul(node, _const(math.log(a[1]))), derive(b))
+    return _mul(node, _add(_mul(derive(b), _call("log", a)), _div(_mul(b, derive(a)), a)))
+
+# Conferência numérica
+
+# Pontos em que a fórmula compilada é comparada com a fórmula original (com x < 0,
+# onde as simplificações de potências erram o sinal)
+CHECK_POINTS = (-7.3, -2.9, -0.7, 0.6, 3.1, 8.7, 123.4)
+
+def _reference(text):
+    """
+    A fórmula original avaliada pelo Python, sem simplificação; retorna None
+    onde ela não está definida (ou dá um número complexo)
+    """
+    code = compile(ast.parse(text.strip().replace("^", "**"), mode="eval"), "<fórmula>", "eval")
+    namespace = dict(_SCALAR_CALLS, **CONSTANTS, __builtins__={})
+    namespace.update((alias, _SCALAR_CALLS[name]) for alias, name in ALIASES.items())
+
+    def f(x):
+        try:
+            value = eval(code, dict(namespace, x=x))
+        except (ValueError, ZeroDivisionError, OverflowError):
+            return None
+        if isinstance(value, complex) or not math.isfinite(value):
+            return None
+        return float(value)
+    return f
+
+def check_expression(compiled, points=CHECK_POINTS):
+    """
+    Compara f e f′ compiladas com a fórmula original (f′ por diferença
+    central) e lança ExpressionError no primeiro ponto em que discordam
+    """
+    reference = _reference(compiled.text)
+    for x in points:
+        expected = reference(x)
+        if expected is None:
+            continue
+        h = 1e-5 * max(1.0, abs(x))
+        before, after = reference(x - h), reference(x + h)
+        checks = [("f", compiled.f, expected)]
+        if before is not None and after is not None:
+            checks.append(("f′", compiled.df, (after - before) / (2 * h)))
+        for name, func, value in checks:
+            try:
+                result = func(x)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                result = math.nan
+            if not math.isclose(result, value, rel_tol=1e-3, abs_tol=1e-6):
+                raise ExpressionError(
+                    f"{name} compilada de {compiled.text!r} difere da fórmula em x = {x}: {result!r} ≠ {value!r}")
+
+# Geração de código
+
+# Operador e precedência de cada operação binária
+_BINARY_SOURCE = {"add": (" + ", 1), "sub": (" - ", 1), "mul": ("*", 2), "div": ("/", 2), "pow": ("**", 4)}
+_NEG_PRECEDENCE = 3
+_ATOM_PRECEDENCE = 5
+
+def _format_number(value):
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+def _source(node, vector):
+    """Retorna (código, precedência) da árvore"""
+    kind = node[0]
+    if kind == "const":
+        return _format_number(node[1]), _NEG_PRECEDENCE if node[1] < 0 else _ATOM_PRECEDENCE
+    if kind == "var":
+        return "x", _ATOM_PRECEDENCE
+    if kind == "neg":
+        text, precedence = _source(node[1], vector)
+        if precedence < _NEG_PRECEDENCE:
+            text = f"({text})"
+        return f"-{text}", _NEG_PRECEDENCE
+    if kind == "call":
+        text, _ = _source(node[2], vector)
+        return f"{FUNCTIONS[node[1]][vector]}({text})", _ATOM_PRECEDENCE
+
+    operator, precedence = _BINARY_SOURCE[kind]
+    left, left_precedence = _source(node[1], vector)
+    right, right_precedence = _source(node[2], vector)
+    if kind == "pow":
+        # A potência associa à direita e tem precedência maior que o sinal
+        left_needs = left_precedence <= precedence
+        right_needs = right_precedence < _NEG_PRECEDENCE
+    else:
+        left_needs = left_precedence < precedence
+        right_needs = right_precedence < precedence or (right_precedence == precedence and kind in ("sub", "div"))
+    if left_needs:
+        left = f"({left})"
+    if right_needs:
+        right = f"({right})"
+    return f"{left}{operator}{right}", precedence
+
+def format_expression(node):
+    """Texto legível da árvore (sintaxe do Python, sem prefixos de módulo)"""
+    return _source(node, 0)[0].replace("math.", "").replace("_sign", "sign")
+
+def _compile(node, vector):
+    if _is_const(node):
+        value = node[1]
+        if vector:
+            return lambda x: np.full(np.shape(x), value)
+        return lambda x: value
+
+    body, _ = _source(node, vector)
+    if vector:
+        source = f"def f(x):\n    x = np.asarray(x, dtype=np.float64)\n    return {body}\n"
+    else:
+        source = f"def f(x):\n    return {body}\n"
+    namespace = dict(_NAMESPACE)
+    exec(compile(source, "<expressão>", "exec"), namespace)
+    return namespace["f"]
+
+class CompiledExpression:
+    """
+    Fórmula compilada: f, f′ e f″ escalares (f, df, d2f) e vetorizadas
+    (f_vec, df_vec, d2f_vec), além das árvores usadas para gerá-las.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        try:
+            self.tree = parse_expression(text)
+            self.derivative_tree = derive(self.tree)
+            self.second_derivative_tree = derive(self.derivative_tree)
+        except ExpressionError as error:
+            raise ExpressionError(f"{text!r}: {error}") from error
+
+        trees = (self.tree, self.derivative_tree, self.second_derivative_tree)
+        self.f, self.df, self.d2f = (_compile(tree, 0) for tree in trees)
+        self.f_vec, self.df_vec, self.d2f_vec = (_compile(tree, 1) for tree in trees)
+        check_expression(self)
+
+    @property
+    def derivative_text(self):
+        return format_expression(self.derivative_tree)
+
+    @property
+    def second_derivative_text(self):
+        return format_expression(self.second_derivative_tree)
+
+    def functions(self):
+        """Dicionário com as seis funções compiladas (chaves usadas por Track)"""
+        return {
+            "f": self.f, "df": self.df, "d2f": self.d2f,
+            "f_vec": self.f_vec, "df_vec": self.df_vec, "d2f_vec": self.d2f_vec,
+        }
+
+@lru_cache(maxsize=128)
+def compile_expression(text):
+    """Compila a fórmula (com cache: a mesma fórmula devolve o mesmo objeto)"""
+    return CompiledExpression(text)
@@ -1,22 +1,33 @@
-import math
+from src.models.expressions import compile_expression
 
-# Biblioteca de funções matemáticas para o jogo
+# Erro aceito nas respostas quando a pista não define "tolerance"
+DEFAULT_TOLERANCE = 0.5
+
+# Biblioteca de funções matemáticas para o jogo. Cada pista é só dados: a
+# expressão (sintaxe do Python) é compilada com as derivadas calculadas
+# simbolicamente; "formula" é o texto exibido para o jogador. "tolerance"
+# (opcional) é o erro aceito nas respostas; calibre com src.engine.calibration.
 FUNCTIONS = [
     {
         "name": "Senoide",
         "formula": "f(x) = 50·sen(0.01x) + 0.001x² + 300",
-        "f": lambda x: 50 * math.sin(0.01 * x) + 0.001 * x**2 + 300,
-        "df": lambda x: 50 * 0.01 * math.cos(0.01 * x) + 0.002 * x,
+        "expression": "50*sin(0.01*x) + 0.001*x**2 + 300",
         "range": (0, 1000),
         "checkpoints": 4
     }
 ]
 
 def get_function(index=0):
-    """Retorna uma função da biblioteca pelo índice"""
-    if 0 <= index < len(FUNCTIONS):
-        return FUNCTIONS[index]
-    return FUNCTIONS[0]
+    """
+    Retorna uma função da biblioteca pelo índice, com f, f′ e f″ compiladas
+    (chaves f, df, d2f e as versões vetorizadas f_vec, df_vec, d2f_vec)
+    """
+    if not 0 <= index < len(FUNCTIONS):
+        index = 0
+    function_data = FUNCTIONS[index]
+    if "expression" not in function_data:
+        return function_data
+    return dict(function_data, **compile_expression(function_data["expression"]).functions())
 
 def evaluate_function(func, x):
     """Avalia uma função em um ponto x"""
@@ -26,7 +37,7 @@ def evaluate_derivative(func_derivative, x):
     """Avalia a derivada de uma função em um ponto x"""
     return func_derivative(x)
 
-def check_derivative_answer(user_answer, actual_derivative, tolerance=0.5):
+def check_derivative_answer(user_answer, actual_derivative, tolerance=DEFAULT_TOLERANCE):
     """Verifica se a resposta do usuário está correta dentro de uma tolerância"""
     try:
         user_value = float(user_answer)
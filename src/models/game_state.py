@@ -1,27 +1,76 @@
+import random
 import pygame
+from config.settings import TICK_RATE, BASE_TICK_RATE
 from src.models.car import Car
 from src.models.track import Track
+from src.models.endless_track import EndlessTrack
+from src.models.event_timeline import EventTimeline
 from src.models.functions import get_function, check_derivative_answer
 
+# Bits de GameState.controls (teclas de velocidade mantidas pressionadas)
+ACCELERATE = 1
+BRAKE = 2
+
+# Quanto as teclas mudam a velocidade a cada passo (a BASE_TICK_RATE)
+SPEED_STEP = 0.1
+
 class GameState:
-    def __init__(self):
+    def __init__(self, function_index=0, clock=None, effects=True, endless=False, seed=None, tolerance=None,
+                 tick_rate=TICK_RATE):
+        """
+        function_index escolhe a função da pista; clock é uma função que retorna
+        o tempo em milissegundos (padrão: pygame.time.get_ticks) e effects
+        desliga rastro/partículas do carro em simulações sem tela. Com endless,
+        a pista é infinita e gerada a partir de seed (aleatória se None).
+        tolerance substitui o erro aceito definido pela pista (calibração).
+        tick_rate é a taxa de passos de update(); a física é escalada para
+        que o carro ande e acelere igual por segundo em qualquer taxa.
+        """
+        self.function_index = function_index
+        self.clock = clock or pygame.time.get_ticks
+        self.effects = effects
+        self.endless = endless
+        self.seed = seed
+        self.tolerance = tolerance
+        self.tick_rate = tick_rate
+        self.tick_scale = BASE_TICK_RATE / tick_rate
+        self.recorder = None  # ReplayRecorder da sessão, se estiver gravando
+        self.leaderboard = None  # Leaderboard que guarda o resultado das partidas
+        self.ghosts = None  # GhostFleet com as melhores partidas dos colegas
+        self.reset()
+        
+    def set_endless(self, endless):
+        """Troca entre a pista fixa e a infinita e reinicia o jogo"""
+        self.endless = endless
         self.reset()
         
-    def reset(self):
-        """Reinicia o estado do jogo"""
-        # Carrega a função atual
-        function_data = get_function(0)
+    def reset(self, track_seed=None, rng_seed=None):
+        """
+        Reinicia o estado do jogo. As sementes da pista infinita e das
+        partículas do carro são sorteadas, a não ser que sejam informadas
+        (reprodução de gravações).
+        """
+        if track_seed is None:
+            track_seed = self.seed if self.seed is not None else random.randrange(2**32)
+        self.track_seed = track_seed
+        self.rng_seed = random.randrange(2**32) if rng_seed is None else rng_seed
         
-        # Inicializa a pista
-        self.track = Track(function_data)
+        # Inicializa a pista (infinita ou a partir da função atual)
+        if self.endless:
+            self.track = EndlessTrack(self.track_seed)
+        else:
+            self.track = Track(get_function(self.function_index))
+        self.timeline = EventTimeline(self.track)
         
         # Inicializa o carro
         start_x = self.track.range[0] + 50
-        self.car = Car(x=start_x)
+        self.car = Car(x=start_x, effects=self.effects, seed=self.rng_seed)
         
         # Configurações da câmera
-        self.camera_x = 0
-        self.camera_y = self.track.get_y_at(start_x) - 300  # HEIGHT // 2
+        self.camera_x, self.camera_y = self.camera_at(start_x, self.track.get_y_at(start_x))
+        
+        # Posição no passo anterior (para interpolar a renderização)
+        self.prev_car_x = self.car.x
         
         # Estado do jogo
         self.input_mode = False
@@ -31,31 +80,95 @@ class GameState:
         self.score = 0
         self.game_over = False
         self.victory = False
+        self.controls = 0
+        self.run_started = self.clock()
+        self.ticks = 0  # Passos simulados desde o início da partida
+        self.assisted = False  # O professor pulou trechos (F5): a partida não entra no placar
         
         # Checkpoints
         self.checkpoints_passed = 0
         self.next_checkpoint = self.track.get_checkpoint_position(0)
         self.waiting_at_checkpoint = False
+        self.schedule_events()
+        
+        if self.recorder is not None:
+            self.recorder.record_keyframe(self)
+        if self.leaderboard is not None:
+            self.leaderboard.discard_run()
+        if self.ghosts is not None:
+            self.ghosts.restart()
+        
+    def set_controls(self, controls):
+        """Define as teclas de velocidade mantidas (bits ACCELERATE e BRAKE)"""
+        self.controls = controls
+        
+    def speed_is_steady(self):
+        """Se a velocidade do carro fica igual nos próximos ticks (teclas soltas ou já no limite)"""
+        if self.controls & ACCELERATE:
+            return self.car.speed >= self.car.max_speed
+        if self.controls & BRAKE:
+            return self.car.speed <= 1.0
+        return True
+        
+    def schedule_events(self):
+        """Recalcula o x do próximo evento (chamado sempre que checkpoint ou modo mudam)"""
+        self.next_event_x = self.timeline.next_event_x(self)
         
     def update(self):
         """Atualiza o estado do jogo"""
+        if self.recorder is not None:
+            self.recorder.begin_tick(self)
+        
+        self.prev_car_x = self.car.x
+        self.ticks += 1
+        
+        # Os fantasmas seguem as partidas gravadas, independentes do jogador
+        if self.ghosts is not None:
+            self.ghosts.advance()
+        
+        # Acelera ou freia conforme as teclas (fora dos checkpoints)
+        if not self.game_over and not self.input_mode:
+            if self.controls & ACCELERATE:
+                self.car.speed = min(self.car.max_speed, self.car.speed + SPEED_STEP * self.tick_scale)
+            elif self.controls & BRAKE:
+                self.car.speed = max(1.0, self.car.speed - SPEED_STEP * self.tick_scale)
+        
         if not self.game_over and not self.waiting_at_checkpoint:
+            # Gera/descarta trechos da pista infinita conforme o carro avança
+            self.track.update(self.car.x)
+            
             # Atualiza a posição do carro
-            self.car.update_position(self.track.get_y_at)
+            self.car.update_position(self.track.get_y_at, self.tick_scale)
             
             # Atualiza a câmera
             self.update_camera()
             
-            # Verifica checkpoints
-            self.check_checkpoint()
+            # Checkpoints e fim da pista só precisam ser testados a partir do próximo evento
+            if self.car.x >= self.next_event_x:
+                self.check_checkpoint()
+                self.check_end_of_track()
             
-            # Verifica fim da pista
-            self.check_end_of_track()
+        if self.recorder is not None:
+            self.recorder.end_tick(self)
             
     def update_camera(self):
         """Atualiza a posição da câmera para seguir o carro"""
-        self.camera_x = max(0, self.car.x - 333)  # WIDTH // 3
-        self.camera_y = self.car.y - 300  # HEIGHT // 2
+        self.camera_x, self.camera_y = self.camera_at(self.car.x, self.car.y)
+        
+    def camera_at(self, x, y):
+        """Retorna a posição da câmera que segue um carro no ponto (x, y)"""
+        return max(0, x - 333), y - 300  # WIDTH // 3, HEIGHT // 2
+        
+    def get_view(self, alpha):
+        """
+        Retorna (car_x, camera_x, camera_y) interpolados entre os dois últimos
+        passos de simulação; alpha é a fração do passo já decorrida (0 a 1).
+        """
+        if self.car.x == self.prev_car_x:
+            return self.car.x, self.camera_x, self.camera_y
+        x = self.prev_car_x + (self.car.x - self.prev_car_x) * alpha
+        camera_x, camera_y = self.camera_at(x, self.track.get_y_at(x))
+        return x, camera_x, camera_y
         
     def check_checkpoint(self):
         """Verifica se o carro chegou a um checkpoint"""
@@ -64,7 +177,8 @@ class GameState:
             self.waiting_at_checkpoint = True
             self.input_mode = True
             self.message = f"Qual a derivada em x ≈ {int(self.next_checkpoint)}?"
-            self.message_time = pygame.time.get_ticks()
+            self.message_time = self.clock()
+            self.schedule_events()
             
     def check_end_of_track(self):
         """Verifica se o carro chegou ao fim da pista"""
@@ -79,12 +193,21 @@ class GameState:
                 self.message = "Fim da pista! Você não completou todos os checkpoints!"
                 
             self.game_over = True
+            self.schedule_events()
+            if self.leaderboard is not None:
+                self.leaderboard.record_run(self)
             
     def check_answer(self):
         """Verifica a resposta do usuário para a derivada no checkpoint"""
         real_slope = self.track.get_slope_at(self.car.x)
+        tolerance = self.track.tolerance if self.tolerance is None else self.tolerance
+        correct = check_derivative_answer(self.input_text, real_slope, tolerance)
+        if self.recorder is not None:
+            self.recorder.record_answer(self.input_text, correct)
+        if self.leaderboard is not None:
+            self.leaderboard.record_answer(self, correct)
         
-        if check_derivative_answer(self.input_text, real_slope):
+        if correct:
             self.message = "✓ Correto! Continue!"
             self.car.speed = 2.0
             self.score += 100
@@ -100,6 +223,47 @@ class GameState:
             self.message = "✗ Errado! Você bateu!"
             self.car.set_crashed()
             self.game_over = True
+            if self.leaderboard is not None:
+                self.leaderboard.record_run(self)
             
         self.input_text = ''
-        self.message_time = pygame.time.get_ticks()
\ No newline at end of file
+        self.message_time = self.clock()
+        self.schedule_events()
+        
+    def cancel_input(self):
+        """Cancela a resposta que estava sendo digitada"""
+        if self.recorder is not None:
+            self.recorder.record_cancel()
+        self.input_mode = False
+        self.input_text = ''
+        self.message = "Entrada cancelada"
+        self.message_time = self.clock()
+        self.schedule_events()
+        
+    def fast_forward(self, max_ticks=None):
+        """
+        Avança direto até o próximo evento (checkpoint ou fim da pista) quando
+        a velocidade é constante: os ticks intermediários são pulados de uma
+        vez e só o tick do evento é simulado normalmente. Retorna quantos
+        ticks avançou (0 se o próximo evento não dá para prever).
+        """
+        ticks = self.timeline.ticks_until_event(self)
+        if ticks is None:
+            return 0
+        if max_ticks is not None:
+            ticks = max(1, min(ticks, max_ticks))
+        
+        skipped = ticks - 1
+        if skipped:
+            car = self.car
+            car.x += car.speed * self.tick_scale * skipped
+            self.track.update(car.x)
+            car.y = self.track.get_y_at(car.x)
+            car.trail.clear()  # O rastro ligaria as duas pontas do salto
+            self.ticks += skipped
+            if self.ghosts is not None:
+                self.ghosts.advance(skipped)
+            if self.recorder is not None:
+                self.recorder.record_skip(self, skipped)
+        self.update()
+        return ticks
@@ -0,0 +1,148 @@
+import sys
+import numpy as np
+from config.settings import TICK_RATE, CYAN, PURPLE, ORANGE, PINK, GREEN, YELLOW
+
+# Pinturas dos fantasmas (translúcidas, para não confundir com o carro do jogador)
+GHOST_COLORS = (CYAN, PURPLE, ORANGE, PINK, GREEN, YELLOW)
+GHOST_ALPHA = 110
+
+class GhostFleet:
+    """
+    Carros fantasmas (partidas gravadas) guardados em arrays do NumPy.
+
+    Cada fantasma é só uma linha dos arrays x, speed e color (índice em
+    GHOST_COLORS), sem superfície, rastro ou partículas próprios. O
+    percurso de cada um (o x em cada tick) fica em um único array
+    concatenado, com o início e o tamanho de cada fantasma, e advance()
+    move a frota inteira com algumas operações vetorizadas, qualquer que
+    seja o número de ticks. Os fantasmas param quando o percurso acaba.
+    """
+
+    def __init__(self, paths, colors=None):
+        """paths: para cada fantasma, o x do carro em cada tick da partida"""
+        paths = [np.asarray(path, dtype=np.float64) for path in paths if len(path) > 0]
+        self.count = len(paths)
+        self.last_tick = np.array([len(path) - 1 for path in paths], dtype=np.int64)
+        self.offsets = np.zeros(self.count, dtype=np.int64)
+        if self.count:
+            self.offsets[1:] = np.cumsum(self.last_tick + 1)[:-1]
+        self.positions = np.concatenate(paths) if paths else np.empty(0)
+        self.duration = int(self.last_tick.max()) if self.count else 0
+        if colors is None:
+            colors = np.arange(self.count) % len(GHOST_COLORS)
+        self.color = np.asarray(colors, dtype=np.uint8)
+        self.restart()
+
+    def restart(self):
+        """Volta todos os fantasmas para o início da partida"""
+        self.tick = 0
+        self.x = self.positions[self.offsets]
+        self.prev_x = self.x.copy()
+        self.speed = np.zeros(self.count, dtype=np.float64)
+
+    def advance(self, ticks=1):
+        """Avança a frota inteira `ticks` ticks"""
+        np.copyto(self.prev_x, self.x)
+        if self.tick >= self.duration:
+            self.speed.fill(0)
+            return
+        self.tick += ticks
+        np.take(self.positions, self.offsets + np.minimum(self.tick, self.last_tick), out=self.x)
+        np.subtract(self.x, self.prev_x, out=self.speed)
+        self.speed /= ticks
+
+    @property
+    def moving(self):
+        """Se ainda há fantasmas seguindo o percurso gravado"""
+        return self.tick < self.duration
+
+    def visible(self, camera_x, width, margin, alpha=1.0):
+        """
+        Retorna (índices, x) dos fantasmas dentro de [camera_x - margin,
+        camera_x + width + margin], com x interpolado entre os dois últimos ticks
+        """
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        indices = np.flatnonzero((x > camera_x - margin) & (x < camera_x + width + margin))
+        return indices, x[indices]
+
+class GhostLoader:
+    """
+    Carrega em segundo plano os fantasmas de uma pista.
+
+    Cada gravação é simulada (load_ghost_path) em uma tarefa separada da
+    thread de E/S, com no máximo MAX_IN_FLIGHT na fila por vez: uma tarefa
+    só para todas seguraria por segundos as escritas das gravações e do
+    placar. Quando a última termina, on_ready(frota) é chamado na thread
+    principal. Gravações que não dá para ler são ignoradas com um aviso.
+    """
+
+    MAX_IN_FLIGHT = 8
+
+    def __init__(self, io_worker, paths, function_index, on_ready, tick_rate=TICK_RATE):
+        self.io_worker = io_worker
+        self.paths = list(paths)
+        self.function_index = function_index
+        self.on_ready = on_ready
+        self.tick_rate = tick_rate
+        self.results = [None] * len(self.paths)
+        self.submitted = 0
+        self.remaining = len(self.paths)
+        if not self.paths:
+            on_ready(GhostFleet([]))
+        while self.submitted < min(len(self.paths), self.MAX_IN_FLIGHT):
+            self._submit_next()
+
+    def _submit_next(self):
+        index = self.submitted
+        self.submitted += 1
+        self.io_worker.submit(load_ghost_path, self.paths[index], self.function_index, self.tick_rate,
+                              on_done=lambda job: self._done(index, job), block=True)
+
+    def _done(self, index, job):
+        if isinstance(job.error, (OSError, ValueError)):
+            print(f"Fantasma ignorado ({self.paths[index]}): {job.error}", file=sys.stderr)
+        elif job.error is not None:
+            raise job.error
+        else:
+            self.results[index] = job.result
+        self.remaining -= 1
+        if self.submitted < len(self.paths):
+            self._submit_next()
+        elif not self.remaining:
+            # A frota mantém a ordem da lista de gravações (e, com ela, as cores)
+            self.on_ready(GhostFleet([path for path in self.results if path is not None]))
+
+def load_ghost_path(path, function_index=0, tick_rate=TICK_RATE):
+    """
+    Simula uma gravação (sem efeitos) e retorna o x do carro a cada tick (a
+    `tick_rate` passos por segundo) na partida de maior pontuação da pista
+    fixa `function_index`, ou None se a gravação não tiver nenhuma partida
+    nessa pista.
+    """
+    from src.models.replay import ReplayPlayer
+
+    player = ReplayPlayer(path, effects=False)
+    try:
+        runs = {}  # identidade da partida -> [pontuação, xs]
+        state = player.game_state
+        while True:
+            # Cada partida da sessão tem sua própria semente (reinícios sorteiam outra)
+            if state.function_index == function_index and not state.endless:
+                run = runs.setdefault((state.track_seed, state.rng_seed), [0, []])
+                run[0] = state.score
+                run[1].append(state.car.x)
+            if player.finished:
+                break
+            player.step()
+        recorded_rate = player.tick_rate
+    finally:
+        player.close()
+    if not runs:
+        return None
+    # max() fica com a primeira partida em caso de empate
+    xs = np.array(max(runs.values(), key=lambda run: run[0])[1])
+    if recorded_rate != tick_rate:
+        # Gravação feita com outra taxa de passos: reamostra no tempo
+        seconds = (len(xs) - 1) / recorded_rate
+        xs = np.interp(np.arange(int(seconds * tick_rate) + 1) / tick_rate, np.arange(len(xs)) / recorded_rate, xs)
+    return xs
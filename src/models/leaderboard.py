@@ -0,0 +1,205 @@
+import glob
+import heapq
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from urllib.parse import quote
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    student TEXT NOT NULL,
+    host TEXT NOT NULL,
+    track TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    score INTEGER NOT NULL,
+    victory INTEGER NOT NULL,
+    checkpoints INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    seed INTEGER
+);
+CREATE TABLE IF NOT EXISTS answers (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    checkpoint INTEGER NOT NULL,
+    x REAL NOT NULL,
+    answer TEXT NOT NULL,
+    correct INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_track_score ON runs (track, score DESC, finished_at);
+CREATE INDEX IF NOT EXISTS runs_by_student ON runs (student, finished_at DESC);
+CREATE INDEX IF NOT EXISTS answers_by_run ON answers (run_id);
+"""
+
+# Consultas fixas: o sqlite3 guarda as instruções preparadas por conexão
+# (cached_statements), então cada uma é compilada uma única vez
+INSERT_RUN = ("INSERT INTO runs (session, student, host, track, finished_at, score, victory, checkpoints, "
+              "duration_ms, seed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+INSERT_ANSWER = "INSERT INTO answers (run_id, checkpoint, x, answer, correct) VALUES (?, ?, ?, ?, ?)"
+TOP_SCORES = ("SELECT score, finished_at, student, host FROM runs WHERE track = ? "
+              "ORDER BY score DESC, finished_at LIMIT ?")
+STUDENT_HISTORY = ("SELECT finished_at, track, score, victory, checkpoints, duration_ms FROM runs "
+                   "WHERE student = ? ORDER BY finished_at DESC LIMIT ?")
+
+ENDLESS_TRACK = "Pista infinita"
+
+def track_key(track):
+    """Nome da pista no placar (os trechos da pista infinita contam como uma pista só)"""
+    return ENDLESS_TRACK if track.endless else track.name
+
+class ScoreStore:
+    """
+    Placar e histórico de partidas em SQLite.
+
+    Use sempre da mesma thread (a do IOWorker). Localmente há um só arquivo,
+    em modo WAL: as consultas não esperam pelas escritas. Com shared=True
+    (pasta de rede usada pelas máquinas de um laboratório), cada máquina
+    escreve só no seu arquivo runs-<máquina>.db, então ninguém disputa o
+    lock de escrita com as outras. Nesse modo o journal é o tradicional
+    (DELETE), porque o WAL depende de memória compartilhada (-shm), que não
+    funciona em sistemas de arquivos de rede. As consultas leem todos os
+    arquivos (somente leitura) e juntam os resultados; um arquivo ocupado é
+    pulado depois de uma espera curta, sem novas tentativas.
+    """
+
+    BUSY_TIMEOUT = 2.0  # Espera pelo lock de escrita (s)
+    SHARED_READ_TIMEOUT = 0.05  # Espera por um arquivo de outra máquina (s)
+
+    def __init__(self, directory, shared=False, host=None):
+        self.directory = directory
+        self.shared = shared
+        self.host = host or socket.gethostname()
+        name = f"runs-{_safe_name(self.host)}.db" if shared else "runs.db"
+        self.path = os.path.join(directory, name)
+        self._connection = None
+        self._readers = {}  # Arquivos das outras máquinas (modo compartilhado)
+
+    def _writer(self):
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None,
+                                         cached_statements=32)
+            connection.execute("PRAGMA journal_mode=" + ("DELETE" if self.shared else "WAL"))
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _reader(self, path):
+        connection = self._readers.get(path)
+        if connection is None:
+            uri = "file:" + quote(os.path.abspath(path)) + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, timeout=self.SHARED_READ_TIMEOUT,
+                                         isolation_level=None, cached_statements=32)
+            self._readers[path] = connection
+        return connection
+
+    def write_batch(self, runs):
+        """
+        Grava partidas em uma única transação. runs é uma lista de (linha da
+        partida, respostas), com a linha na ordem de INSERT_RUN e cada
+        resposta como (checkpoint, x, texto, acertou).
+        """
+        connection = self._writer()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            for run, answers in runs:
+                run_id = connection.execute(INSERT_RUN, run).lastrowid
+                connection.executemany(INSERT_ANSWER, [(run_id,) + answer for answer in answers])
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            raise
+        return len(runs)
+
+    def _query(self, sql, params, limit, key):
+        """Executa a consulta em cada arquivo e junta os `limit` melhores por key"""
+        if not self.shared:
+            if self._connection is None and not os.path.exists(self.path):
+                return []
+            return self._writer().execute(sql, params).fetchall()
+
+        rows = []
+        for path in glob.glob(os.path.join(self.directory, "runs-*.db")):
+            try:
+                if path == self.path:
+                    rows.extend(self._writer().execute(sql, params).fetchall())
+                else:
+                    rows.extend(self._reader(path).execute(sql, params).fetchall())
+            except sqlite3.DatabaseError:
+                continue  # Ocupado (ou ainda sem tabelas): fica para a próxima consulta
+        return heapq.nsmallest(limit, rows, key=key)
+
+    def top_scores(self, track, limit=10):
+        """Melhores partidas da pista: lista de (pontuação, quando, aluno, máquina)"""
+        return self._query(TOP_SCORES, (track, limit), limit, key=lambda row: (-row[0], row[1]))
+
+    def student_history(self, student, limit=20):
+        """Últimas partidas do aluno: (quando, pista, pontuação, vitória, checkpoints, duração em ms)"""
+        return self._query(STUDENT_HISTORY, (student, limit), limit, key=lambda row: -row[0])
+
+    def close(self):
+        for connection in self._readers.values():
+            connection.close()
+        self._readers = {}
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+class Leaderboard:
+    """
+    Lado do jogo do placar (thread principal). O GameState avisa das
+    respostas e do fim de cada partida; as partidas terminadas vão para o
+    ScoreStore em lotes, na thread de E/S, uma transação por lote. Se a fila
+    de E/S estiver cheia, o lote espera e segue junto com o próximo.
+    """
+
+    def __init__(self, store, io_worker, student, session=None):
+        self.store = store
+        self.io_worker = io_worker
+        self.student = student
+        self.session = session or uuid.uuid4().hex
+        self.pending = []  # Partidas ainda não enviadas para a thread de E/S
+        self.answers = []  # Respostas da partida atual
+        self.best = {}  # Melhor pontuação conhecida por pista
+
+    def record_answer(self, state, correct):
+        """Guarda a resposta do checkpoint atual (chamado por GameState.check_answer)"""
+        self.answers.append((state.checkpoints_passed, float(state.next_checkpoint), state.input_text, int(correct)))
+
+    def record_run(self, state):
+        """Fecha a partida (chamado quando o jogo termina) e envia o lote"""
+        if state.assisted:
+            # Com saltos do professor a pontuação e a duração não valem para o placar
+            self.discard_run()
+            return
+        track = track_key(state.track)
+        run = (self.session, self.student, self.store.host, track, time.time(), state.score,
+               int(state.victory), state.checkpoints_passed, int(state.clock() - state.run_started),
+               state.track_seed if state.endless else None)
+        self.pending.append((run, self.answers))
+        self.answers = []
+        self.best[track] = max(self.best.get(track, 0), state.score)
+        self.flush()
+
+    def discard_run(self):
+        """Descarta as respostas de uma partida abandonada"""
+        self.answers = []
+
+    def flush(self, block=False):
+        """Envia as partidas pendentes para a thread de E/S"""
+        if self.pending and self.io_worker.submit(self.store.write_batch, self.pending, block=block):
+            self.pending = []
+
+    def request_best(self, track):
+        """Busca em segundo plano o recorde da pista (fica em self.best)"""
+        def done(job):
+            if job.error is None and job.result:
+                self.best[track] = max(self.best.get(track, 0), job.result[0][0])
+        self.io_worker.submit(self.store.top_scores, track, 1, on_done=done)
+
+def _safe_name(name):
+    return "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
@@ -0,0 +1,177 @@
+import numpy as np
+import pygame
+from src.utils.surfaces import to_display_format
+
+# Quantização das cores usada para compartilhar sprites entre partículas
+COLOR_LEVELS = 16
+COLOR_STEP = 256 // COLOR_LEVELS
+
+def circle_sprite(radius, color):
+    """Sprite padrão: um círculo sólido da cor informada"""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return sprite
+
+def spawn_seeds(seed, count):
+    """
+    Sementes independentes derivadas de `seed` (None, inteiro ou
+    SeedSequence), uma para cada sistema: a mesma semente em dois sistemas
+    faria os dois sortearem exatamente os mesmos números
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(count)
+
+class ParticleSystem:
+    """
+    Sistema de partículas em estrutura de arrays (posição, velocidade, vida,
+    tamanho e cor em arrays NumPy pré-alocados).
+
+    A atualização é vetorizada, partículas mortas são removidas trocando-as
+    pelas últimas partículas vivas (swap-remove) e o desenho é feito em lote
+    com Surface.blits, usando sprites pré-renderizados por faixa de tamanho e cor.
+    """
+
+    def __init__(self, capacity=256, seed=None, sprite_builder=circle_sprite):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.phase = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.rng = np.random.default_rng(seed)
+        self.sprite_builder = sprite_builder
+        self._sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def _fields(self):
+        return (self.x, self.y, self.vx, self.vy, self.life, self.max_life,
+                self.size, self.phase, self.color)
+
+    def _reserve(self, extra):
+        """Garante espaço para mais `extra` partículas (dobrando a capacidade se preciso)"""
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name in ("x", "y", "vx", "vy", "life", "max_life", "size", "phase", "color"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def emit(self, x, y, vx=0.0, vy=0.0, size=1.0, life=1.0, max_life=None, color=(255, 255, 255), phase=0.0):
+        """Adiciona uma ou várias partículas (cada argumento pode ser escalar ou array)"""
+        n = max(np.size(v) for v in (x, y, vx, vy, size, life, phase))
+        if np.ndim(color) == 2:
+            n = max(n, len(color))
+        self._reserve(n)
+
+        s = slice(self.count, self.count + n)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = vx
+        self.vy[s] = vy
+        self.size[s] = size
+        self.life[s] = life
+        self.max_life[s] = life if max_life is None else max_life
+        self.phase[s] = phase
+        self.color[s] = color
+        self.count += n
+
+    def update(self, life_decay=0.0, size_decay=1.0, min_size=0.0, dt=1.0):
+        """Move as partículas, envelhece-as e remove as que morreram"""
+        n = self.count
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        if life_decay:
+            self.life[:n] -= life_decay * dt
+        if size_decay != 1.0:
+            self.size[:n] *= size_decay ** dt
+
+        if life_decay or min_size:
+            dead = (self.life[:n] <= 0) | (self.size[:n] < min_size)
+            if dead.any():
+                self.remove(dead)
+
+    def remove(self, dead):
+        """Remove as partículas marcadas (máscara booleana) preenchendo os buracos com as do final"""
+        n = self.count
+        dead_indices = np.flatnonzero(dead)
+        new_count = n - len(dead_indices)
+
+        # Buracos dentro da nova região ativa recebem partículas vivas do final
+        holes = dead_indices[dead_indices < new_count]
+        tail = np.arange(new_count, n)
+        movers = tail[~dead[new_count:n]]
+        for field in self._fields():
+            field[holes] = field[movers]
+        self.count = new_count
+
+    def wrap(self, width, height, respawn_y=0.0):
+        """Reposiciona partículas que saem da tela (para efeitos de fundo contínuos)"""
+        n = self.count
+        fallen = self.y[:n] > height
+        if fallen.any():
+            self.y[:n][fallen] = respawn_y
+            self.x[:n][fallen] = self.rng.integers(0, width, size=int(fallen.sum()), endpoint=True)
+        x = self.x[:n]
+        x[x < 0] = width
+        x[x > width] = 0
+
+    def clear(self):
+        """Remove todas as partículas"""
+        self.count = 0
+
+    def _get_sprite(self, key):
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            radius = key >> 12
+            color = tuple(((key >> shift) & 0xF) * 255 // (COLOR_LEVELS - 1) for shift in (8, 4, 0))
+            sprite = to_display_format(self.sprite_builder(radius, color))
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, camera_x=0, camera_y=0, height=None):
+        """
+        Desenha todas as partículas com uma única chamada a blits. Com `height`
+        informado, o eixo y do mundo é invertido (y cresce para cima, como na pista).
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        radius = self.size[:n].astype(np.int64)
+        screen_x = self.x[:n] - camera_x
+        screen_y = self.y[:n] - camera_y
+        if height is not None:
+            screen_y = height - screen_y
+
+        # Descarta partículas sem tamanho ou fora da superfície
+        width, surface_height = surface.get_size()
+        visible = ((radius > 0) & (screen_x + radius >= 0) & (screen_x - radius < width)
+                   & (screen_y + radius >= 0) & (screen_y - radius < surface_height))
+        if not visible.all():
+            radius = radius[visible]
+            screen_x = screen_x[visible]
+            screen_y = screen_y[visible]
+        if len(radius) == 0:
+            return
+
+        # Uma chave inteira por (raio, cor quantizada) para compartilhar sprites
+        quantized = (self.color[:n][visible] // COLOR_STEP).astype(np.int64)
+        keys = (radius << 12) | (quantized[:, 0] << 8) | (quantized[:, 1] << 4) | quantized[:, 2]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = np.empty(len(unique_keys), dtype=object)
+        sprites[:] = [self._get_sprite(key) for key in unique_keys.tolist()]
+
+        positions = np.column_stack((screen_x - radius, screen_y - radius)).tolist()
+        surface.blits(zip(sprites[inverse].tolist(), positions), doreturn=False)
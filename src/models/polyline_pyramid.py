@@ -0,0 +1,48 @@
+import numpy as np
+
+class PolylinePyramid:
+    """
+    Pirâmide de resoluções (mipmap) de uma curva amostrada, para desenhá-la
+    inteira em poucos pixels.
+
+    O nível 0 são as próprias amostras; cada nível seguinte junta os grupos
+    vizinhos dois a dois e guarda, de cada grupo, o intervalo em x que ele
+    cobre e a menor e a maior altura da curva ali dentro. Desenhar a faixa
+    entre o mínimo e o máximo de cada grupo não perde picos estreitos (como
+    pular amostras perderia), e o nível escolhido tem no máximo um grupo por
+    pixel: o custo do desenho não depende do tamanho da pista. A construção
+    é O(n) e feita uma vez por pista.
+    """
+
+    def __init__(self, xs, ys):
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        level = (xs, xs, ys, ys)  # (x inicial, x final, y mínimo, y máximo) de cada grupo
+        self.levels = [level]
+        while len(level[0]) > 2:
+            if len(level[0]) % 2:
+                # Com tamanho ímpar o último grupo forma par com ele mesmo
+                level = tuple(np.append(array, array[-1]) for array in level)
+            x_start, x_end, y_min, y_max = level
+            level = (x_start[0::2], x_end[1::2], np.minimum(y_min[0::2], y_min[1::2]),
+                     np.maximum(y_max[0::2], y_max[1::2]))
+            self.levels.append(level)
+        for level in self.levels:
+            for array in level:
+                array.setflags(write=False)
+
+    @property
+    def y_range(self):
+        """(menor, maior) altura da curva inteira"""
+        _, _, y_min, y_max = self.levels[-1]
+        return float(y_min.min()), float(y_max.max())
+
+    def get_level(self, max_points):
+        """
+        Retorna (x inicial, x final, y mínimo, y máximo) do nível mais
+        detalhado com no máximo `max_points` grupos
+        """
+        for level in self.levels:
+            if len(level[0]) <= max_points:
+                return level
+        return self.levels[-1]
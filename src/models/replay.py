@@ -0,0 +1,327 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_right
+from config.settings import TICK_RATE
+from src.models.game_state import GameState
+
+MAGIC = b"DDRP"
+INDEX_MAGIC = b"DDRI"
+VERSION = 1
+
+# Cabeçalho: magic, versão, ticks por segundo, intervalo entre keyframes
+HEADER = struct.Struct("<4sHHH")
+# Todo registro começa com o tipo e o tick em que aconteceu
+RECORD = struct.Struct("<BI")
+# Rodapé: posição do índice, número de keyframes, total de ticks, magic
+TRAILER = struct.Struct("<QII4s")
+
+# Tipos de registro
+KEYFRAME = 0
+CONTROLS = 1
+SPEED = 2
+ANSWER = 3
+CANCEL = 4
+CHECKPOINT = 5
+
+PAYLOADS = {
+    # sementes da pista e das partículas, função, pista infinita, estado, controles,
+    # car.x, car.y, velocidade, x anterior, próximo checkpoint, pontuação, checkpoints
+    KEYFRAME: struct.Struct("<QQHBBBdddddiI"),
+    CONTROLS: struct.Struct("<B"),
+    SPEED: struct.Struct("<d"),
+    ANSWER: struct.Struct("<BB"),  # acertou, tamanho do texto (seguido do texto em UTF-8)
+    CANCEL: struct.Struct("<"),
+    CHECKPOINT: struct.Struct("<Id"),  # índice e posição do checkpoint
+}
+
+# Bits do estado guardado nos keyframes
+WAITING, INPUT_MODE, GAME_OVER, VICTORY, CRASHED = (1 << i for i in range(5))
+
+class ReplayRecorder:
+    """
+    Grava uma sessão em formato binário compacto.
+
+    Só mudanças são gravadas: controles, velocidade alterada fora da
+    simulação, respostas e checkpoints. A cada KEYFRAME_INTERVAL ticks (e a
+    cada reinício) entra um keyframe com o estado completo, e ao fechar o
+    arquivo um índice (tick, posição) dos keyframes vai para o rodapé. Uma
+    sessão de alguns minutos ocupa poucos KB.
+
+    Com io_worker, o arquivo só é aberto e escrito na thread de E/S; se a
+    fila estiver cheia, os dados continuam no buffer até a próxima tentativa.
+    """
+
+    KEYFRAME_INTERVAL = 300
+    FLUSH_BYTES = 4096
+
+    def __init__(self, path, tick_rate=TICK_RATE, keyframe_interval=KEYFRAME_INTERVAL, io_worker=None):
+        self.path = path
+        self.io_worker = io_worker
+        self.closed = False
+        self.keyframe_interval = keyframe_interval
+        self.buffer = bytearray(HEADER.pack(MAGIC, VERSION, tick_rate, keyframe_interval))
+        self.written = 0  # Bytes já enviados ao arquivo
+        self.keyframe_ticks = array("I")
+        self.keyframe_offsets = array("Q")
+        self.ticks = 0
+        self.controls = 0
+        self.speed = None
+        self.waiting = False
+
+    def _record(self, kind, *values):
+        self.buffer += RECORD.pack(kind, self.ticks)
+        self.buffer += PAYLOADS[kind].pack(*values)
+
+    def record_keyframe(self, state):
+        """Grava o estado completo (início da gravação, reinícios e a cada intervalo)"""
+        self.keyframe_ticks.append(self.ticks)
+        self.keyframe_offsets.append(self.written + len(self.buffer))
+        car = state.car
+        flags = ((WAITING if state.waiting_at_checkpoint else 0) | (INPUT_MODE if state.input_mode else 0)
+                 | (GAME_OVER if state.game_over else 0) | (VICTORY if state.victory else 0)
+                 | (CRASHED if car.crashed else 0))
+        self._record(KEYFRAME, state.track_seed, state.rng_seed, state.function_index, state.endless,
+                     flags, state.controls, car.x, car.y, car.speed, state.prev_car_x,
+                     state.next_checkpoint, state.score, state.checkpoints_passed)
+        self.controls = state.controls
+        self.speed = car.speed
+        self.waiting = state.waiting_at_checkpoint
+        if len(self.buffer) >= self.FLUSH_BYTES:
+            self.flush()
+
+    def record_answer(self, text, correct):
+        data = text.encode("utf-8")[:255]
+        self._record(ANSWER, 1 if correct else 0, len(data))
+        self.buffer += data
+
+    def record_cancel(self):
+        self._record(CANCEL)
+
+    def record_skip(self, state, ticks):
+        """
+        Ticks avançados de uma vez (GameState.fast_forward): um keyframe guarda
+        o estado depois do salto, e a reprodução simula os ticks pulados
+        normalmente até ele.
+        """
+        self.ticks += ticks
+        self.record_keyframe(state)
+
+    def begin_tick(self, state):
+        """Registra o que mudou desde o último tick (chamado no início de GameState.update)"""
+        if state.controls != self.controls:
+            self.controls = state.controls
+            self._record(CONTROLS, state.controls)
+        if state.car.speed != self.speed:
+            # Velocidade alterada fora da simulação (resposta certa, jogador simulado...)
+            self.speed = state.car.speed
+            self._record(SPEED, self.speed)
+
+    def end_tick(self, state):
+        """Fecha o tick (chamado no fim de GameState.update)"""
+        self.speed = state.car.speed
+        if state.waiting_at_checkpoint and not self.waiting:
+            self._record(CHECKPOINT, state.checkpoints_passed, state.next_checkpoint)
+        self.waiting = state.waiting_at_checkpoint
+        self.ticks += 1
+        if self.ticks % self.keyframe_interval == 0:
+            self.record_keyframe(state)
+
+    def flush(self, block=False):
+        """Envia o buffer para o arquivo; retorna False se o worker de E/S estiver ocupado"""
+        if not self.buffer:
+            return True
+        data = bytes(self.buffer)
+        # O primeiro bloco cria o arquivo; os seguintes são acrescentados no fim
+        mode = "ab" if self.written else "wb"
+        if self.io_worker is None:
+            _write_chunk(self.path, data, mode)
+        elif not self.io_worker.submit(_write_chunk, self.path, data, mode, block=block):
+            return False
+        self.written += len(data)
+        self.buffer.clear()
+        return True
+
+    def close(self):
+        """Grava o índice de keyframes e o rodapé (o arquivo fica completo)"""
+        if self.closed:
+            return
+        self.closed = True
+        index_offset = self.written + len(self.buffer)
+        self.buffer += self.keyframe_ticks.tobytes()
+        self.buffer += self.keyframe_offsets.tobytes()
+        self.buffer += TRAILER.pack(index_offset, len(self.keyframe_ticks), self.ticks, INDEX_MAGIC)
+        # Acontece na troca de tela (volta ao menu); esperar uma vaga na fila é melhor que perder o fim
+        self.flush(block=True)
+
+def _write_chunk(path, data, mode):
+    with open(path, mode) as file:
+        file.write(data)
+
+class ReplayPlayer:
+    """
+    Reproduz uma gravação lendo o arquivo via mmap.
+
+    seek(tick) acha o último keyframe até o tick por busca binária no índice
+    do rodapé (O(log n), sem carregar o arquivo), restaura o estado e simula
+    só os ticks que faltam. A simulação é determinística: as pistas vêm das
+    sementes gravadas e as partículas do carro usam um gerador próprio.
+    Arquivos sem rodapé (sessão interrompida) têm o índice refeito lendo os
+    registros uma vez.
+    """
+
+    def __init__(self, path, effects=True, clock=None):
+        """clock é o relógio das mensagens (padrão: tempo simulado da gravação)"""
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.tick_rate, self.keyframe_interval = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} não é uma gravação válida")
+        self._load_index()
+        if not self.keyframe_ticks:
+            raise ValueError(f"{path} não tem nenhum keyframe")
+
+        self.tick = 0
+        self.offset = self.keyframe_offsets[0]
+        # A física segue a taxa de passos da gravação
+        self.game_state = GameState(clock=clock or self._clock, effects=effects, tick_rate=self.tick_rate)
+        self.seek(0)
+
+    def _clock(self):
+        return int(self.tick * 1000 / self.tick_rate)
+
+    def _load_index(self):
+        data = self.data
+        if len(data) >= HEADER.size + TRAILER.size:
+            index_offset, count, total_ticks, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+            if magic == INDEX_MAGIC:
+                # Visões diretas sobre o mmap: a busca binária lê só as posições que visita
+                view = memoryview(data)
+                self.keyframe_ticks = view[index_offset:index_offset + 4 * count].cast("I")
+                self.keyframe_offsets = view[index_offset + 4 * count:index_offset + 12 * count].cast("Q")
+                self.end = index_offset
+                self.total_ticks = total_ticks
+                return
+
+        ticks, offsets = array("I"), array("Q")
+        offset = HEADER.size
+        last_tick = 0
+        for kind, tick, _, next_offset in self._iter_records(HEADER.size, len(data)):
+            if kind == KEYFRAME:
+                ticks.append(tick)
+                offsets.append(offset)
+            last_tick = tick
+            offset = next_offset
+        self.keyframe_ticks, self.keyframe_offsets = ticks, offsets
+        self.end = offset
+        self.total_ticks = last_tick
+
+    def _read_record(self, offset):
+        """Retorna (tipo, tick, valores, próxima posição) do registro em offset"""
+        kind, tick = RECORD.unpack_from(self.data, offset)
+        offset += RECORD.size
+        payload = PAYLOADS[kind]
+        values = payload.unpack_from(self.data, offset)
+        offset += payload.size
+        if kind == ANSWER:
+            correct, size = values
+            values = (correct, bytes(self.data[offset:offset + size]).decode("utf-8"))
+            offset += size
+        return kind, tick, values, offset
+
+    def _iter_records(self, offset, end):
+        while offset + RECORD.size <= end:
+            try:
+                record = self._read_record(offset)
+            except (struct.error, KeyError, UnicodeDecodeError):
+                return  # Registro incompleto no fim de uma gravação interrompida
+            if record[3] > end:
+                return
+            yield record
+            offset = record[3]
+
+    def events(self):
+        """Percorre todos os registros como (tick, tipo, valores), sem simular"""
+        for kind, tick, values, _ in self._iter_records(HEADER.size, self.end):
+            yield tick, kind, values
+
+    def _restore(self, values):
+        (track_seed, rng_seed, function_index, endless, flags, controls, car_x, car_y, speed,
+         prev_car_x, next_checkpoint, score, checkpoints_passed) = values
+        state = self.game_state
+        # Keyframes periódicos na mesma partida só corrigem os campos, sem
+        # recriar o carro (rastro e partículas continuam); reinícios e buscas
+        # para outra partida recriam pista e carro a partir das sementes
+        same_run = (state.function_index, state.endless, state.track_seed, state.rng_seed) == \
+            (function_index, bool(endless), track_seed, rng_seed)
+        if not same_run or (state.car.crashed and not flags & CRASHED):
+            state.function_index = function_index
+            state.endless = bool(endless)
+            state.reset(track_seed=track_seed, rng_seed=rng_seed)
+
+        car = state.car
+        if flags & CRASHED and not car.crashed:
+            car.set_crashed()
+        car.x, car.y, car.speed = car_x, car_y, speed
+        state.prev_car_x = prev_car_x
+        state.next_checkpoint = next_checkpoint
+        state.score = score
+        state.checkpoints_passed = checkpoints_passed
+        state.controls = controls
+        state.waiting_at_checkpoint = bool(flags & WAITING)
+        state.input_mode = bool(flags & INPUT_MODE)
+        state.game_over = bool(flags & GAME_OVER)
+        state.victory = bool(flags & VICTORY)
+        state.schedule_events()
+        state.update_camera()
+
+    def _apply(self, kind, values):
+        state = self.game_state
+        if kind == KEYFRAME:
+            self._restore(values)
+        elif kind == CONTROLS:
+            state.controls = values[0]
+        elif kind == SPEED:
+            state.car.speed = values[0]
+        elif kind == ANSWER:
+            state.input_text = values[1]
+            state.check_answer()
+        elif kind == CANCEL:
+            state.cancel_input()
+
+    def step(self):
+        """Aplica os registros do tick atual e avança a simulação um tick"""
+        for kind, tick, values, next_offset in self._iter_records(self.offset, self.end):
+            if tick != self.tick:
+                break
+            self._apply(kind, values)
+            self.offset = next_offset
+        self.game_state.update()
+        self.tick += 1
+
+    def seek(self, tick):
+        """Leva a reprodução ao início do tick informado e retorna o GameState"""
+        tick = max(0, min(tick, self.total_ticks))
+        i = max(0, bisect_right(self.keyframe_ticks, tick) - 1)
+        self.tick = self.keyframe_ticks[i]
+        self.offset = self.keyframe_offsets[i]
+        while self.tick < tick:
+            self.step()
+        # Aplica os registros do próprio tick que vêm antes da simulação (keyframe, resposta...)
+        for kind, record_tick, values, next_offset in self._iter_records(self.offset, self.end):
+            if record_tick != self.tick or kind != KEYFRAME:
+                break
+            self._apply(kind, values)
+            self.offset = next_offset
+        return self.game_state
+
+    @property
+    def finished(self):
+        return self.tick >= self.total_ticks
+
+    def close(self):
+        if isinstance(self.keyframe_ticks, memoryview):
+            self.keyframe_ticks.release()
+            self.keyframe_offsets.release()
+        self.data.close()
+        self.file.close()
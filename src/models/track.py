@@ -1,35 +1,335 @@
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import numpy as np
+from config.settings import WIDTH, HEIGHT
+from src.models.functions import DEFAULT_TOLERANCE
+from src.models.polyline_pyramid import PolylinePyramid
+
+# Tabelas de amostras já calculadas, por (f, f', intervalo, passo)
+_sample_tables = {}
+
+# Índices de pontos críticos já calculados, pela mesma chave das tabelas
+_critical_indexes = {}
+
+# Pedaços de polilinhas adaptativas já calculados, por (chave das tabelas, nível de zoom, pedaço)
+_polylines = {}
+
+# Pirâmides de resoluções (minimapa) já calculadas, pela mesma chave das tabelas
+_pyramids = {}
+
+# Ponto onde f'(x) = 0; kind é "max", "min" ou "inflection" (inflexão horizontal)
+CriticalPoint = namedtuple("CriticalPoint", "x y kind")
+
 class Track:
-    def __init__(self, function_data):
+    # Distância (em unidades de x) entre amostras da tabela pré-calculada
+    SAMPLE_STEP = 1.0
+
+    # Polilinha desenhada: erro máximo em relação à curva e maior segmento (em pixels na tela)
+    POLYLINE_TOLERANCE = 0.25
+    POLYLINE_MAX_STEP = 64
+    # Malha em que |f″| é avaliado para escolher o passo (em unidades de x)
+    CURVATURE_STEP = 1 / 16
+    # A polilinha é calculada em pedaços deste comprimento (em unidades de x), só onde é pedida
+    POLYLINE_CHUNK = 512
+
+    # Pistas fixas terminam em range[1] (veja EndlessTrack)
+    endless = False
+
+    def __init__(self, function_data, cache=True):
+        """
+        cache=False não guarda as tabelas nos caches do módulo (usado pelos
+        trechos da pista infinita, que são criados e descartados o tempo todo)
+        """
+        self.cache = cache
         self.function = function_data["f"]
         self.derivative = function_data["df"]
+        # Versões vetorizadas e f″ (presentes nas pistas definidas por expressão)
+        self.function_vec = function_data.get("f_vec")
+        self.derivative_vec = function_data.get("df_vec")
+        self.second_derivative = function_data.get("d2f")
+        self.second_derivative_vec = function_data.get("d2f_vec")
         self.name = function_data["name"]
         self.formula = function_data["formula"]
         self.range = function_data["range"]
         self.total_checkpoints = function_data["checkpoints"]
+        self.tolerance = function_data.get("tolerance", DEFAULT_TOLERANCE)
         self.track_length = self.range[1] - self.range[0]
-        
+
         # Calcular posições dos checkpoints
         self.checkpoint_positions = self._calculate_checkpoint_positions()
-        
+
+        # Tabela de amostras de f e f' (construída uma única vez por pista)
+        self.sample_step = self.SAMPLE_STEP
+        # Pistas com a mesma chave são iguais (ex.: a cada reinício); chave dos caches
+        self.cache_key = (self.function, self.derivative, tuple(self.range), self.sample_step)
+        self.sample_x, self.sample_y, self.sample_dy = self._build_sample_table()
+
+        # Pontos críticos ordenados por x (e os x separados, para busca binária)
+        self.critical_points = self._build_critical_index()
+        self.critical_xs = [point.x for point in self.critical_points]
+
+        # Pedaços das polilinhas adaptativas por (nível de zoom, pedaço), criados quando pedidos
+        self.polylines = {}
+        self.pyramid = None
+
     def _calculate_checkpoint_positions(self):
         """Calcula as posições dos checkpoints ao longo da pista"""
         spacing = self.track_length / (self.total_checkpoints + 1)
         return [self.range[0] + (i+1) * spacing for i in range(self.total_checkpoints)]
-        
+
+    def _build_sample_table(self):
+        """Amostra f e f' em uma malha uniforme cobrindo toda a pista"""
+        # A tabela é reaproveitada entre pistas com as mesmas funções (ex.: a cada reinício)
+        key = self.cache_key
+        table = _sample_tables.get(key) if self.cache else None
+        if table is None:
+            count = int(self.track_length // self.sample_step) + 1
+            xs = self.range[0] + np.arange(count, dtype=np.float64) * self.sample_step
+            table = (xs, _evaluate_array(self.function_vec or self.function, xs),
+                     _evaluate_array(self.derivative_vec or self.derivative, xs))
+            for array in table:
+                array.setflags(write=False)
+            if self.cache:
+                _sample_tables[key] = table
+        return table
+
+    def _build_critical_index(self):
+        """
+        Encontra as raízes de f' ao longo da pista: intervalos com troca de sinal
+        na tabela de amostras são refinados por bissecção vetorizada. Raízes de
+        f'' onde f' também se anula viram inflexões horizontais.
+        """
+        key = self.cache_key
+        index = _critical_indexes.get(key) if self.cache else None
+        if index is not None:
+            return index
+
+        xs, dy = self.sample_x, self.sample_dy
+        derivative = self.derivative_vec or self.derivative
+        found = []  # (x, kind)
+
+        # Troca de sinal entre amostras vizinhas: subida -> descida é um máximo
+        brackets = np.flatnonzero(dy[:-1] * dy[1:] < 0)
+        if len(brackets):
+            roots = _bisect_roots(derivative, xs[brackets], xs[brackets + 1])
+            kinds = np.where(dy[brackets] > 0, "max", "min")
+            found.extend(zip(roots.tolist(), kinds.tolist()))
+
+        # Amostras internas em que f' é exatamente zero
+        for i in np.flatnonzero(dy[1:-1] == 0) + 1:
+            before, after = dy[i - 1], dy[i + 1]
+            kind = "max" if before > 0 > after else "min" if before < 0 < after else "inflection"
+            found.append((float(xs[i]), kind))
+
+        # f' encosta em zero sem trocar de sinal: inflexão horizontal (ex.: x³ em 0)
+        second = self.second_derivative_vec or self.second_derivative
+        if second is not None:
+            d2y = _evaluate_array(second, xs)
+            brackets = np.flatnonzero(d2y[:-1] * d2y[1:] < 0)
+            if len(brackets):
+                roots = _bisect_roots(second, xs[brackets], xs[brackets + 1])
+                scale = max(1.0, float(np.abs(dy).max()))
+                flat = np.abs(_evaluate_array(derivative, roots)) < 1e-9 * scale
+                known = [x for x, _ in found]
+                for x in roots[flat].tolist():
+                    if not any(abs(x - other) < 1e-6 for other in known):
+                        found.append((x, "inflection"))
+
+        found.sort()
+        index = [CriticalPoint(x, self.function(x), kind) for x, kind in found]
+        if self.cache:
+            _critical_indexes[key] = index
+        return index
+
+    def next_critical_point(self, x):
+        """Retorna o primeiro ponto crítico depois de x (ou None)"""
+        i = bisect_right(self.critical_xs, x)
+        return self.critical_points[i] if i < len(self.critical_points) else None
+
+    def critical_points_between(self, a, b):
+        """Retorna os pontos críticos com a <= x <= b"""
+        return self.critical_points[bisect_left(self.critical_xs, a):bisect_right(self.critical_xs, b)]
+
     def get_y_at(self, x):
         """Retorna a altura da pista em um ponto x"""
         return self.function(x)
-        
+
     def get_slope_at(self, x):
         """Retorna a inclinação da pista em um ponto x"""
         return self.derivative(x)
-        
+
+    def get_y_array(self, xs):
+        """Versão vetorizada de get_y_at para um array de posições"""
+        return _evaluate_array(self.function_vec or self.function, np.asarray(xs, dtype=np.float64))
+
+    def get_slope_array(self, xs):
+        """Versão vetorizada de get_slope_at para um array de posições"""
+        return _evaluate_array(self.derivative_vec or self.derivative, np.asarray(xs, dtype=np.float64))
+
+    def get_polyline(self, x_start, x_end, zoom=1.0):
+        """
+        Retorna (xs, ys) dos vértices da polilinha adaptativa que cobrem
+        [x_start, x_end]: desenhada com `zoom` pixels por unidade, ela fica a no
+        máximo POLYLINE_TOLERANCE pixels da curva
+        """
+        level = math.ceil(math.log2(zoom))
+        x_start = max(self.range[0], x_start)
+        x_end = min(self.range[1], x_end)
+        first_chunk = max(0, math.floor((x_start - self.range[0]) / self.POLYLINE_CHUNK))
+        last_chunk = max(first_chunk, math.ceil((x_end - self.range[0]) / self.POLYLINE_CHUNK) - 1)
+        xs_parts, ys_parts = [], []
+        for chunk in range(first_chunk, last_chunk + 1):
+            xs, ys = self._polyline_chunk(level, chunk)
+            if xs_parts:
+                # O primeiro vértice do pedaço é o último do anterior
+                xs, ys = xs[1:], ys[1:]
+            xs_parts.append(xs)
+            ys_parts.append(ys)
+        xs, ys = np.concatenate(xs_parts), np.concatenate(ys_parts)
+        first = max(0, np.searchsorted(xs, x_start, side="right") - 1)
+        last = np.searchsorted(xs, x_end, side="left") + 1
+        return xs[first:last], ys[first:last]
+
+    def _polyline_chunk(self, level, chunk):
+        """
+        Vértices (xs, ys) da polilinha no pedaço `chunk` da pista para o nível de
+        zoom `level` (potência de 2 logo acima do zoom)
+        """
+        polyline = self.polylines.get((level, chunk))
+        if polyline is None:
+            key = (self.cache_key, level, chunk)
+            polyline = _polylines.get(key) if self.cache else None
+            if polyline is None:
+                x_start = self.range[0] + chunk * self.POLYLINE_CHUNK
+                x_end = min(self.range[1], x_start + self.POLYLINE_CHUNK)
+                scale = 2.0 ** level
+                xs = _adaptive_vertices(self._curvature(x_start, x_end), x_start, x_end,
+                                        self.POLYLINE_TOLERANCE / scale, self.POLYLINE_MAX_STEP / scale)
+                polyline = (xs, self.get_y_array(xs))
+                for array in polyline:
+                    array.setflags(write=False)
+                if self.cache:
+                    _polylines[key] = polyline
+            self.polylines[(level, chunk)] = polyline
+        return polyline
+
+    def _curvature(self, x_start, x_end):
+        """(passo, |f″| na malha de CURVATURE_STEP a partir de x_start) cobrindo [x_start, x_end]"""
+        step = self.CURVATURE_STEP
+        xs = x_start + np.arange(math.ceil((x_end - x_start) / step) + 2) * step
+        if self.second_derivative is not None:
+            d2y = _evaluate_array(self.second_derivative_vec or self.second_derivative, xs)
+        else:
+            # Sem f″ compilada: diferenças finitas de f′
+            d2y = np.gradient(_evaluate_array(self.derivative_vec or self.derivative, xs), step)
+        return step, np.abs(d2y)
+
+    def get_pyramid(self):
+        """Pirâmide de resoluções da pista inteira (veja PolylinePyramid), criada da tabela de amostras"""
+        if self.pyramid is None:
+            key = self.cache_key
+            pyramid = _pyramids.get(key) if self.cache else None
+            if pyramid is None:
+                pyramid = PolylinePyramid(self.sample_x, self.sample_y)
+                if self.cache:
+                    _pyramids[key] = pyramid
+            self.pyramid = pyramid
+        return self.pyramid
+
+    def get_sample_range(self, x_start, x_end):
+        """Retorna o intervalo [início, fim) de índices das amostras que cobrem [x_start, x_end]"""
+        total = len(self.sample_x)
+        start = math.floor((x_start - self.range[0]) / self.sample_step)
+        end = math.ceil((x_end - self.range[0]) / self.sample_step) + 1
+        return min(total, max(0, start)), min(total, max(0, end))
+
+    def get_samples(self, x_start, x_end):
+        """
+        Retorna (índice global da primeira amostra, xs, ys) das amostras que
+        cobrem [x_start, x_end]
+        """
+        start, end = self.get_sample_range(x_start, x_end)
+        return start, self.sample_x[start:end], self.sample_y[start:end]
+
+    def get_viewport_points(self, camera_x, camera_y, width=WIDTH, height=HEIGHT, margin=20):
+        """
+        Retorna (índice da primeira amostra, pontos Nx2 em coordenadas de tela)
+        apenas para a parte da pista visível pela câmera.
+        """
+        start, end = self.get_sample_range(camera_x - margin, camera_x + width + margin)
+        points = np.empty((end - start, 2), dtype=np.float64)
+        points[:, 0] = self.sample_x[start:end] - camera_x
+        points[:, 1] = height - (self.sample_y[start:end] - camera_y)
+        return start, points
+
     def get_checkpoint_position(self, index):
         """Retorna a posição do checkpoint pelo índice"""
         if 0 <= index < len(self.checkpoint_positions):
             return self.checkpoint_positions[index]
         return None
-        
+
+    def checkpoints_between(self, a, b):
+        """Retorna (índice, x) dos checkpoints com a < x < b"""
+        positions = self.checkpoint_positions
+        first = bisect_right(positions, a)
+        last = bisect_left(positions, b)
+        return [(i, positions[i]) for i in range(first, last)]
+
+    def update(self, x):
+        """Acompanha a posição do carro (a pista fixa não precisa fazer nada)"""
+
     def is_end_of_track(self, x, margin=50):
         """Verifica se o ponto x está próximo do fim da pista"""
-        return x >= self.range[1] - margin
\ No newline at end of file
+        return x >= self.range[1] - margin
+
+def _bisect_roots(func, lo, hi, iterations=48):
+    """Refina ao mesmo tempo todas as raízes de func nos intervalos [lo, hi] (com troca de sinal)"""
+    lo = np.array(lo, dtype=np.float64)
+    hi = np.array(hi, dtype=np.float64)
+    f_lo = _evaluate_array(func, lo)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        f_mid = _evaluate_array(func, mid)
+        # Se f(mid) tem o mesmo sinal de f(lo), a raiz está em [mid, hi]
+        right = np.sign(f_mid) == np.sign(f_lo)
+        lo = np.where(right, mid, lo)
+        f_lo = np.where(right, f_mid, f_lo)
+        hi = np.where(right, hi, mid)
+    return (lo + hi) / 2
+
+def _adaptive_vertices(curvature, x_start, x_end, tolerance, max_step):
+    """
+    x dos vértices de uma polilinha que fica a no máximo `tolerance` da curva.
+    A corda de comprimento h se afasta da curva no máximo h²·max|f″|/8, então
+    cada passo é h = √(8·tolerance / max|f″|), com o máximo tomado sobre o
+    próprio intervalo: trechos suaves ganham passos longos e ondulações
+    rápidas, passos curtos (nunca menores que a malha de |f″|).
+    """
+    step, d2y = curvature
+    count = len(d2y)
+    vertices = [x_start]
+    x = x_start
+    while x < x_end:
+        i = min(count - 1, int((x - x_start) / step))
+        h = max_step
+        # Encolhe o passo até ele respeitar o maior |f″| do próprio intervalo
+        while True:
+            peak = d2y[i:min(count, i + math.ceil(h / step) + 2)].max()
+            shorter = max(step, math.sqrt(8 * tolerance / peak)) if peak > 0 else max_step
+            if shorter >= h:
+                break
+            h = shorter
+        x = min(x_end, x + h)
+        vertices.append(x)
+    return np.array(vertices)
+
+def _evaluate_array(func, xs):
+    """Avalia func sobre um array, usando a versão vetorizada quando a função aceita arrays"""
+    try:
+        values = np.asarray(func(xs), dtype=np.float64)
+        if values.shape == xs.shape:
+            return values
+    except TypeError:
+        pass
+    return np.fromiter(map(func, xs.tolist()), dtype=np.float64, count=len(xs))
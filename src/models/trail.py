@@ -0,0 +1,94 @@
+import numpy as np
+import pygame
+
+class Trail:
+    """Rastro do carro guardado em um buffer circular de tamanho fixo (arrays NumPy)"""
+
+    def __init__(self, capacity=15):
+        self.capacity = capacity
+        self.xs = np.zeros(capacity)
+        self.ys = np.zeros(capacity)
+        self.head = 0  # Próxima posição de escrita
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def extend(self, xs, ys):
+        """Adiciona pontos ao rastro, sobrescrevendo os mais antigos quando cheio"""
+        xs = np.asarray(xs, dtype=np.float64)[-self.capacity:]
+        ys = np.asarray(ys, dtype=np.float64)[-self.capacity:]
+        indices = (self.head + np.arange(len(xs))) % self.capacity
+        self.xs[indices] = xs
+        self.ys[indices] = ys
+        self.head = (self.head + len(xs)) % self.capacity
+        self.count = min(self.capacity, self.count + len(xs))
+
+    def append(self, x, y):
+        """Adiciona um único ponto ao rastro"""
+        self.extend((x,), (y,))
+
+    def clear(self):
+        """Esvazia o rastro"""
+        self.head = 0
+        self.count = 0
+
+    def points(self):
+        """Retorna (xs, ys) do ponto mais antigo para o mais recente"""
+        indices = (self.head - self.count + np.arange(self.count)) % self.capacity
+        return self.xs[indices], self.ys[indices]
+
+class TrailLayer:
+    """
+    Camada transparente reutilizável onde os rastros são desenhados em uma
+    única passada. Só a região usada no quadro é copiada para a tela e limpa.
+    """
+
+    MAX_WIDTH = 5
+    MAX_ALPHA = 200
+
+    def __init__(self):
+        self.surface = None
+
+    def _get_surface(self, size):
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        return self.surface
+
+    def draw(self, screen, trail, base_color, camera_x, camera_y, height):
+        """Desenha o rastro com largura, cor e opacidade que diminuem ao longo dele"""
+        if len(trail) < 2:
+            return
+
+        xs, ys = trail.points()
+        points = np.column_stack((xs - camera_x, height - (ys - camera_y)))
+
+        # Largura, opacidade e cor de cada segmento calculadas de uma vez
+        segments = len(points) - 1
+        progress = np.arange(segments) / segments
+        widths = np.maximum(1, (self.MAX_WIDTH * (1 - progress)).astype(np.int64))
+        alphas = (self.MAX_ALPHA * (1 - progress)).astype(np.int64)
+        base = np.array(base_color[:3], dtype=np.float64)
+        glow = np.minimum(255, base + 50)
+        colors = (glow * (1 - progress)[:, np.newaxis] + base * progress[:, np.newaxis]).astype(np.int64)
+        rgba = np.column_stack((colors, alphas)).tolist()
+
+        layer = self._get_surface(screen.get_size())
+        point_list = points.tolist()
+        for i, (color, width) in enumerate(zip(rgba, widths.tolist())):
+            pygame.draw.line(layer, color, point_list[i], point_list[i + 1], width)
+
+        # Copia apenas a região ocupada pelo rastro e depois a limpa para o próximo quadro
+        margin = self.MAX_WIDTH
+        left, top = np.floor(points.min(axis=0)) - margin
+        right, bottom = np.ceil(points.max(axis=0)) + margin
+        area = pygame.Rect(int(left), int(top), int(right - left), int(bottom - top)).clip(layer.get_rect())
+        screen.blit(layer, area.topleft, area)
+        layer.fill((0, 0, 0, 0), area)
+
+# Camada compartilhada por todos os carros
+_trail_layer = TrailLayer()
+
+def get_trail_layer():
+    """Retorna a camada de rastros compartilhada"""
+    return _trail_layer
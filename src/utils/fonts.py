@@ -0,0 +1,89 @@
+import json
+import os
+import pygame
+from config.settings import FONT_CACHE_PATH
+from src.utils.io_worker import get_io_worker
+
+class FontResolver:
+    """
+    Fontes do sistema com a resolução (nome → arquivo) guardada em disco.
+
+    A primeira busca com SysFont faz o pygame listar todas as fontes do
+    sistema (fc-list no Linux, registro no Windows), o que pode levar
+    centenas de milissegundos. O resolvedor registra o arquivo escolhido
+    pelo SysFont e os estilos simulados (negrito/itálico falsos) e, nas
+    próximas execuções, abre o arquivo direto, sem a listagem.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.entries = self._load()
+        self.fonts = {}
+
+    def _load(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        # Outra versão do pygame pode escolher outros arquivos
+        if data.get("pygame") != pygame.version.ver:
+            return {}
+        return data.get("fonts", {})
+
+    def _save(self):
+        # Escrito na thread de E/S: um diretório pessoal lento (ex.: NFS) não atrasa o menu
+        data = {"pygame": pygame.version.ver, "fonts": dict(self.entries)}
+        get_io_worker().submit(_write_cache, self.cache_path, data)
+
+    def _resolve(self, name, bold, italic):
+        """Retorna [arquivo, negrito falso, itálico falso] como o SysFont escolheria"""
+        key = f"{name.lower()}|{int(bold)}|{int(italic)}"
+        entry = self.entries.get(key)
+        if entry is not None and (entry[0] is None or os.path.exists(entry[0])):
+            return entry
+
+        def capture(path, size, set_bold, set_italic):
+            captured.extend((path, set_bold, set_italic))
+            return None
+
+        captured = []
+        pygame.font.SysFont(name, 1, bold, italic, constructor=capture)
+        self.entries[key] = captured
+        self._save()
+        return captured
+
+    def font(self, name, size, bold=False, italic=False):
+        """Equivalente a pygame.font.SysFont(name, size, bold, italic), memorizado"""
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            path, set_bold, set_italic = self._resolve(name, bold, italic)
+            try:
+                font = pygame.font.Font(path, size)
+            except (OSError, pygame.error):
+                # Arquivo ilegível: usa a fonte padrão do pygame, como o SysFont
+                font = pygame.font.Font(None, size)
+            font.set_bold(set_bold)
+            font.set_italic(set_italic)
+            self.fonts[key] = font
+        return font
+
+def _write_cache(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+        os.replace(temp_path, path)
+    except OSError:
+        pass  # Sem cache em disco (ex.: diretório sem permissão); só fica mais lento
+
+_font_resolver = None
+
+def get_font_resolver():
+    """Retorna o resolvedor de fontes compartilhado (cache em FONT_CACHE_PATH)"""
+    global _font_resolver
+    if _font_resolver is None:
+        _font_resolver = FontResolver(FONT_CACHE_PATH)
+    return _font_resolver
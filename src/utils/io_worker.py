@@ -0,0 +1,105 @@
+import atexit
+import queue
+import sys
+import threading
+
+class IOJob:
+    """Tarefa enviada ao IOWorker; result/error são preenchidos pela thread"""
+
+    __slots__ = ("func", "args", "kwargs", "on_done", "result", "error")
+
+    def __init__(self, func, args, kwargs, on_done):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.result = None
+        self.error = None
+
+class IOWorker:
+    """
+    Thread de fundo para leitura e escrita em disco.
+
+    O loop do jogo envia tarefas com submit() e nunca espera pelo disco: a
+    fila é limitada, e com ela cheia submit() devolve False para quem
+    chamou tentar de novo depois (em vez de travar o quadro). As tarefas
+    rodam em ordem, uma de cada vez. Os resultados voltam por uma fila de
+    concluídas que poll() esvazia na thread principal, uma vez por quadro,
+    chamando os on_done. Ao sair do programa, as tarefas pendentes são
+    terminadas antes de fechar (atexit).
+    """
+
+    def __init__(self, max_pending=64, name="io-worker"):
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.completed = queue.SimpleQueue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                job.result = job.func(*job.args, **job.kwargs)
+            except Exception as error:
+                job.error = error
+            self.completed.put(job)
+
+    def submit(self, func, *args, on_done=None, block=False, **kwargs):
+        """
+        Agenda func(*args, **kwargs) na thread de E/S. on_done(job) é chamado
+        na thread principal, no próximo poll(). Retorna False se a fila
+        estiver cheia (ou o worker fechado); block=True espera por uma vaga,
+        para os poucos casos em que perder a tarefa não é aceitável.
+        """
+        if self.closed:
+            return False
+        try:
+            self.jobs.put(IOJob(func, args, kwargs, on_done), block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def poll(self):
+        """Entrega os resultados prontos (chamado uma vez por quadro); retorna quantos"""
+        count = 0
+        while True:
+            try:
+                job = self.completed.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            if job.on_done is not None:
+                job.on_done(job)
+            elif job.error is not None:
+                print(f"Erro de E/S em segundo plano: {job.error!r}", file=sys.stderr)
+
+    @property
+    def pending(self):
+        """Tarefas ainda na fila (aproximado)"""
+        return self.jobs.qsize()
+
+    def shutdown(self):
+        """Termina as tarefas pendentes e encerra a thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.jobs.put(None)
+        self.thread.join()
+        # Na saída os on_done não rodam mais, mas os erros ainda aparecem no terminal
+        while not self.completed.empty():
+            job = self.completed.get_nowait()
+            if job.error is not None:
+                print(f"Erro de E/S em segundo plano: {job.error!r}", file=sys.stderr)
+
+_io_worker = None
+
+def get_io_worker():
+    """Retorna o worker de E/S compartilhado (criado no primeiro uso)"""
+    global _io_worker
+    if _io_worker is None:
+        _io_worker = IOWorker()
+    return _io_worker
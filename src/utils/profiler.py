@@ -0,0 +1,154 @@
+import csv
+import time
+import numpy as np
+
+class FrameProfiler:
+    """
+    Perfil de tempo por quadro.
+
+    Métodos de objetos do jogo são registrados como etapas com watch(); ao
+    ativar o perfil, cada um é trocado por uma versão cronometrada, e ao
+    desativá-lo o método original volta, então o custo desligado é só um
+    teste por quadro. Os tempos ficam em buffers circulares de tamanho fixo.
+    """
+
+    MAX_STAGES = 32
+
+    def __init__(self, capacity=3600):
+        self.capacity = capacity
+        self.enabled = False
+        self.stages = []  # Nomes das etapas, na ordem de registro
+        self.frame_ms = np.zeros(capacity)
+        self.stage_ms = np.zeros((capacity, self.MAX_STAGES))
+        self.head = 0  # Próxima posição de escrita
+        self.count = 0
+        self.frames_total = 0
+        self._current = [0.0] * self.MAX_STAGES  # Segundos acumulados no quadro atual
+        self._frame_start = None
+        self._targets = []
+
+    def watch(self, obj, attr, name):
+        """Registra o método obj.attr como a etapa `name`"""
+        if name in self.stages:
+            index = self.stages.index(name)
+        elif len(self.stages) < self.MAX_STAGES:
+            index = len(self.stages)
+            self.stages.append(name)
+        else:
+            raise ValueError(f"limite de {self.MAX_STAGES} etapas atingido")
+        self._targets.append((obj, attr, index))
+        if self.enabled:
+            self._install(obj, attr, index)
+
+    def _install(self, obj, attr, index):
+        func = getattr(obj, attr)
+        current = self._current
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current[index] += perf_counter() - start
+
+        # O atributo da instância esconde o método da classe
+        setattr(obj, attr, timed)
+
+    def _uninstall(self, obj, attr):
+        if attr in vars(obj):
+            delattr(obj, attr)
+
+    def toggle(self):
+        """Liga ou desliga o perfil"""
+        self.set_enabled(not self.enabled)
+
+    def set_enabled(self, enabled):
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        for obj, attr, index in self._targets:
+            if enabled:
+                self._install(obj, attr, index)
+            else:
+                self._uninstall(obj, attr)
+        # Não conta o intervalo em que o perfil ficou desligado
+        self._frame_start = None
+
+    def next_frame(self):
+        """Fecha o quadro anterior e começa um novo (chamado no início de cada volta do loop)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            i = self.head
+            self.frame_ms[i] = (now - self._frame_start) * 1000
+            self.stage_ms[i] = self._current
+            self.stage_ms[i] *= 1000
+            self.head = (i + 1) % self.capacity
+            self.count = min(self.capacity, self.count + 1)
+            self.frames_total += 1
+        self._current[:] = [0.0] * self.MAX_STAGES
+        self._frame_start = now
+
+    def recent(self, frames=None):
+        """Retorna (frame_ms, stage_ms) dos últimos quadros, do mais antigo ao mais recente"""
+        count = self.count if frames is None else min(frames, self.count)
+        indices = (self.head - count + np.arange(count)) % self.capacity
+        return self.frame_ms[indices], self.stage_ms[indices, :len(self.stages)]
+
+    def percentiles(self, frames=None, q=(50, 95, 99)):
+        """Percentis do tempo de quadro (ms)"""
+        frame_ms, _ = self.recent(frames)
+        if len(frame_ms) == 0:
+            return tuple(0.0 for _ in q)
+        return tuple(np.percentile(frame_ms, q))
+
+    def stage_means(self, frames=None):
+        """Lista (etapa, ms médio por quadro), da etapa mais cara para a mais barata"""
+        _, stage_ms = self.recent(frames)
+        if len(stage_ms) == 0:
+            return []
+        means = stage_ms.mean(axis=0)
+        order = np.argsort(means)[::-1]
+        return [(self.stages[i], float(means[i])) for i in order]
+
+    def dump_csv(self, path=None, io_worker=None, on_done=None):
+        """
+        Grava os quadros guardados em CSV (uma linha por quadro) e retorna o
+        caminho. Com io_worker, os dados são copiados agora e o arquivo é
+        escrito na thread de E/S (on_done(job) avisa quando terminar); se a
+        fila de E/S recusar a tarefa, nada é gravado e o retorno é None.
+        """
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.csv")
+        # recent() devolve cópias, então o quadro seguinte não altera o que será gravado
+        frame_ms, stage_ms = self.recent()
+        first = self.frames_total - len(frame_ms)
+        args = (path, first, list(self.stages), frame_ms, stage_ms)
+        if io_worker is None:
+            _write_csv(*args)
+        else:
+            if not io_worker.submit(_write_csv, *args, on_done=on_done):
+                return None
+        return path
+
+def _write_csv(path, first, stages, frame_ms, stage_ms):
+    # "outros" inclui a espera do limitador de FPS e o que não foi registrado
+    other_ms = frame_ms - stage_ms.sum(axis=1)
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in stages] + ["other_ms"])
+        for i in range(len(frame_ms)):
+            writer.writerow([first + i, f"{frame_ms[i]:.3f}"]
+                            + [f"{value:.3f}" for value in stage_ms[i]]
+                            + [f"{other_ms[i]:.3f}"])
+
+_profiler = None
+
+def get_profiler():
+    """Retorna o perfil de quadros compartilhado"""
+    global _profiler
+    if _profiler is None:
+        _profiler = FrameProfiler()
+    return _profiler
@@ -0,0 +1,52 @@
+import time
+
+class StartupProfile:
+    """
+    Tempos das fases da inicialização (main.py --startup-profile).
+
+    Cada mark() registra o tempo desde a marca anterior; desligado, mark()
+    só testa uma flag. Este módulo não importa nada pesado, para poder ser
+    usado antes do pygame e do NumPy.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases = []
+        self._last = None
+
+    def enable(self, start=None):
+        """Liga a medição; start é o instante inicial (padrão: agora)"""
+        self.enabled = True
+        self._last = time.perf_counter() if start is None else start
+
+    def mark(self, name):
+        """Fecha a fase `name`, que começou na marca anterior"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def skip(self):
+        """Descarta o tempo desde a última marca (ex.: o menu esperando o jogador)"""
+        if self.enabled:
+            self._last = time.perf_counter()
+
+    def report(self, title):
+        """Imprime as fases registradas desde o último relatório"""
+        if not self.enabled or not self.phases:
+            return
+        total = sum(seconds for _, seconds in self.phases)
+        print(f"{title}: {total * 1000:.1f} ms")
+        for name, seconds in self.phases:
+            print(f"  {name:<28} {seconds * 1000:8.1f} ms  {seconds / total:6.1%}")
+        self.phases = []
+
+_startup_profile = None
+
+def get_startup_profile():
+    """Retorna o perfil de inicialização compartilhado"""
+    global _startup_profile
+    if _startup_profile is None:
+        _startup_profile = StartupProfile()
+    return _startup_profile
@@ -0,0 +1,11 @@
+import pygame
+
+def to_display_format(surface, alpha=True):
+    """
+    Converte a superfície para o formato de pixel da tela, o que torna os blits
+    muito mais rápidos. Sem uma janela aberta (ex.: modo headless) devolve a
+    superfície original.
+    """
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha() if alpha else surface.convert()
+    return surface
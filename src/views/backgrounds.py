@@ -1,27 +1,98 @@
 import pygame
 import random
 from config.settings import WIDTH, HEIGHT
+from src.utils.surfaces import to_display_format
+
+# Cores do gradiente (mais contrastante)
+GRADIENT_TOP = (20, 30, 60)  # Azul escuro no topo
+GRADIENT_BOTTOM = (80, 10, 120)  # Roxo escuro na base
+
+class BackgroundService:
+    """
+    Fundo compartilhado pelo menu, pelo jogo e pelo AnimatedBackground.
+
+    O gradiente é desenhado uma única vez por resolução em uma superfície no
+    formato da tela, e a camada de estrelas fixas só é refeita quando o seu
+    estado muda. As estrelas usam um gerador aleatório próprio, sem interferir
+    no módulo `random` global.
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self._gradients = {}
+        self._static_layers = {}
+
+    def get_gradient(self, size=(WIDTH, HEIGHT)):
+        """Retorna o gradiente pré-renderizado para a resolução informada"""
+        gradient = self._gradients.get(size)
+        if gradient is None:
+            gradient = self._bake_gradient(size)
+            self._gradients[size] = gradient
+        return gradient
+
+    def _bake_gradient(self, size):
+        """Desenha o gradiente vertical em uma nova superfície"""
+        width, height = size
+        surface = pygame.Surface(size)
+        for y in range(0, height, 2):
+            ratio = y / height
+            r = int(GRADIENT_TOP[0] * (1 - ratio) + GRADIENT_BOTTOM[0] * ratio)
+            g = int(GRADIENT_TOP[1] * (1 - ratio) + GRADIENT_BOTTOM[1] * ratio)
+            b = int(GRADIENT_TOP[2] * (1 - ratio) + GRADIENT_BOTTOM[2] * ratio)
+            pygame.draw.line(surface, (r, g, b), (0, y), (width, y), 2)
+        return to_display_format(surface, alpha=False)
+
+    def get_static_layer(self, size, stars_count, state):
+        """Retorna o gradiente com estrelas fixas, refazendo-o só se o estado mudar"""
+        key = (size, stars_count)
+        cached = self._static_layers.get(key)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        layer = self.get_gradient(size).copy()
+        stars_rng = random.Random(state)
+        width, height = size
+        for _ in range(stars_count):
+            x = stars_rng.randint(0, width)
+            y = stars_rng.randint(0, height)
+            star_size = stars_rng.uniform(0.5, 2)
+            brightness = stars_rng.randint(180, 255)
+            pygame.draw.circle(layer, (brightness, brightness, brightness), (x, y), star_size)
+
+        self._static_layers[key] = (state, layer)
+        return layer
+
+    def draw(self, screen, stars_count=0, state=0):
+        """Desenha o gradiente (e as estrelas fixas, se houver) com um único blit"""
+        size = screen.get_size()
+        if stars_count > 0:
+            screen.blit(self.get_static_layer(size, stars_count, state), (0, 0))
+        else:
+            screen.blit(self.get_gradient(size), (0, 0))
+
+    def draw_twinkling_stars(self, screen, count):
+        """Desenha estrelas em posições aleatórias a cada quadro (efeito de cintilação)"""
+        width, height = screen.get_size()
+        for _ in range(count):
+            x = self.rng.randint(0, width)
+            y = self.rng.randint(0, height)
+            size = self.rng.uniform(0.5, 2)
+            brightness = self.rng.randint(180, 255)
+            pygame.draw.circle(screen, (brightness, brightness, brightness), (x, y), size)
+
+_background_service = None
+
+def get_background_service():
+    """Retorna a instância compartilhada do serviço de fundo"""
+    global _background_service
+    if _background_service is None:
+        _background_service = BackgroundService()
+    return _background_service
 
 def draw_menu_background(screen, time=0, stars_count=50):
     """
     Desenha o fundo com gradiente e estrelas, igual ao menu.
     Pode ser usado tanto no menu quanto no jogo para consistência visual.
     """
-    # Gradiente mais contrastante
-    top_color = (20, 30, 60)  # Azul escuro no topo
-    bottom_color = (80, 10, 120)  # Roxo escuro na base
-    for y in range(0, HEIGHT, 2):
-        ratio = y / HEIGHT
-        r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-        g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-        b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
-        color = (r, g, b)
-        pygame.draw.line(screen, color, (0, y), (WIDTH, y), 2)
-    # Efeito de estrelas
-    random.seed(int(time * 1000))  # Para animar as estrelas de forma sutil
-    for _ in range(stars_count):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        size = random.uniform(0.5, 2)
-        brightness = random.randint(180, 255)
-        pygame.draw.circle(screen, (brightness, brightness, brightness), (x, y), size)
+    # As estrelas só mudam quando int(time * 1000) muda
+    get_background_service().draw(screen, stars_count, state=int(time * 1000))
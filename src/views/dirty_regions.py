@@ -0,0 +1,57 @@
+import pygame
+
+class DirtyRegionTracker:
+    """
+    Acompanha os elementos animados de uma cena quase parada.
+
+    Cada quadro informa uma chave do conteúdo estático e, para cada elemento
+    animado, uma assinatura (o que define sua aparência) e os retângulos que
+    ocupa na tela. Só as regiões dos elementos que mudaram precisam ser
+    redesenhadas; se nada mudou, o quadro inteiro pode ser pulado.
+    """
+
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.previous = None
+
+    def reset(self):
+        """Esquece o último quadro (o próximo será redesenhado por inteiro)"""
+        self.previous = None
+
+    def update(self, scene_key, elements):
+        """
+        Compara o quadro com o anterior. Retorna None se a tela inteira precisa
+        ser redesenhada, uma lista vazia se nada mudou ou os retângulos sujos.
+        """
+        previous = self.previous
+        self.previous = (scene_key, elements)
+        if previous is None or previous[0] != scene_key:
+            return None
+
+        old_elements = previous[1]
+        rects = []
+        for name in old_elements.keys() | elements.keys():
+            before = old_elements.get(name)
+            after = elements.get(name)
+            if before == after:
+                continue
+            # A região antiga precisa ser apagada e a nova desenhada
+            for entry in (before, after):
+                if entry is not None:
+                    rects.extend(entry[1])
+        return self._merge(rects)
+
+    def _merge(self, rects):
+        """Recorta os retângulos à tela e junta os que se sobrepõem"""
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect).clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            # Absorve os retângulos já aceitos que colidem com este
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
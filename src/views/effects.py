@@ -0,0 +1,108 @@
+# Efeitos de superfície (reflexo, gradiente de transparência, brilho e sombra)
+# calculados sobre arrays inteiros com NumPy e guardados em cache
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+# Precisão (em graus) usada para agrupar ângulos de rotação no cache
+ANGLE_STEP = 0.5
+
+_cache = OrderedDict()
+_MAX_CACHE_ENTRIES = 256
+
+def _cached(key, source, builder):
+    """Busca um efeito no cache LRU, construindo-o com builder() se necessário"""
+    entry = _cache.get(key)
+    # Confere a própria superfície de origem, já que id() pode ser reutilizado
+    if entry is not None and entry[0] is source:
+        _cache.move_to_end(key)
+        return entry[1]
+
+    result = builder()
+    _cache[key] = (source, result)
+    if len(_cache) > _MAX_CACHE_ENTRIES:
+        _cache.popitem(last=False)
+    return result
+
+def angle_bucket(angle):
+    """Agrupa o ângulo em faixas de ANGLE_STEP graus"""
+    return round(angle / ANGLE_STEP)
+
+def apply_alpha_gradient(surface, start_alpha, end_alpha, vertical=True):
+    """
+    Limita a transparência da superfície (in-place) por uma rampa linear de
+    start_alpha até end_alpha, de cima para baixo (ou da esquerda para a direita).
+    """
+    alpha = pygame.surfarray.pixels_alpha(surface)  # Array (largura, altura)
+    length = alpha.shape[1] if vertical else alpha.shape[0]
+    ramp = np.linspace(start_alpha, end_alpha, length).clip(0, 255).astype(np.uint8)
+    np.minimum(alpha, ramp[np.newaxis, :] if vertical else ramp[:, np.newaxis], out=alpha)
+    del alpha  # Libera o travamento da superfície
+    return surface
+
+def reflection(source, angle=0, max_alpha=70, fade_per_pixel=1):
+    """
+    Retorna o reflexo da superfície rotacionada: invertida verticalmente, com
+    metade da altura e esmaecendo conforme se afasta do objeto.
+    """
+    def build():
+        rotated = pygame.transform.rotate(source, angle_bucket(angle) * ANGLE_STEP)
+        flipped = pygame.transform.flip(rotated, False, True)
+        result = pygame.transform.scale(flipped, (rotated.get_width(), rotated.get_height() // 2))
+        height = result.get_height()
+        return apply_alpha_gradient(result, max_alpha, max_alpha - fade_per_pixel * (height - 1))
+
+    return _cached(("reflection", id(source), angle_bucket(angle), max_alpha, fade_per_pixel), source, build)
+
+def glow_halo(size, glow_size=20, color=(100, 150, 255), max_alpha=60):
+    """
+    Retorna um halo retangular ao redor de um objeto do tamanho `size`, mais
+    opaco perto do objeto e desvanecendo até a borda externa.
+    """
+    def build():
+        width, height = size
+        halo = pygame.Surface((width + glow_size * 2, height + glow_size * 2), pygame.SRCALPHA)
+        halo.fill(color)
+
+        # Distância (Chebyshev) de cada pixel até o retângulo interno
+        xs = np.arange(halo.get_width())
+        ys = np.arange(halo.get_height())
+        dx = np.maximum(glow_size - xs, xs - (glow_size + width - 1)).clip(0)
+        dy = np.maximum(glow_size - ys, ys - (glow_size + height - 1)).clip(0)
+        distance = np.maximum(dx[:, np.newaxis], dy[np.newaxis, :])
+
+        alpha_values = np.minimum(max_alpha, 5 + (glow_size - distance) * 2)
+        alpha_values[(distance == 0) | (distance > glow_size)] = 0
+
+        alpha = pygame.surfarray.pixels_alpha(halo)
+        alpha[:] = alpha_values
+        del alpha
+        return halo
+
+    return _cached(("glow", tuple(size), glow_size, tuple(color), max_alpha), None, build)
+
+def drop_shadow(width, height, max_alpha=100, falloff=5, layers=None):
+    """
+    Retorna uma sombra elíptica com gradiente: elipses concêntricas cada vez
+    menores e mais claras (max_alpha - i * falloff), como uma sombra difusa.
+    """
+    def build():
+        shadow = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        px = np.arange(shadow.get_width())[:, np.newaxis] + 0.5
+        py = np.arange(shadow.get_height())[np.newaxis, :] + 0.5
+        alpha_values = np.zeros(shadow.get_size(), dtype=np.int32)
+
+        for i in range(height if layers is None else layers):
+            rx, ry = (width - i) / 2, (height - i * 2) / 2
+            if rx <= 0 or ry <= 0:
+                break
+            cx, cy = i // 2 + rx, i + ry
+            inside = ((px - cx) / rx) ** 2 + ((py - cy) / ry) ** 2 <= 1
+            alpha_values[inside] = max(0, max_alpha - i * falloff)
+
+        alpha = pygame.surfarray.pixels_alpha(shadow)
+        alpha[:] = alpha_values
+        del alpha
+        return shadow
+
+    return _cached(("shadow", width, height, max_alpha, falloff, layers), None, build)
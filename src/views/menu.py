@@ -1,26 +1,49 @@
 import pygame
 import random
 import math
+import numpy as np
 from config.settings import WIDTH, HEIGHT, BG_DARK, BG_LIGHT, BLUE, WHITE, YELLOW, ORANGE, CYAN
 from src.models.car import Car
+from src.models.particle_system import ParticleSystem, spawn_seeds
+from src.views.backgrounds import get_background_service
+from src.views.text_cache import get_text_cache, SymbolAtlas
+from src.views import effects
+from src.utils.startup import get_startup_profile
+
+MATH_SYMBOLS = ["∫", "∂", "∑", "√", "∞", "d/dx", "f'(x)", "∇", "∆", "∏"]
+
+def snow_sprite(radius, color):
+    """Sprite de um floco de neve: brilho azulado com o floco branco no centro"""
+    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(sprite, (200, 200, 255), (radius, radius), radius)
+    pygame.draw.circle(sprite, (255, 255, 255), (radius, radius), max(1, radius // 2))
+    return sprite
 
 class Menu:
-    def __init__(self, screen, fonts):
-        """Inicializa o menu"""
+    def __init__(self, screen, fonts, seed=None):
+        """Inicializa o menu (seed fixa as animações aleatórias)"""
         self.screen = screen
         self.fonts = fonts
         self.running = True
+        
+        # Gerador próprio, sem depender do módulo `random` global
+        self.rng = random.Random(seed)
+
+        # Cache de textos e atlas de símbolos pré-rotacionados
+        self.text_cache = get_text_cache()
+        self.symbol_atlas = SymbolAtlas(self.text_cache)
 
-        # Fundo animado
+        # Fundo animado (cada sistema de partículas com sua semente)
         from src.views.animated_background import AnimatedBackground
-        self.animated_bg = AnimatedBackground(n_stars=60, n_particles=0)
+        background_seed, snow_seed = spawn_seeds(seed, 2)
+        self.animated_bg = AnimatedBackground(n_stars=60, n_particles=0, seed=background_seed)
         
         # Inicializa o carro para o menu
         self.car = Car(x=WIDTH//2 - 100, speed=0, color=BLUE)
         self.car.y = HEIGHT - 150
         
         # Inicializa partículas de neve
-        self.snow_particles = []
+        self.snow_particles = ParticleSystem(capacity=128, seed=snow_seed, sprite_builder=snow_sprite)
         self.generate_snow_particles(100)
         
         # Inicializa partículas de cálculos
@@ -28,77 +51,72 @@ class Menu:
         self.generate_math_particles(30)
         
         # Tempo para animações
+        self.first_frame_shown = False
         self.time = 0
         self.clock = pygame.time.Clock()
 
     def generate_snow_particles(self, count):
         """Gera partículas de neve para efeito visual"""
-        for _ in range(count):
-            self.snow_particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'size': random.uniform(1, 3),
-                'speed': random.uniform(0.5, 2.0),
-                'color': (
-                    random.randint(220, 255),
-                    random.randint(220, 255),
-                    random.randint(220, 255)
-                )
-            })
+        snow = self.snow_particles
+        # O tamanho guardado é o raio do brilho (o dobro do raio do floco)
+        snow.emit(
+            x=snow.rng.integers(0, WIDTH, count, endpoint=True),
+            y=snow.rng.integers(0, HEIGHT, count, endpoint=True),
+            vy=snow.rng.uniform(0.5, 2.0, count),
+            size=snow.rng.uniform(1, 3, count) * 2
+        )
     
     def generate_math_particles(self, count):
         """Gera partículas de cálculos para efeito visual"""
-        math_symbols = ["∫", "∂", "∑", "√", "∞", "d/dx", "f'(x)", "∇", "∆", "∏"]
+        rng = self.rng
         for _ in range(count):
             self.math_particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'symbol': random.choice(math_symbols),
-                'size': random.randint(14, 24),
-                'speed': random.uniform(0.3, 1.0),
+                'x': rng.randint(0, WIDTH),
+                'y': rng.randint(0, HEIGHT),
+                'symbol': rng.choice(MATH_SYMBOLS),
+                'size': rng.randint(14, 24),
+                'speed': rng.uniform(0.3, 1.0),
                 'color': (
-                    random.randint(150, 255),
-                    random.randint(150, 255),
-                    random.randint(150, 255)
+                    rng.randint(150, 255),
+                    rng.randint(150, 255),
+                    rng.randint(150, 255)
                 ),
-                'rotation': random.uniform(0, 360)
+                'rotation': rng.uniform(0, 360)
             })
     
-    def update_snow_particles(self):
-        """Atualiza as partículas de neve"""
-        for particle in self.snow_particles:
-            # Move as partículas de neve
-            particle['y'] += particle['speed']
-            particle['x'] += math.sin(self.time * 0.5 + particle['y'] * 0.01) * 0.5
-            
-            # Reposiciona partículas que saem da tela
-            if particle['y'] > HEIGHT:
-                particle['y'] = 0
-                particle['x'] = random.randint(0, WIDTH)
-                
-            if particle['x'] < 0:
-                particle['x'] = WIDTH
-            elif particle['x'] > WIDTH:
-                particle['x'] = 0
+    def update_snow_particles(self, step=1.0):
+        """Atualiza as partículas de neve (step é o tempo decorrido em quadros de 60 FPS)"""
+        snow = self.snow_particles
+        snow.update(dt=step)
+        
+        # Balanço horizontal suave
+        n = snow.count
+        snow.x[:n] += np.sin(self.time * 0.5 + snow.y[:n] * 0.01) * 0.5 * step
+        
+        # Reposiciona partículas que saem da tela
+        snow.wrap(WIDTH, HEIGHT)
     
-    def update_math_particles(self):
-        """Atualiza as partículas de cálculos"""
+    def update_math_particles(self, step=1.0):
+        """Atualiza as partículas de cálculos (step é o tempo decorrido em quadros de 60 FPS)"""
+        rng = self.rng
         for particle in self.math_particles:
             # Move as partículas de cálculos
-            particle['y'] += particle['speed']
-            particle['rotation'] += 0.2
+            particle['y'] += particle['speed'] * step
+            particle['rotation'] += 0.2 * step
             
             # Reposiciona partículas que saem da tela
             if particle['y'] > HEIGHT:
                 particle['y'] = -50
-                particle['x'] = random.randint(0, WIDTH)
-                particle['symbol'] = random.choice(["∫", "∂", "∑", "√", "∞", "d/dx", "f'(x)", "∇", "∆", "∏"])
+                particle['x'] = rng.randint(0, WIDTH)
+                particle['symbol'] = rng.choice(MATH_SYMBOLS)
 
     def run(self):
         """Executa o loop do menu"""
         while self.running:
-            self.time += 0.01
-            self.clock.tick(60)
+            # Avança as animações pelo tempo real decorrido (em quadros de 60 FPS),
+            # para que o menu não fique mais lento em máquinas lentas
+            step = min(self.clock.tick(60) / 1000.0, 0.1) * 60
+            self.time += 0.01 * step
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -106,12 +124,14 @@ class Menu:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:  # Pressione Enter para iniciar
                         return "start"
+                    elif event.key == pygame.K_e:  # Pressione E para a pista infinita
+                        return "endless"
                     elif event.key == pygame.K_ESCAPE:  # Pressione Esc para sair
                         return "quit"
 
             # Atualiza partículas
-            self.update_snow_particles()
-            self.update_math_particles()
+            self.update_snow_particles(step)
+            self.update_math_particles(step)
             
             # Renderiza o menu
             self._draw_background()
@@ -119,32 +139,22 @@ class Menu:
             self._draw_car()
             self._draw_particles()
             pygame.display.flip()
+            
+            # Com --startup-profile, o relatório sai depois do primeiro quadro
+            if not self.first_frame_shown:
+                self.first_frame_shown = True
+                startup = get_startup_profile()
+                startup.mark("primeiro quadro do menu")
+                startup.report("Inicialização até o menu")
 
     def _draw_background(self):
         """Desenha o fundo com gradiente mais contrastante"""
-        # Define cores mais contrastantes para o gradiente
-        top_color = (20, 30, 60)  # Azul escuro no topo
-        bottom_color = (80, 10, 120)  # Roxo escuro na base
-        
-        # Cria um gradiente de fundo
-        for y in range(0, HEIGHT, 2):
-            # Calcula a cor do gradiente
-            ratio = y / HEIGHT
-            r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-            g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-            b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
-            color = (r, g, b)
-            
-            # Desenha uma linha horizontal com a cor calculada
-            pygame.draw.line(self.screen, color, (0, y), (WIDTH, y), 2)
+        # Gradiente pré-renderizado compartilhado (um único blit)
+        background = get_background_service()
+        background.draw(self.screen)
             
         # Adiciona um efeito de "estrelas" no fundo para melhorar o visual
-        for _ in range(50):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            size = random.uniform(0.5, 2)
-            brightness = random.randint(180, 255)
-            pygame.draw.circle(self.screen, (brightness, brightness, brightness), (x, y), size)
+        background.draw_twinkling_stars(self.screen, 50)
 
     def _draw_menu(self):
         """Desenha o menu na tela com melhor contraste e elementos visuais"""
@@ -156,18 +166,18 @@ class Menu:
         # Título do jogo com efeito de brilho
         title_font = self.fonts['title']
         # Sombra do título para melhorar legibilidade
-        shadow_surface = title_font.render("Derivative Dash", True, (0, 0, 0))
+        shadow_surface = self.text_cache.render(title_font, "Derivative Dash", (0, 0, 0))
         shadow_rect = shadow_surface.get_rect(center=(WIDTH//2 + 2, 102))
         self.screen.blit(shadow_surface, shadow_rect)
         
         # Título com cor brilhante
-        text_surface = title_font.render("Derivative Dash", True, (255, 255, 100))  # Amarelo brilhante
+        text_surface = self.text_cache.render(title_font, "Derivative Dash", (255, 255, 100))  # Amarelo brilhante
         text_rect = text_surface.get_rect(center=(WIDTH//2, 100))
         self.screen.blit(text_surface, text_rect)
         
         # Subtítulo com cor mais contrastante
         subtitle_font = self.fonts['medium']
-        subtitle_surface = subtitle_font.render("Um jogo educacional sobre cálculo diferencial", True, (180, 255, 255))  # Ciano mais claro
+        subtitle_surface = self.text_cache.render(subtitle_font, "Um jogo educacional sobre cálculo diferencial", (180, 255, 255))  # Ciano mais claro
         subtitle_rect = subtitle_surface.get_rect(center=(WIDTH//2, 150))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
@@ -178,8 +188,8 @@ class Menu:
         
         # Instruções com cores mais vibrantes
         instruction_font = self.fonts['medium']
-        instruction1 = instruction_font.render("Pressione ENTER para iniciar", True, (255, 255, 0))  # Amarelo brilhante
-        instruction2 = instruction_font.render("Pressione ESC para sair", True, (255, 150, 0))  # Laranja brilhante
+        instruction1 = self.text_cache.render(instruction_font, "Pressione ENTER para iniciar (E: pista infinita)", (255, 255, 0))  # Amarelo brilhante
+        instruction2 = self.text_cache.render(instruction_font, "Pressione ESC para sair", (255, 150, 0))  # Laranja brilhante
         
         # Posiciona as instruções
         instr1_rect = instruction1.get_rect(center=(WIDTH//2, HEIGHT - 100))
@@ -221,34 +231,18 @@ class Menu:
         # Faz o carro "flutuar" com um movimento suave
         self.car.y = HEIGHT - 150 + math.sin(self.time) * 5
         
-        # Cria uma nova instância do carro especificamente para o menu
-        # para garantir que ele esteja na orientação correta
-        menu_car = self.car._create_surface(BLUE)
+        # Usa a superfície do carro criada uma única vez (orientação correta)
+        menu_car = self.car.surface
         
         # Adiciona um efeito de rotação suave para dar mais dinamismo
         angle = math.sin(self.time * 0.5) * 5  # Rotação suave entre -5 e 5 graus
-        rotated_car = pygame.transform.rotate(menu_car, angle)
+        rotated_car = self.car.sprites.get(angle)
         
         # Posiciona o carro
         car_rect = rotated_car.get_rect(center=(WIDTH//2, self.car.y))
         
         # Adiciona um efeito de brilho ao redor do carro
-        glow_size = 20
-        glow_surface = pygame.Surface((rotated_car.get_width() + glow_size*2, 
-                                      rotated_car.get_height() + glow_size*2), 
-                                     pygame.SRCALPHA)
-        
-        # Desenha o brilho com gradiente
-        for i in range(glow_size, 0, -1):
-            alpha = 5 + (glow_size - i) * 2
-            if alpha > 60:
-                alpha = 60
-            pygame.draw.rect(glow_surface, 
-                            (100, 150, 255, alpha), 
-                            (glow_size-i, glow_size-i, 
-                             rotated_car.get_width()+i*2, 
-                             rotated_car.get_height()+i*2), 
-                            1)
+        glow_surface = effects.glow_halo(rotated_car.get_size(), glow_size=20)
         
         # Posiciona e desenha o brilho
         glow_rect = glow_surface.get_rect(center=car_rect.center)
@@ -257,39 +251,16 @@ class Menu:
         # Desenha o carro
         self.screen.blit(rotated_car, car_rect)
         
-        # Adiciona um efeito de sombra mais realista
-        shadow_width = rotated_car.get_width() - 10
-        shadow_height = 15
-        shadow = pygame.Surface((shadow_width, shadow_height), pygame.SRCALPHA)
-        
-        # Cria uma sombra com gradiente para parecer mais realista
-        for i in range(shadow_height):
-            alpha = 100 - (i * 5)
-            if alpha < 0:
-                alpha = 0
-            pygame.draw.ellipse(shadow, 
-                               (0, 0, 0, alpha), 
-                               (i//2, i, shadow_width - i, shadow_height - i*2))
+        # Adiciona um efeito de sombra mais realista (elipses com gradiente)
+        shadow = effects.drop_shadow(rotated_car.get_width() - 10, 15, max_alpha=100, falloff=5)
         
         # Posiciona a sombra sob o carro
         shadow_rect = shadow.get_rect(center=(car_rect.centerx, car_rect.bottom + 5))
         self.screen.blit(shadow, shadow_rect)
         
-        # Adiciona um efeito de reflexo sob o carro
-        reflection_height = rotated_car.get_height() // 2
-        reflection = pygame.transform.flip(rotated_car, False, True)
-        reflection = pygame.transform.scale(reflection, 
-                                           (rotated_car.get_width(), reflection_height))
-        
-        # Adiciona transparência ao reflexo
-        for y in range(reflection_height):
-            for x in range(reflection.get_width()):
-                try:
-                    r, g, b, a = reflection.get_at((x, y))
-                    alpha = max(0, 70 - y)  # Diminui a opacidade conforme se afasta do carro
-                    reflection.set_at((x, y), (r, g, b, alpha))
-                except:
-                    pass  # Ignora pixels fora dos limites
+        # Adiciona um efeito de reflexo sob o carro, com opacidade que diminui
+        # conforme se afasta do carro
+        reflection = effects.reflection(menu_car, angle, max_alpha=70)
         
         # Desenha o reflexo
         reflection_rect = reflection.get_rect(midtop=(car_rect.centerx, car_rect.bottom + 2))
@@ -297,25 +268,8 @@ class Menu:
 
     def _draw_particles(self):
         """Desenha as partículas (neve e cálculos) com melhor contraste"""
-        # Desenha partículas de neve com efeito de brilho
-        for particle in self.snow_particles:
-            # Desenha um brilho ao redor da partícula
-            glow_size = particle['size'] * 2
-            pygame.draw.circle(
-                self.screen, 
-                (200, 200, 255, 50),  # Cor do brilho
-                (int(particle['x']), int(particle['y'])), 
-                int(glow_size)
-            )
-            
-            # Desenha a partícula principal com cor mais brilhante
-            bright_color = (255, 255, 255)  # Branco puro para melhor contraste
-            pygame.draw.circle(
-                self.screen, 
-                bright_color, 
-                (int(particle['x']), int(particle['y'])), 
-                int(particle['size'])
-            )
+        # Desenha partículas de neve com efeito de brilho (em lote)
+        self.snow_particles.draw(self.screen)
         
         # Desenha partículas de cálculos com efeito de brilho
         for particle in self.math_particles:
@@ -332,28 +286,14 @@ class Menu:
             color_index = int(particle['x'] + particle['y']) % len(bright_colors)
             bright_color = bright_colors[color_index]
             
-            # Cria o texto com a nova cor
-            font = pygame.font.SysFont("Arial", particle['size'])
-            
-            # Adiciona uma sombra para melhorar a legibilidade
-            shadow_text = font.render(particle['symbol'], True, (0, 0, 0))
-            shadow_rect = shadow_text.get_rect(center=(particle['x'] + 2, particle['y'] + 2))
-            rotated_shadow = pygame.transform.rotate(shadow_text, particle['rotation'])
-            shadow_rect = rotated_shadow.get_rect(center=shadow_rect.center)
-            
-            # Desenha a sombra com transparência
-            shadow_surface = pygame.Surface(rotated_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surface.blit(rotated_shadow, (0, 0))
-            shadow_surface.set_alpha(100)
-            self.screen.blit(shadow_surface, shadow_rect)
-            
-            # Desenha o texto principal
-            text = font.render(particle['symbol'], True, bright_color)
-            text_rect = text.get_rect(center=(particle['x'], particle['y']))
+            # Adiciona uma sombra para melhorar a legibilidade (já rotacionada no atlas)
+            rotated_shadow = self.symbol_atlas.get_shadow(particle['symbol'], particle['size'], particle['rotation'])
+            shadow_rect = rotated_shadow.get_rect(center=(particle['x'] + 2, particle['y'] + 2))
+            self.screen.blit(rotated_shadow, shadow_rect)
             
-            # Rotaciona o texto
-            rotated_text = pygame.transform.rotate(text, particle['rotation'])
-            rotated_rect = rotated_text.get_rect(center=text_rect.center)
+            # Desenha o texto principal já rotacionado
+            rotated_text = self.symbol_atlas.get(particle['symbol'], particle['size'], bright_color, particle['rotation'])
+            rotated_rect = rotated_text.get_rect(center=(particle['x'], particle['y']))
             
             # Adiciona um efeito de pulsação
             pulse = (math.sin(self.time * 2 + particle['x'] * 0.01) + 1) * 0.5  # Valor entre 0 e 1
@@ -0,0 +1,109 @@
+import math
+import numpy as np
+import pygame
+from config.settings import UI_PRIMARY, UI_SECONDARY, UI_WARNING, RED, HIGHLIGHT_BLUE, PURPLE, WHITE
+from src.models.polyline_pyramid import PolylinePyramid
+from src.views.track_tiles import TRACK_COLOR, CENTER_LINE_COLOR
+from src.utils.surfaces import to_display_format
+
+# Cores dos pontos críticos no minimapa
+CRITICAL_COLORS = {"max": RED, "min": HIGHLIGHT_BLUE, "inflection": PURPLE}
+
+class Minimap:
+    """
+    Minimapa da pista inteira com os checkpoints, os pontos críticos e o carro.
+
+    A parte estática (fundo, pista, checkpoints e pontos críticos) é desenhada
+    uma vez por pista em uma superfície, a partir do nível da pirâmide de
+    resoluções da pista (Track.get_pyramid) com no máximo um grupo por pixel;
+    a cada quadro só o marcador do carro é desenhado por cima. Na pista
+    infinita o minimapa mostra os trechos em volta do carro e é redesenhado
+    quando o carro entra em outro trecho.
+    """
+
+    ENDLESS_SEGMENTS = 3  # Trechos mostrados na pista infinita (o anterior, o atual e o próximo)
+
+    def __init__(self, x, y, width=220, height=90, padding=10):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.inner = pygame.Rect(padding, padding, width - 2 * padding, height - 2 * padding)
+        self.surface = None
+        self.key = None
+        self.window = None
+        self.y_range = None
+
+    def draw(self, screen, track, car, car_x=None):
+        """Desenha o minimapa e o marcador do carro (car_x permite uma posição interpolada)"""
+        if car_x is None:
+            car_x = car.x
+        window = self._window(track, car_x)
+        # Reiniciar a partida cria outro Track, mas com a mesma pista e os mesmos checkpoints
+        key = (track.cache_key, track.total_checkpoints, window)
+        if key != self.key:
+            self._bake(track, window)
+            self.key = key
+        screen.blit(self.surface, self.rect.topleft)
+
+        x = min(max(car_x, window[0]), window[1])
+        px, py = self._project(x, track.get_y_at(x))
+        pos = (self.rect.x + px, self.rect.y + py)
+        pygame.draw.circle(screen, WHITE, pos, 5)
+        pygame.draw.circle(screen, car.color, pos, 3)
+
+    def _window(self, track, car_x):
+        """Intervalo de x mostrado: a pista inteira, ou os trechos em volta do carro na pista infinita"""
+        if not track.endless:
+            return tuple(track.range)
+        length = track.SEGMENT_LENGTH
+        start = max(0, math.floor(car_x / length) - 1) * length
+        return (start, start + self.ENDLESS_SEGMENTS * length)
+
+    def _project(self, xs, ys):
+        """Converte posições da pista para pixels dentro da superfície do minimapa"""
+        x0, x1 = self.window
+        low, high = self.y_range
+        inner = self.inner
+        px = inner.left + (np.asarray(xs) - x0) * (inner.width / (x1 - x0))
+        py = inner.bottom - (np.asarray(ys) - low) * (inner.height / max(high - low, 1e-9))
+        return px, py
+
+    def _bake(self, track, window):
+        """Desenha a parte estática do minimapa na superfície"""
+        if track.endless:
+            _, xs, ys = track.get_samples(*window)
+            pyramid = PolylinePyramid(xs, ys)
+        else:
+            pyramid = track.get_pyramid()
+        self.window = window
+        self.y_range = pyramid.y_range
+
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        surface.fill((UI_PRIMARY[0], UI_PRIMARY[1], UI_PRIMARY[2], 200))
+        pygame.draw.rect(surface, UI_SECONDARY, surface.get_rect(), 2, border_radius=10)
+
+        # Faixa entre o menor e o maior y de cada grupo (uma linha onde a pista é suave)
+        x_start, x_end, y_min, y_max = pyramid.get_level(self.inner.width)
+        centers = (x_start + x_end) / 2
+        top = np.column_stack(self._project(centers, y_max))
+        bottom = np.column_stack(self._project(centers, y_min))
+        if len(centers) >= 2:
+            pygame.draw.polygon(surface, TRACK_COLOR, np.concatenate((top, bottom[::-1])).tolist())
+            pygame.draw.lines(surface, CENTER_LINE_COLOR, False, top.tolist(), 2)
+            pygame.draw.lines(surface, CENTER_LINE_COLOR, False, bottom.tolist(), 2)
+
+        # Pontos críticos e checkpoints (no máximo um de cada tipo por pixel)
+        for kind, color in CRITICAL_COLORS.items():
+            points = [(point.x, point.y) for point in track.critical_points_between(*window) if point.kind == kind]
+            self._draw_markers(surface, points, color, 2)
+        checkpoints = [x for _, x in track.checkpoints_between(*window)]
+        self._draw_markers(surface, list(zip(checkpoints, track.get_y_array(checkpoints))), UI_WARNING, 3)
+
+        self.surface = to_display_format(surface)
+
+    def _draw_markers(self, surface, points, color, radius):
+        """Desenha um círculo por pixel ocupado pelos pontos (x, y) da pista"""
+        if not points:
+            return
+        xs, ys = np.array(points, dtype=np.float64).T
+        px, py = self._project(xs, ys)
+        for pos in set(zip(np.rint(px).astype(int).tolist(), np.rint(py).astype(int).tolist())):
+            pygame.draw.circle(surface, color, pos, radius)
@@ -0,0 +1,64 @@
+import numpy as np
+import pygame
+from config.settings import FPS, WHITE, UI_PRIMARY, UI_SECONDARY, UI_WARNING, HIGHLIGHT_GREEN
+
+class ProfilerOverlay:
+    """
+    Painel compacto do perfil de quadros: gráfico dos últimos tempos de
+    quadro, percentis e as etapas mais caras. Os textos são refeitos só a
+    cada REFRESH_FRAMES quadros para não pesar no próprio quadro.
+    """
+
+    PANEL_SIZE = (260, 160)
+    SPARK_FRAMES = 120
+    SPARK_HEIGHT = 40
+    SCALE_MS = 50.0  # Tempo de quadro no topo do gráfico
+    REFRESH_FRAMES = 15
+    TOP_STAGES = 4
+
+    def __init__(self, profiler, font):
+        self.profiler = profiler
+        self.font = font
+        self.panel = pygame.Surface(self.PANEL_SIZE, pygame.SRCALPHA)
+        self.panel.fill((UI_PRIMARY[0], UI_PRIMARY[1], UI_PRIMARY[2], 210))
+        pygame.draw.rect(self.panel, UI_SECONDARY, self.panel.get_rect(), 1, border_radius=6)
+        self.lines = []
+        self.refreshed_at = None
+
+    def _refresh_text(self):
+        profiler = self.profiler
+        p50, p95, p99 = profiler.percentiles(self.SPARK_FRAMES)
+        texts = [f"quadro p50 {p50:.1f}  p95 {p95:.1f}  p99 {p99:.1f} ms"]
+        for name, mean in profiler.stage_means(self.SPARK_FRAMES)[:self.TOP_STAGES]:
+            texts.append(f"{name}: {mean:.2f} ms")
+        self.lines = [self.font.render(text, True, WHITE) for text in texts]
+        self.refreshed_at = profiler.frames_total
+
+    def draw(self, screen):
+        """Desenha o painel no canto inferior direito"""
+        profiler = self.profiler
+        if profiler.count == 0:
+            return
+        if self.refreshed_at is None or profiler.frames_total - self.refreshed_at >= self.REFRESH_FRAMES:
+            self._refresh_text()
+
+        width, height = self.PANEL_SIZE
+        x = screen.get_width() - width - 10
+        y = screen.get_height() - height - 10
+        screen.blit(self.panel, (x, y))
+
+        # Gráfico dos tempos de quadro com a linha do orçamento de 1/FPS
+        graph = pygame.Rect(x + 8, y + 8, width - 16, self.SPARK_HEIGHT)
+        budget_y = graph.bottom - graph.height * min(1.0, 1000.0 / FPS / self.SCALE_MS)
+        pygame.draw.line(screen, UI_WARNING, (graph.left, budget_y), (graph.right, budget_y), 1)
+
+        frame_ms, _ = profiler.recent(self.SPARK_FRAMES)
+        if len(frame_ms) >= 2:
+            xs = graph.left + np.arange(len(frame_ms)) * (graph.width / (self.SPARK_FRAMES - 1))
+            ys = graph.bottom - np.minimum(frame_ms / self.SCALE_MS, 1.0) * graph.height
+            pygame.draw.lines(screen, HIGHLIGHT_GREEN, False, np.column_stack((xs, ys)).tolist(), 1)
+
+        text_y = graph.bottom + 6
+        for line in self.lines:
+            screen.blit(line, (x + 8, text_y))
+            text_y += line.get_height()
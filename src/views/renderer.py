@@ -1,55 +1,62 @@
 import pygame
 import math
 import random
+import numpy as np
 from config.settings import (
     WIDTH, HEIGHT, BLACK, GRAY, GREEN, ORANGE, RED, BLUE, WHITE,
     UI_PRIMARY, UI_SECONDARY, UI_ACCENT, UI_TEXT, UI_WARNING, UI_DANGER, UI_SUCCESS,
     BG_LIGHT, BG_DARK, HIGHLIGHT_BLUE, HIGHLIGHT_GREEN, HIGHLIGHT_RED, HIGHLIGHT_YELLOW,
     LIGHT_GRAY, DARK_GRAY, CYAN, PURPLE
 )
+from src.models.car_sprites import get_car_atlas
+from src.models.ghost_fleet import GHOST_COLORS, GHOST_ALPHA
+from src.models.particle_system import ParticleSystem
+from src.views.track_tiles import TrackTileCache
+from src.views.minimap import Minimap
+from src.views.text_cache import get_text_cache
+from src.views.dirty_regions import DirtyRegionTracker
+from src.views import effects
+
+# Intervalo (ms) entre sorteios das partículas decorativas do fim de jogo
+SPARKLE_INTERVAL = 100
 
 class Renderer:
     def __init__(self, screen, fonts):
         self.screen = screen
         self.fonts = fonts
-        self.background_particles = []
+        self.background_particles = ParticleSystem(capacity=64)
         self.generate_background_particles(50)
         self.time = 0
+        self.track_tiles = TrackTileCache()
+        self.text_cache = get_text_cache()
+        self.dirty_regions = DirtyRegionTracker(screen.get_rect())
+        self.ghost_atlases = [get_car_atlas(color, GHOST_ALPHA) for color in GHOST_COLORS]
+        self.minimap = Minimap(WIDTH - 250, 60)  # Abaixo do indicador de velocidade
         
     def generate_background_particles(self, count):
         """Gera partículas de fundo para efeito visual"""
-        for _ in range(count):
-            self.background_particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'size': random.uniform(1, 3),
-                'speed': random.uniform(0.2, 1.0),
-                'color': (
-                    random.randint(200, 255),
-                    random.randint(200, 255),
-                    random.randint(200, 255),
-                    random.randint(50, 150)
-                )
-            })
+        particles = self.background_particles
+        rng = particles.rng
+        particles.emit(
+            x=rng.integers(0, WIDTH, count, endpoint=True),
+            y=rng.integers(0, HEIGHT, count, endpoint=True),
+            vy=rng.uniform(0.2, 1.0, count),
+            size=rng.uniform(1, 3, count),
+            color=rng.integers(200, 255, (count, 3), endpoint=True)
+        )
             
     def update_background_particles(self):
         """Atualiza as partículas de fundo"""
         self.time += 0.01
         
-        for particle in self.background_particles:
-            # Move as partículas lentamente
-            particle['y'] += particle['speed']
-            particle['x'] += math.sin(self.time + particle['y'] * 0.01) * 0.5
-            
-            # Reposiciona partículas que saem da tela
-            if particle['y'] > HEIGHT:
-                particle['y'] = 0
-                particle['x'] = random.randint(0, WIDTH)
-                
-            if particle['x'] < 0:
-                particle['x'] = WIDTH
-            elif particle['x'] > WIDTH:
-                particle['x'] = 0
+        # Move as partículas lentamente
+        particles = self.background_particles
+        particles.update()
+        n = particles.count
+        particles.x[:n] += np.sin(self.time + particles.y[:n] * 0.01) * 0.5
+        
+        # Reposiciona partículas que saem da tela
+        particles.wrap(WIDTH, HEIGHT)
         
     def clear_screen(self):
         """Limpa a tela usando o gradiente e estrelas do menu para consistência visual"""
@@ -57,138 +64,122 @@ class Renderer:
         draw_menu_background(self.screen, self.time, stars_count=50)
         # (Opcional) Se quiser manter partículas de fundo do jogo, descomente abaixo:
         # self.update_background_particles()
-        # for particle in self.background_particles:
-        #     pygame.draw.circle(
-        #         self.screen, 
-        #         particle['color'], 
-        #         (int(particle['x']), int(particle['y'])), 
-        #         int(particle['size'])
-        #     )
+        # self.background_particles.draw(self.screen)
         
     def draw_track(self, track, camera_x, camera_y):
-        """Desenha a pista com efeitos visuais melhorados"""
-        # Desenha a pista principal com mais detalhes
-        points = []
-        step = max(1, track.track_length // 800)  # Aumenta a resolução da pista
-        
-        for x in range(track.range[0], track.range[1], step):
-            y = track.get_y_at(x)
-            screen_y = HEIGHT - (y - camera_y)
-            points.append((x - camera_x, screen_y))
-            
-        if len(points) > 1:
-            # Desenha a pista com efeito de sombra mais sutil
-            shadow_points = [(p[0] + 3, p[1] + 3) for p in points]
-            pygame.draw.lines(self.screen, (50, 50, 50, 100), False, shadow_points, 16)
-            
-            # Desenha o fundo da pista com gradiente
-            track_color = (100, 100, 120)  # Cor base da pista
-            pygame.draw.lines(self.screen, track_color, False, points, 14)
-            
-            # Desenha a linha central da pista
-            pygame.draw.lines(self.screen, (180, 180, 180), False, points, 2)
-            
-            # Desenha as bordas da pista com destaque
-            edge_color = (220, 220, 220)
-            
-            # Borda superior (paralela à pista)
-            upper_edge_points = []
-            for x, y in points:
-                upper_edge_points.append((x, y - 7))
-            pygame.draw.lines(self.screen, edge_color, False, upper_edge_points, 2)
-            
-            # Borda inferior (paralela à pista)
-            lower_edge_points = []
-            for x, y in points:
-                lower_edge_points.append((x, y + 7))
-            pygame.draw.lines(self.screen, edge_color, False, lower_edge_points, 2)
-            
-            # Desenha marcações na pista (mais frequentes e com cores alternadas)
-            for i in range(0, len(points), 10):
-                if i + 1 < len(points):
-                    mid_x = (points[i][0] + points[i+1][0]) // 2
-                    mid_y = (points[i][1] + points[i+1][1]) // 2
-                    
-                    # Alterna cores das marcações (usando cores já importadas)
-                    mark_color = WHITE if i % 20 == 0 else (255, 255, 0)  # Amarelo
-                    mark_size = 3 if i % 20 == 0 else 2
-                    
-                    pygame.draw.circle(self.screen, mark_color, (mid_x, mid_y), mark_size)
+        """Desenha a pista a partir dos blocos pré-renderizados em cache"""
+        self.track_tiles.draw(self.screen, track, camera_x, camera_y, WIDTH, HEIGHT)
             
     def draw_checkpoints(self, track, checkpoints_passed, camera_x, camera_y):
         """Desenha os checkpoints com efeitos visuais melhorados"""
-        for i, checkpoint_x in enumerate(track.checkpoint_positions):
+        # Só os checkpoints perto da câmera (a pista infinita tem checkpoints sem fim)
+        for i, checkpoint_x in track.checkpoints_between(camera_x - 50, camera_x + WIDTH + 50):
             y = track.get_y_at(checkpoint_x)
             pos = (checkpoint_x - camera_x, HEIGHT - (y - camera_y))
             
-            if -50 < pos[0] < WIDTH + 50:
-                # Define cores e estilos com base no estado do checkpoint
-                if i < checkpoints_passed:  # Checkpoint já passado
-                    color = UI_SUCCESS
-                    glow_color = HIGHLIGHT_GREEN
-                    fill = 0
-                    size = 12
-                    pulse = 0
-                elif i == checkpoints_passed:  # Próximo checkpoint
-                    color = UI_WARNING
-                    glow_color = HIGHLIGHT_YELLOW
-                    fill = 0
-                    size = 15
-                    # Efeito de pulsação
-                    pulse = math.sin(pygame.time.get_ticks() * 0.005) * 3
-                else:  # Checkpoints futuros
-                    color = UI_DANGER
-                    glow_color = HIGHLIGHT_RED
-                    fill = 2
-                    size = 12
-                    pulse = 0
-                
-                # Desenha o efeito de brilho
-                pygame.draw.circle(self.screen, glow_color, pos, size + pulse, 0)
-                
-                # Desenha o checkpoint
-                pygame.draw.circle(self.screen, color, pos, size, fill)
-                
-                # Adiciona número do checkpoint
-                checkpoint_num = self.fonts["small"].render(str(i+1), True, WHITE)
-                self.screen.blit(
-                    checkpoint_num, 
-                    (pos[0] - checkpoint_num.get_width()//2, 
-                     pos[1] - checkpoint_num.get_height()//2)
-                )
-                
-    def draw_car(self, car, track, camera_x, camera_y):
-        """Desenha o carro e seus efeitos visuais"""
+            # Define cores e estilos com base no estado do checkpoint
+            if i < checkpoints_passed:  # Checkpoint já passado
+                color = UI_SUCCESS
+                glow_color = HIGHLIGHT_GREEN
+                fill = 0
+                size = 12
+                pulse = 0
+            elif i == checkpoints_passed:  # Próximo checkpoint
+                color = UI_WARNING
+                glow_color = HIGHLIGHT_YELLOW
+                fill = 0
+                size = 15
+                # Efeito de pulsação
+                pulse = self._checkpoint_pulse(pygame.time.get_ticks())
+            else:  # Checkpoints futuros
+                color = UI_DANGER
+                glow_color = HIGHLIGHT_RED
+                fill = 2
+                size = 12
+                pulse = 0
+            
+            # Desenha o efeito de brilho
+            pygame.draw.circle(self.screen, glow_color, pos, size + pulse, 0)
+            
+            # Desenha o checkpoint
+            pygame.draw.circle(self.screen, color, pos, size, fill)
+            
+            # Adiciona número do checkpoint
+            checkpoint_num = self.text_cache.render(self.fonts["small"], str(i+1), WHITE)
+            self.screen.blit(
+                checkpoint_num, 
+                (pos[0] - checkpoint_num.get_width()//2, 
+                 pos[1] - checkpoint_num.get_height()//2)
+            )
+            
+    def draw_car(self, car, track, camera_x, camera_y, x=None):
+        """Desenha o carro e seus efeitos visuais (x permite uma posição interpolada)"""
         # Desenha os efeitos do carro (rastro e partículas)
         car.draw_effects(self.screen, camera_x, camera_y, HEIGHT)
         
         # Desenha o carro
-        car_y = track.get_y_at(car.x)
-        slope = track.get_slope_at(car.x)
+        if x is None:
+            x = car.x
+        car_y = track.get_y_at(x)
+        slope = track.get_slope_at(x)
         rotated_car = car.get_rotated_surface(slope)
         
         # Adiciona uma sombra sutil sob o carro (mais transparente e menor)
         shadow_width = rotated_car.get_width() - 10
-        shadow_height = 5
-        shadow = pygame.Surface((shadow_width, shadow_height), pygame.SRCALPHA)
-        pygame.draw.ellipse(shadow, (0, 0, 0, 60), (0, 0, shadow_width, shadow_height))
+        shadow = effects.drop_shadow(shadow_width, 5, max_alpha=60, layers=1)
         
         # Posiciona a sombra sob o carro
-        shadow_x = car.x - camera_x - shadow_width//2
+        shadow_x = x - camera_x - shadow_width//2
         shadow_y = HEIGHT - (car_y - camera_y) + 5
         self.screen.blit(shadow, (shadow_x, shadow_y))
         
         # Desenha o carro
         self.screen.blit(
             rotated_car, 
-            (car.x - camera_x - rotated_car.get_width()//2,
+            (x - camera_x - rotated_car.get_width()//2,
              HEIGHT - (car_y - camera_y) - rotated_car.get_height()//2)
         )
         
+    def draw_ghosts(self, ghosts, track, camera_x, camera_y, alpha=1.0):
+        """
+        Desenha os carros fantasmas visíveis: posições e ângulos são calculados
+        para todos de uma vez e os sprites (compartilhados) vão em um único blits
+        """
+        indices, xs = ghosts.visible(camera_x, WIDTH, 60, alpha)
+        if not len(indices):
+            return
+        ys = HEIGHT - (track.get_y_array(xs) - camera_y)
+        sprite_indices = self.ghost_atlases[0].slope_indices(track.get_slope_array(xs))
+        xs = xs - camera_x
+        
+        blits = []
+        atlases = self.ghost_atlases
+        for color, index, x, y in zip(ghosts.color[indices].tolist(), sprite_indices.tolist(),
+                                      xs.tolist(), ys.tolist()):
+            atlas = atlases[color]
+            sprite = atlas.get_index(index)
+            half_width, half_height = atlas.offsets[index]
+            blits.append((sprite, (x - half_width, y - half_height)))
+        self.screen.blits(blits, doreturn=False)
+        
     def draw_info(self, track, game_state):
         """Desenha painel de informações do jogo"""
-        # Cria um painel para as informações
-        panel_width = 280
+        # Informações do jogo
+        if track.endless:
+            checkpoints = f"Checkpoints: {game_state.checkpoints_passed}"
+        else:
+            checkpoints = f"Checkpoints: {game_state.checkpoints_passed}/{track.total_checkpoints}"
+        info_text = [
+            f"Função: {track.name}",
+            f"Equação: {track.formula}",
+            f"Velocidade: {game_state.car.speed:.1f} km/h",
+            checkpoints,
+            f"Pontuação: {game_state.score}",
+        ]
+        text_surfaces = [self.text_cache.render(self.fonts["small"], text, UI_TEXT) for text in info_text]
+        
+        # Cria um painel para as informações (alarga para equações longas)
+        panel_width = max(280, max(surface.get_width() for surface in text_surfaces) + 20)
         panel_height = 150
         panel_x = 20
         panel_y = 20
@@ -205,20 +196,10 @@ class Renderer:
         panel.blit(header, (0, 0))
         
         # Título do painel
-        title = self.fonts["medium"].render("INFORMAÇÕES", True, UI_TEXT)
+        title = self.text_cache.render(self.fonts["medium"], "INFORMAÇÕES", UI_TEXT)
         panel.blit(title, (panel_width//2 - title.get_width()//2, 5))
         
-        # Informações do jogo
-        info_text = [
-            f"Função: {track.name}",
-            f"Equação: {track.formula}",
-            f"Velocidade: {game_state.car.speed:.1f} km/h",
-            f"Checkpoints: {game_state.checkpoints_passed}/{track.total_checkpoints}",
-            f"Pontuação: {game_state.score}",
-        ]
-        
-        for i, text in enumerate(info_text):
-            text_surface = self.fonts["small"].render(text, True, UI_TEXT)
+        for i, text_surface in enumerate(text_surfaces):
             panel.blit(text_surface, (10, 35 + i * 22))
         
         # Desenha o painel na tela
@@ -227,6 +208,10 @@ class Renderer:
         # Desenha um indicador de velocidade
         self._draw_speed_indicator(game_state.car.speed, game_state.car.max_speed, WIDTH - 150, 20)
             
+    def draw_minimap(self, track, car, car_x=None):
+        """Desenha o minimapa da pista inteira com a posição do carro"""
+        self.minimap.draw(self.screen, track, car, car_x)
+            
     def _draw_speed_indicator(self, speed, max_speed, x, y):
         """Desenha um indicador visual de velocidade"""
         width = 120
@@ -251,7 +236,7 @@ class Renderer:
         pygame.draw.rect(self.screen, bar_color, (x + 2, y + 2, bar_width - 4, height - 4), border_radius=5)
         
         # Texto da velocidade
-        speed_text = self.fonts["small"].render(f"{speed:.1f} km/h", True, WHITE)
+        speed_text = self.text_cache.render(self.fonts["small"], f"{speed:.1f} km/h", WHITE)
         self.screen.blit(speed_text, (x + width//2 - speed_text.get_width()//2, y + height//2 - speed_text.get_height()//2))
             
     def draw_message(self, message, game_over, victory, message_time):
@@ -270,7 +255,7 @@ class Renderer:
                 border_color = HIGHLIGHT_RED
                 
             # Cria uma caixa para a mensagem
-            msg_surface = self.fonts["large"].render(message, True, WHITE)
+            msg_surface = self.text_cache.render(self.fonts["large"], message, WHITE)
             padding = 20
             box_width = msg_surface.get_width() + padding * 2
             box_height = msg_surface.get_height() + padding * 2
@@ -289,7 +274,7 @@ class Renderer:
             
             # Efeito de pulsação se não for game over
             if not game_over:
-                scale = 1.0 + math.sin(current_time * 0.01) * 0.05
+                scale = self._message_scale(current_time)
                 box = pygame.transform.scale(box, (int(box_width * scale), int(box_height * scale)))
             
             # Desenha a caixa na tela
@@ -309,7 +294,7 @@ class Renderer:
         pygame.draw.rect(panel, UI_SECONDARY, (0, 0, panel_width, panel_height), 2, border_radius=10)
         
         # Título do painel
-        title = self.fonts["medium"].render(f"Derivada em x ≈ {int(next_checkpoint)}", True, UI_TEXT)
+        title = self.text_cache.render(self.fonts["medium"], f"Derivada em x ≈ {int(next_checkpoint)}", UI_TEXT)
         panel.blit(title, (panel_width//2 - title.get_width()//2, 10))
         
         # Caixa de entrada
@@ -318,11 +303,11 @@ class Renderer:
         pygame.draw.rect(panel, UI_ACCENT, input_bg, 2, border_radius=5)
         
         # Texto de entrada
-        input_text_surface = self.fonts["medium"].render(input_text, True, BLACK)
+        input_text_surface = self.text_cache.render(self.fonts["medium"], input_text, BLACK)
         panel.blit(input_text_surface, (panel_width//2 - input_text_surface.get_width()//2, 45))
         
         # Cursor piscante
-        if pygame.time.get_ticks() % 1000 < 500:
+        if self._cursor_visible(pygame.time.get_ticks()):
             cursor_x = panel_width//2 + input_text_surface.get_width()//2 + 2
             pygame.draw.line(panel, BLACK, (cursor_x, 45), (cursor_x, 45 + input_text_surface.get_height()), 2)
         
@@ -359,13 +344,19 @@ class Renderer:
         pygame.draw.rect(panel, border_color, (0, 0, panel_width, panel_height), 4, border_radius=15)
         
         # Título
-        title = self.fonts["title"].render(title_text, True, title_color)
+        title = self.text_cache.render(self.fonts["title"], title_text, title_color)
         panel.blit(title, (panel_width//2 - title.get_width()//2, 40))
         
         # Pontuação
-        score_text = self.fonts["large"].render(f"Pontuação final: {game_state.score}", True, WHITE)
+        score_text = self.text_cache.render(self.fonts["large"], f"Pontuação final: {game_state.score}", WHITE)
         panel.blit(score_text, (panel_width//2 - score_text.get_width()//2, 120))
         
+        # Recorde da pista (do placar local ou do laboratório)
+        best = self._track_record(game_state)
+        if best is not None:
+            best_text = self.text_cache.render(self.fonts["small"], f"Recorde da pista: {best}", WHITE)
+            panel.blit(best_text, (panel_width//2 - best_text.get_width()//2, 162))
+        
         # Botão de reinício
         button_width = 300
         button_height = 50
@@ -375,23 +366,88 @@ class Renderer:
         pygame.draw.rect(panel, UI_SECONDARY, (button_x, button_y, button_width, button_height), border_radius=10)
         pygame.draw.rect(panel, WHITE, (button_x, button_y, button_width, button_height), 2, border_radius=10)
         
-        restart_text = self.fonts["medium"].render("Pressione R para jogar novamente", True, WHITE)
+        restart_text = self.text_cache.render(self.fonts["medium"], "Pressione R para jogar novamente", WHITE)
         panel.blit(restart_text, (panel_width//2 - restart_text.get_width()//2, button_y + button_height//2 - restart_text.get_height()//2))
         
         # Desenha o painel na tela
         self.screen.blit(panel, (panel_x, panel_y))
         
         # Adiciona partículas decorativas
-        for _ in range(2):
-            particle = {
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'size': random.uniform(2, 5),
-                'color': border_color
-            }
-            pygame.draw.circle(
-                self.screen, 
-                particle['color'], 
-                (int(particle['x']), int(particle['y'])), 
-                int(particle['size'])
-            )
\ No newline at end of file
+        for x, y, size in self._sparkles(pygame.time.get_ticks()):
+            pygame.draw.circle(self.screen, border_color, (x, y), size)
+            
+    def _track_record(self, game_state):
+        """Melhor pontuação conhecida da pista atual, ou None sem placar"""
+        leaderboard = game_state.leaderboard
+        if leaderboard is None:
+            return None
+        from src.models.leaderboard import track_key
+        return leaderboard.best.get(track_key(game_state.track))
+        
+    def _checkpoint_pulse(self, current_time):
+        """Raio extra do brilho pulsante do próximo checkpoint"""
+        return math.sin(current_time * 0.005) * 3
+        
+    def _message_scale(self, current_time):
+        """Escala da caixa de mensagem pulsante"""
+        return 1.0 + math.sin(current_time * 0.01) * 0.05
+        
+    def _cursor_visible(self, current_time):
+        """O cursor da caixa de entrada pisca a cada meio segundo"""
+        return current_time % 1000 < 500
+        
+    def _sparkles(self, current_time):
+        """Partículas decorativas do fim de jogo, sorteadas de novo a cada SPARKLE_INTERVAL ms"""
+        rng = random.Random(current_time // SPARKLE_INTERVAL)
+        return [(rng.randint(0, WIDTH), rng.randint(0, HEIGHT), int(rng.uniform(2, 5))) for _ in range(2)]
+        
+    def get_dynamic_regions(self, game_state):
+        """
+        Descreve a cena parada (checkpoint ou fim de jogo) para o modo de regiões
+        sujas: retorna uma chave do conteúdo estático e, para cada elemento
+        animado, sua assinatura e os retângulos que ocupa na tela.
+        """
+        current_time = pygame.time.get_ticks()
+        track = game_state.track
+        car = game_state.car
+        scene_key = (
+            track.cache_key, car.x, car.speed, car.crashed, game_state.checkpoints_passed,
+            game_state.score, game_state.game_over, game_state.victory,
+            game_state.message, game_state.message_time, game_state.input_mode,
+            game_state.camera_x, game_state.camera_y, self._track_record(game_state),
+        )
+        elements = {}
+        
+        # Brilho pulsante do próximo checkpoint
+        checkpoint_x = track.get_checkpoint_position(game_state.checkpoints_passed)
+        if checkpoint_x is not None:
+            x = checkpoint_x - game_state.camera_x
+            y = HEIGHT - (track.get_y_at(checkpoint_x) - game_state.camera_y)
+            if -50 < x < WIDTH + 50:
+                radius = int(15 + self._checkpoint_pulse(current_time))
+                area = pygame.Rect(int(x) - radius - 2, int(y) - radius - 2, radius * 2 + 5, radius * 2 + 5)
+                elements["checkpoint"] = (radius, [area])
+        
+        # Caixa de mensagem (pulsa e some depois de 5 segundos)
+        if current_time - game_state.message_time < 5000 or game_state.game_over:
+            msg_surface = self.text_cache.render(self.fonts["large"], game_state.message, WHITE)
+            box_width = msg_surface.get_width() + 40
+            box_height = msg_surface.get_height() + 40
+            if not game_state.game_over:
+                scale = self._message_scale(current_time)
+                box_width, box_height = int(box_width * scale), int(box_height * scale)
+            area = pygame.Rect(WIDTH//2 - box_width//2, 50, box_width, box_height)
+            elements["message"] = ((box_width, box_height), [area])
+        
+        # Caixa de entrada com o cursor piscante
+        if game_state.input_mode and not game_state.game_over:
+            signature = (game_state.input_text, game_state.next_checkpoint, self._cursor_visible(current_time))
+            elements["input"] = (signature, [pygame.Rect(WIDTH//2 - 200, HEIGHT - 100, 400, 80)])
+        
+        # Partículas decorativas do fim de jogo
+        if game_state.game_over:
+            areas = [pygame.Rect(x - size - 1, y - size - 1, size * 2 + 3, size * 2 + 3)
+                     for x, y, size in self._sparkles(current_time)]
+            elements["sparkles"] = (current_time // SPARKLE_INTERVAL, areas)
+        
+        return scene_key, elements
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+import pygame
+from src.utils.fonts import get_font_resolver
+
+class TextCache:
+    """
+    Cache LRU limitado de textos renderizados.
+
+    A chave é (fonte, texto, cor, faixa de rotação), então textos que não mudam
+    entre quadros são renderizados uma única vez. As fontes do sistema também
+    são memorizadas (FontResolver), evitando buscas repetidas com SysFont.
+    """
+
+    def __init__(self, max_entries=512, rotation_step=5):
+        self.max_entries = max_entries
+        self.rotation_step = rotation_step
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, name, size, bold=False, italic=False):
+        """Retorna uma fonte do sistema, criando-a apenas na primeira vez"""
+        # O resolvedor memoriza as fontes e guarda os arquivos em cache no disco
+        return get_font_resolver().font(name, size, bold=bold, italic=italic)
+
+    def rotation_bucket(self, rotation):
+        """Arredonda a rotação para a faixa mais próxima"""
+        return round(rotation / self.rotation_step) % round(360 / self.rotation_step)
+
+    def render(self, font, text, color, rotation=0):
+        """Retorna a superfície do texto, renderizando-a só em caso de falha no cache"""
+        bucket = self.rotation_bucket(rotation) if rotation else 0
+        key = (font, text, tuple(color), bucket)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        if bucket:
+            surface = pygame.transform.rotate(surface, bucket * self.rotation_step)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Descarta os textos em cache (as fontes são mantidas)"""
+        self.entries.clear()
+
+    def stats(self):
+        """Retorna os contadores de acertos e falhas do cache"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+class SymbolAtlas:
+    """
+    Atlas de símbolos matemáticos pré-rotacionados para as partículas do menu.
+
+    Cada combinação (símbolo, tamanho, cor) tem uma faixa com uma imagem por
+    ângulo (a cada `rotation_step` graus), preenchida sob demanda. As sombras
+    ficam em faixas próprias, com a transparência já aplicada.
+    """
+
+    SHADOW_COLOR = (0, 0, 0)
+    SHADOW_ALPHA = 100
+
+    def __init__(self, text_cache, font_name="Arial", rotation_step=10, max_strips=256):
+        self.text_cache = text_cache
+        self.font_name = font_name
+        self.rotation_step = rotation_step
+        self.steps = round(360 / rotation_step)
+        self.max_strips = max_strips
+        self.strips = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbol, size, color, rotation):
+        """Retorna o símbolo já rotacionado para o ângulo mais próximo"""
+        return self._lookup(symbol, size, tuple(color), rotation)
+
+    def get_shadow(self, symbol, size, rotation):
+        """Retorna a sombra semitransparente do símbolo já rotacionada"""
+        return self._lookup(symbol, size, None, rotation)
+
+    def _lookup(self, symbol, size, color, rotation):
+        key = (symbol, size, color)
+        strip = self.strips.get(key)
+        if strip is None:
+            strip = [None] * self.steps
+            self.strips[key] = strip
+            if len(self.strips) > self.max_strips:
+                self.strips.popitem(last=False)
+        else:
+            self.strips.move_to_end(key)
+
+        step = round(rotation / self.rotation_step) % self.steps
+        surface = strip[step]
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        font = self.text_cache.get_font(self.font_name, size)
+        surface = font.render(symbol, True, color or self.SHADOW_COLOR)
+        surface = pygame.transform.rotate(surface, step * self.rotation_step)
+        if color is None:
+            surface.set_alpha(self.SHADOW_ALPHA)
+        strip[step] = surface
+        return surface
+
+    def stats(self):
+        """Retorna os contadores de acertos e falhas do atlas"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "strips": len(self.strips),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+_text_cache = None
+
+def get_text_cache():
+    """Retorna a instância compartilhada do cache de textos"""
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
@@ -0,0 +1,145 @@
+import math
+from collections import OrderedDict
+import numpy as np
+import pygame
+from config.settings import WIDTH, HEIGHT, WHITE
+from src.utils.surfaces import to_display_format
+
+# Cores da pista
+SHADOW_COLOR = (50, 50, 50)
+TRACK_COLOR = (100, 100, 120)
+CENTER_LINE_COLOR = (180, 180, 180)
+EDGE_COLOR = (220, 220, 220)
+MARKER_COLOR = (255, 255, 0)
+
+# Margem (em pixels) ocupada pela pista além da linha central: sombra, bordas e marcações
+TRACK_PADDING = 12
+
+# Distância entre as marcações da pista (em unidades de x, a partir do início da pista)
+MARKER_SPACING = 10
+
+def draw_track_polyline(surface, points, markers, first_marker):
+    """
+    Desenha um trecho da pista (sombra, corpo, linha central, bordas e marcações).
+    `markers` são as posições das marcações (Nx2) e `first_marker` o número da
+    primeira delas desde o início da pista, que alterna as cores.
+    """
+    if len(points) < 2:
+        return
+
+    # Sombra e corpo da pista
+    pygame.draw.lines(surface, SHADOW_COLOR, False, (points + 3).tolist(), 16)
+    point_list = points.tolist()
+    pygame.draw.lines(surface, TRACK_COLOR, False, point_list, 14)
+
+    # Linha central
+    pygame.draw.lines(surface, CENTER_LINE_COLOR, False, point_list, 2)
+
+    # Bordas superior e inferior (paralelas à pista)
+    edge_offset = np.array((0, 7))
+    pygame.draw.lines(surface, EDGE_COLOR, False, (points - edge_offset).tolist(), 2)
+    pygame.draw.lines(surface, EDGE_COLOR, False, (points + edge_offset).tolist(), 2)
+
+    # Marcações a cada MARKER_SPACING, alternando as cores
+    for index, (mark_x, mark_y) in enumerate(markers.tolist(), first_marker):
+        mark_color = WHITE if index % 2 == 0 else MARKER_COLOR
+        mark_size = 3 if index % 2 == 0 else 2
+        pygame.draw.circle(surface, mark_color, (mark_x, mark_y), mark_size)
+
+class TrackTileCache:
+    """
+    Cache de blocos (tiles) da pista renderizados uma única vez.
+
+    O mundo é dividido em blocos quadrados de `tile_size` pixels, indexados por
+    (coluna, linha). A cada quadro apenas os blocos que cruzam o retângulo da
+    câmera são desenhados (com um blit cada); blocos que ficaram muito para trás
+    do carro, ou os menos usados recentemente, são descartados. Cada bloco é
+    desenhado com a polilinha adaptativa da pista (Track.get_polyline). Os
+    blocos valem para todas as pistas com a mesma cache_key, então reiniciar
+    a partida (que cria outro Track) não os desenha de novo.
+    """
+
+    def __init__(self, tile_size=512, max_tiles=24, keep_behind=1024):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.keep_behind = keep_behind
+        self.tiles = OrderedDict()
+        self.track_key = None
+
+    def clear(self):
+        """Descarta todos os blocos em cache"""
+        self.tiles.clear()
+
+    def draw(self, screen, track, camera_x, camera_y, width=WIDTH, height=HEIGHT):
+        """Desenha a pista na tela usando os blocos que cruzam a câmera"""
+        if track.cache_key != self.track_key:
+            self.clear()
+            self.track_key = track.cache_key
+
+        size = self.tile_size
+        # Coordenadas de mundo visíveis: x em [camera_x, camera_x + width]
+        # e y em [camera_y, camera_y + height]
+        first_col = math.floor(camera_x / size)
+        last_col = math.floor((camera_x + width) / size)
+        first_row = math.floor(camera_y / size)
+        last_row = math.floor((camera_y + height) / size)
+
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                tile = self._get_tile(track, col, row)
+                if tile is not None:
+                    screen.blit(tile, (round(col * size - camera_x),
+                                       round(height - ((row + 1) * size - camera_y))))
+
+        self._evict(camera_x)
+
+    def _get_tile(self, track, col, row):
+        """Retorna o bloco (coluna, linha), renderizando-o se necessário"""
+        key = (col, row)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+
+        tile = self._render_tile(track, col, row)
+        self.tiles[key] = tile
+        return tile
+
+    def _render_tile(self, track, col, row):
+        """Renderiza um bloco; retorna None se a pista não passa por ele"""
+        size = self.tile_size
+        left = col * size
+        bottom = row * size
+
+        x_start = max(track.range[0], left - TRACK_PADDING)
+        x_end = min(track.range[1], left + size + TRACK_PADDING)
+        if x_end <= x_start:
+            return None
+        xs, ys = track.get_polyline(x_start, x_end)
+        if len(xs) < 2:
+            return None
+
+        if ys.max() < bottom - TRACK_PADDING or ys.min() > bottom + size + TRACK_PADDING:
+            return None
+
+        # Marcações fixas no mundo: no meio entre duas amostras, a cada MARKER_SPACING
+        origin = track.range[0] + track.sample_step / 2
+        first_marker = math.ceil((x_start - origin) / MARKER_SPACING)
+        marker_xs = origin + np.arange(first_marker, math.floor((x_end - origin) / MARKER_SPACING) + 1) * MARKER_SPACING
+        marker_ys = np.interp(marker_xs, xs, ys)
+
+        # Converte para coordenadas locais do bloco (y cresce para baixo)
+        points = np.column_stack((xs - left, (bottom + size) - ys))
+        markers = np.column_stack((marker_xs - left, (bottom + size) - marker_ys))
+
+        tile = pygame.Surface((size, size), pygame.SRCALPHA)
+        draw_track_polyline(tile, points, markers, first_marker)
+        return to_display_format(tile)
+
+    def _evict(self, camera_x):
+        """Remove blocos muito atrás da câmera e mantém o cache limitado (LRU)"""
+        limit = camera_x - self.keep_behind
+        for key in [key for key in self.tiles if (key[0] + 1) * self.tile_size < limit]:
+            del self.tiles[key]
+
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)